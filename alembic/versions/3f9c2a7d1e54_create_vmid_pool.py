@@ -0,0 +1,42 @@
+"""create vmid pool
+
+Revision ID: 3f9c2a7d1e54
+Revises: 79b169d87c71
+Create Date: 2026-10-18 09:12:41.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c2a7d1e54'
+down_revision: Union[str, None] = '79b169d87c71'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('vmids',
+    sa.Column('vmid', sa.Integer(), nullable=False),
+    sa.Column('allocated', sa.Boolean(), server_default=sa.text('false'), nullable=False),
+    sa.Column('allocated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('id', sa.UUID(), server_default=sa.text('gen_random_uuid()'), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('version_id', sa.Integer(), server_default='1', nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('vmid')
+    )
+    op.create_index(op.f('ix_vmids_id'), 'vmids', ['id'], unique=False)
+    op.create_index('ix_vmids_free', 'vmids', ['vmid'], unique=False, postgresql_where=sa.text('NOT allocated'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_vmids_free', table_name='vmids', postgresql_where=sa.text('NOT allocated'))
+    op.drop_index(op.f('ix_vmids_id'), table_name='vmids')
+    op.drop_table('vmids')
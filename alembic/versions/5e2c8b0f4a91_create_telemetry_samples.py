@@ -0,0 +1,45 @@
+"""create telemetry samples
+
+Revision ID: 5e2c8b0f4a91
+Revises: d3a7f1c58e02
+Create Date: 2026-10-18 14:21:40.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e2c8b0f4a91'
+down_revision: Union[str, None] = 'd3a7f1c58e02'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Партиции по суткам создает и удаляет TelemetrySink
+    op.execute("""
+        CREATE TABLE telemetry_samples (
+            time timestamptz NOT NULL,
+            vmid integer NOT NULL,
+            node varchar(64) NOT NULL,
+            cpu double precision NOT NULL,
+            maxcpu integer NOT NULL,
+            mem bigint NOT NULL,
+            maxmem bigint NOT NULL,
+            disk bigint NOT NULL,
+            maxdisk bigint NOT NULL,
+            netin bigint NOT NULL,
+            netout bigint NOT NULL,
+            diskread bigint NOT NULL,
+            diskwrite bigint NOT NULL
+        ) PARTITION BY RANGE (time)
+    """)
+    op.execute("CREATE INDEX ix_telemetry_samples_vmid_time ON telemetry_samples (vmid, time)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TABLE telemetry_samples")
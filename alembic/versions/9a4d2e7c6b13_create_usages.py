@@ -0,0 +1,45 @@
+"""create usages
+
+Revision ID: 9a4d2e7c6b13
+Revises: 5e2c8b0f4a91
+Create Date: 2026-10-18 16:02:11.804531
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4d2e7c6b13'
+down_revision: Union[str, None] = '5e2c8b0f4a91'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('usages',
+    sa.Column('owner_id', sa.UUID(), nullable=False),
+    sa.Column('hour', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('cpu_seconds', sa.Float(), nullable=False),
+    sa.Column('ram_gb_hours', sa.Float(), nullable=False),
+    sa.Column('disk_gb_hours', sa.Float(), nullable=False),
+    sa.Column('net_in_bytes', sa.BigInteger(), nullable=False),
+    sa.Column('net_out_bytes', sa.BigInteger(), nullable=False),
+    sa.Column('id', sa.UUID(), server_default=sa.text('gen_random_uuid()'), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('version_id', sa.Integer(), server_default='1', nullable=False),
+    sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('owner_id', 'hour')
+    )
+    op.create_index(op.f('ix_usages_id'), 'usages', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_usages_id'), table_name='usages')
+    op.drop_table('usages')
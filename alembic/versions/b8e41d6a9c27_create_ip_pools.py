@@ -0,0 +1,43 @@
+"""create ip pools
+
+Revision ID: b8e41d6a9c27
+Revises: 3f9c2a7d1e54
+Create Date: 2026-10-18 10:03:17.552690
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e41d6a9c27'
+down_revision: Union[str, None] = '3f9c2a7d1e54'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('ippools',
+    sa.Column('bridge', sa.String(length=32), nullable=False),
+    sa.Column('subnet', sa.String(length=43), nullable=False),
+    sa.Column('gateway', sa.String(length=39), nullable=False),
+    sa.Column('bitmap', sa.LargeBinary(), nullable=False),
+    sa.Column('id', sa.UUID(), server_default=sa.text('gen_random_uuid()'), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('version_id', sa.Integer(), server_default='1', nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('subnet')
+    )
+    op.create_index(op.f('ix_ippools_bridge'), 'ippools', ['bridge'], unique=False)
+    op.create_index(op.f('ix_ippools_id'), 'ippools', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_ippools_id'), table_name='ippools')
+    op.drop_index(op.f('ix_ippools_bridge'), table_name='ippools')
+    op.drop_table('ippools')
@@ -0,0 +1,33 @@
+"""ticket container node nullable
+
+Revision ID: d3a7f1c58e02
+Revises: b8e41d6a9c27
+Create Date: 2026-10-18 11:04:27.519384
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3a7f1c58e02'
+down_revision: Union[str, None] = 'b8e41d6a9c27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column('ticketcontainers', 'proxmox_node',
+               existing_type=sa.String(length=64),
+               nullable=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("UPDATE ticketcontainers SET proxmox_node = 'nvcloud' WHERE proxmox_node IS NULL")
+    op.alter_column('ticketcontainers', 'proxmox_node',
+               existing_type=sa.String(length=64),
+               nullable=False)
@@ -1,11 +1,26 @@
+import asyncio
 from contextlib import asynccontextmanager
 from logging import getLogger
 
 from fastapi import FastAPI
 
 from app.bot import create_bot_manager, create_dispatcher_manager, create_redis_storage
+from app.bot.misc.alerts import AlertNotifier
+from app.bot.misc.charts import close_chart_renderer, init_chart_renderer
 from app.config import create_settings
+from app.domain.services.ipam import IpamService
+from app.domain.services.vmid_allocator import VmidAllocator, parse_vmid_ranges
+from app.infra.database.uow import get_uow
 from app.infra.logging import setup_logging
+from app.infra.proxmox import close_provider, get_placement, init_provider
+from app.infra.telemetry import (
+    close_telemetry,
+    create_alert_engine,
+    get_forecaster,
+    get_owner_index,
+    get_telemetry_sink,
+    init_telemetry,
+)
 from app.presentation.builder import get_api_builder
 
 logger = getLogger(__name__)
@@ -17,17 +32,69 @@ def init() -> FastAPI:
 
     @asynccontextmanager
     async def lifespan(app: FastAPI):
-        bot_manager = create_bot_manager(settings.bot_settings)
-        redis_storage = create_redis_storage(settings.redis_settings)
+        # Все созданное до сбоя запуска закрывается в finally
+        tasks: list[asyncio.Task[None]] = []
+        bot_manager = None
+        try:
+            provider = await init_provider()
 
-        dp_manager = create_dispatcher_manager(bot_manager, redis_storage)
-        dp_manager.setup()
+            ipam_service = IpamService(get_uow, provider, settings.proxmox_settings.IP_POOLS)
+            try:
+                await ipam_service.sync()
+            except Exception as e:
+                logger.error(f'IP pool sync failed: {e}')
+
+            vmid_allocator = VmidAllocator(
+                get_uow,
+                provider,
+                parse_vmid_ranges(settings.proxmox_settings.VMID_RANGES),
+                settings.proxmox_settings.VMID_LEASE_GRACE
+            )
+            # Пул VMID должен быть заполнен до первых запросов на создание
+            try:
+                await vmid_allocator.reconcile()
+            except Exception as e:
+                logger.error(f'VMID pool reconcile failed: {e}')
+            tasks.append(asyncio.create_task(
+                vmid_allocator.run(settings.proxmox_settings.VMID_RECONCILE_INTERVAL)
+            ))
+
+            telemetry_collector = init_telemetry(provider, get_placement())
+            tasks.append(asyncio.create_task(telemetry_collector.run()))
+            tasks.append(asyncio.create_task(get_forecaster().run()))
+            telemetry_sink = get_telemetry_sink()
+            if telemetry_sink:
+                tasks.append(asyncio.create_task(telemetry_sink.run()))
+
+            bot_manager = create_bot_manager(settings.bot_settings)
+            redis_storage = create_redis_storage(settings.redis_settings)
+
+            dp_manager = create_dispatcher_manager(bot_manager, redis_storage)
+            dp_manager.setup()
+
+            await dp_manager.setup_bot()
+            init_chart_renderer()
+
+            if settings.telemetry_settings.ALERT_ENABLED:
+                alert_notifier = AlertNotifier(
+                    bot_manager.bot,
+                    get_owner_index(),
+                    create_alert_engine(),
+                    settings.telemetry_settings.ALERT_INTERVAL
+                )
+                tasks.append(asyncio.create_task(alert_notifier.run()))
 
-        await dp_manager.setup_bot()
-        try:
             yield
         finally:
-            await bot_manager.bot.session.close()
+            for task in tasks:
+                task.cancel()
+            # Финальный flush - только когда сборщик и COPY в полете остановились
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await close_telemetry()
+            await close_chart_renderer()
+            if bot_manager is not None:
+                await bot_manager.bot.session.close()
+            await close_provider()
 
     api_builder = get_api_builder(settings.api_settings, lifespan)
 
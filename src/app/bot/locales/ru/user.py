@@ -67,3 +67,27 @@ SUPPORT_TEXT = (
     "👨🏿‍💼 <b>@theharizma</b> - технические неполадки\n\n"
     "Постараемся помочь как можно быстрее! ⚡"
 )
+
+ALERTS_TEXT = '🚨 <b>Уведомления по контейнерам</b>\n\n'
+
+ALERTS_MORE_TEXT = SafeFormat('\n… и еще {count}')
+
+ALERT_RESOLVED_TEXT = SafeFormat('✅ <b>{name}</b> (<code>{vmid}</code>): {kind} - снова в норме')
+
+ALERT_KIND_NAMES = {
+    'cpu': 'нагрузка CPU',
+    'mem': 'оперативная память',
+    'disk': 'место на диске',
+    'disk_trend': 'заполнение диска',
+    'net_anomaly': 'сетевой трафик',
+    'io_anomaly': 'дисковый ввод-вывод',
+}
+
+ALERT_TEXTS = {
+    'cpu': SafeFormat('🔥 <b>{name}</b> (<code>{vmid}</code>): CPU загружен на <code>{value}%</code>'),
+    'mem': SafeFormat('🧠 <b>{name}</b> (<code>{vmid}</code>): занято <code>{value}%</code> оперативной памяти'),
+    'disk': SafeFormat('💾 <b>{name}</b> (<code>{vmid}</code>): диск заполнен на <code>{value}%</code>'),
+    'disk_trend': SafeFormat('⏳ <b>{name}</b> (<code>{vmid}</code>): при текущем росте диск заполнится примерно через <code>{value}</code>'),
+    'net_anomaly': SafeFormat('📡 <b>{name}</b> (<code>{vmid}</code>): необычно высокий сетевой трафик'),
+    'io_anomaly': SafeFormat('📀 <b>{name}</b> (<code>{vmid}</code>): необычно высокая нагрузка на диск'),
+}
@@ -6,7 +6,8 @@ from aiogram.types import TelegramObject
 from app.domain.models.tg_user import TgUserInDB
 from app.domain.services.container import ContainerService
 from app.domain.uow.abstract import AbstractUnitOfWork
-from app.presentation.dependencies.proxmox import get_proxmox_provider
+from app.infra.proxmox import get_placement, get_provider
+from app.infra.telemetry import get_owner_index, get_telemetry
 
 
 class ContainerMiddleware(BaseMiddleware):
@@ -21,5 +22,5 @@ class ContainerMiddleware(BaseMiddleware):
         if user and user.user_id:
             uow: AbstractUnitOfWork = data['uow']
             user_in_db = await uow.user_repo.get(user.user_id)
-            data.update(user_in_db=user_in_db, container_service=ContainerService(uow, get_proxmox_provider(), user_in_db)) # type: ignore
+            data.update(user_in_db=user_in_db, container_service=ContainerService(uow, get_provider(), user_in_db, get_placement(), get_telemetry(), get_owner_index())) # type: ignore
         return await handler(event, data)
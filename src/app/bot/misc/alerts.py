@@ -0,0 +1,101 @@
+import asyncio
+from collections import defaultdict
+from logging import getLogger
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramAPIError, TelegramRetryAfter
+
+from app.bot.locales.ru import (
+    ALERT_KIND_NAMES,
+    ALERT_RESOLVED_TEXT,
+    ALERT_TEXTS,
+    ALERTS_MORE_TEXT,
+    ALERTS_TEXT,
+)
+from app.core.dto.telemetry import TelemetryAlert
+from app.domain.services.owner_index import OwnerIndex
+from app.infra.telemetry.alerts import AlertEngine
+
+logger = getLogger(__name__)
+
+# Строк в одном сообщении (лимит Telegram - 4096 символов)
+MAX_ALERT_LINES = 30
+
+
+class AlertNotifier:
+    """
+    Раз в interval проверяет правила AlertEngine и отправляет каждому владельцу
+    одно сообщение со всеми алертами его контейнеров за этот интервал.
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        owners: OwnerIndex,
+        engine: AlertEngine,
+        interval: float
+    ):
+        self._bot = bot
+        self._owners = owners
+        self._engine = engine
+        self._interval = interval
+
+    async def notify(self) -> None:
+        alerts = self._engine.evaluate()
+        if not alerts:
+            return
+
+        owners = await self._owners.get()
+        by_chat: dict[int, list[str]] = defaultdict(list)
+        for alert in alerts:
+            owner = owners.get(alert.vmid)
+            if owner is not None and owner.chat_id is not None:
+                by_chat[owner.chat_id].append(format_alert(alert, owner.name))
+
+        for chat_id, lines in by_chat.items():
+            await self._send(chat_id, format_alerts(lines))
+
+    async def _send(self, chat_id: int, text: str) -> None:
+        try:
+            await self._bot.send_message(chat_id, text)
+        except TelegramRetryAfter as e:
+            await asyncio.sleep(e.retry_after)
+            await self._send(chat_id, text)
+        except TelegramAPIError as e:
+            logger.warning(f'Alert delivery to {chat_id} failed: {e}')
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            try:
+                await self.notify()
+            except Exception as e:
+                logger.error(f'Alert notification failed: {e}')
+
+
+def format_alert(alert: TelemetryAlert, name: str) -> str:
+    if alert.resolved:
+        return ALERT_RESOLVED_TEXT.format(name=name, vmid=alert.vmid, kind=ALERT_KIND_NAMES[alert.kind])
+
+    if alert.kind in ('cpu', 'mem', 'disk'):
+        value = f'{alert.value * 100:.0f}'
+    elif alert.kind == 'disk_trend':
+        value = _format_duration(alert.value)
+    else:
+        value = f'{alert.value:.1f}'
+    return ALERT_TEXTS[alert.kind].format(name=name, vmid=alert.vmid, value=value)
+
+
+def format_alerts(lines: list[str]) -> str:
+    # Строки уже экранированы в format_alert
+    text = ALERTS_TEXT + '\n'.join(lines[:MAX_ALERT_LINES])
+    if len(lines) > MAX_ALERT_LINES:
+        text += ALERTS_MORE_TEXT.format(count=len(lines) - MAX_ALERT_LINES)
+    return text
+
+
+def _format_duration(seconds: float) -> str:
+    minutes = max(int(seconds // 60), 1)
+    if minutes < 60:
+        return f'{minutes} мин'
+    return f'{minutes // 60} ч {minutes % 60} мин'
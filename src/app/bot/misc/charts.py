@@ -0,0 +1,171 @@
+import asyncio
+import multiprocessing
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from logging import getLogger
+from typing import Awaitable, Callable
+
+from aiogram.types import BufferedInputFile, Message
+from redis.asyncio import Redis
+
+from app.config import create_settings
+from app.core.charts import render_chart
+from app.domain.schemas.container.response import ContainerTelemetryHistory
+
+logger = getLogger(__name__)
+
+KEY_PREFIX = 'bot:chart:'
+
+_renderer: 'ChartRenderer | None' = None
+
+
+class ChartRenderer:
+    """
+    Карточки с графиками CPU/RAM/сети контейнера для бота.
+
+    Рисуются в ProcessPoolExecutor, чтобы Pillow не блокировал event loop.
+    Картинка и file_id, который Telegram выдал после первой отправки, кэшируются
+    по (vmid, bucket) в памяти и в Redis: внутри одного bucket повторное
+    открытие экрана не рисует и не загружает картинку заново.
+    """
+
+    def __init__(self, redis: Redis, executor: ProcessPoolExecutor, bucket: int, cache_size: int):
+        self._redis = redis
+        self._executor = executor
+        self._bucket = bucket
+        self._cache_size = cache_size
+        # (vmid, bucket) -> {'png': bytes, 'file_id': str}
+        self._cache: OrderedDict[tuple[int, int], dict[str, bytes | str]] = OrderedDict()
+        self._rendering: dict[tuple[int, int], asyncio.Task[bytes]] = {}
+
+    async def photo(
+        self,
+        vmid: int,
+        name: str,
+        ram_total: int,
+        load: Callable[[], Awaitable[ContainerTelemetryHistory]]
+    ) -> tuple[str | BufferedInputFile, int]:
+        """Готовый file_id или PNG для отправки и bucket, под которым запомнить file_id"""
+        bucket = int(time.time() // self._bucket)
+        key = (vmid, bucket)
+
+        cached = self._cache.get(key) or await self._load(key)
+        if 'file_id' in cached:
+            return cached['file_id'], bucket  # type: ignore
+        if 'png' in cached:
+            return _input_file(vmid, cached['png']), bucket  # type: ignore
+
+        task = self._rendering.get(key)
+        if task is None:
+            task = asyncio.create_task(self._render(name, ram_total, load))
+            self._rendering[key] = task
+            task.add_done_callback(lambda _: self._rendering.pop(key, None))
+        png = await task
+
+        self._store(key, png=png)
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.hset(_redis_key(key), 'png', png)
+            pipe.expire(_redis_key(key), self._bucket * 2)
+            await pipe.execute()
+        return _input_file(vmid, png), bucket
+
+    async def remember(self, vmid: int, bucket: int, message: Message | bool | None) -> None:
+        """Сохраняет file_id отправленной картинки, чтобы больше ее не загружать"""
+        if not isinstance(message, Message) or not message.photo:
+            return
+        key = (vmid, bucket)
+        file_id = message.photo[-1].file_id
+        if self._cache.get(key, {}).get('file_id') == file_id:
+            return
+
+        self._store(key, file_id=file_id)
+        # PNG больше не нужен - отдаем file_id
+        self._cache[key].pop('png', None)
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.hset(_redis_key(key), 'file_id', file_id)
+            pipe.hdel(_redis_key(key), 'png')
+            pipe.expire(_redis_key(key), self._bucket * 2)
+            await pipe.execute()
+
+    async def _render(
+        self,
+        name: str,
+        ram_total: int,
+        load: Callable[[], Awaitable[ContainerTelemetryHistory]]
+    ) -> bytes:
+        history = await load()
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor,
+            render_chart,
+            name,
+            history.cpu.mean,
+            history.ram.mean,
+            ram_total,
+            history.network_in.mean,
+            history.network_out.mean
+        )
+
+    async def _load(self, key: tuple[int, int]) -> dict[str, bytes | str]:
+        stored = await self._redis.hgetall(_redis_key(key))
+        if not stored:
+            return {}
+        cached: dict[str, bytes | str] = {}
+        if b'file_id' in stored:
+            cached['file_id'] = stored[b'file_id'].decode()
+        elif b'png' in stored:
+            cached['png'] = stored[b'png']
+        self._store(key, **cached)
+        return cached
+
+    async def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        await self._redis.aclose()
+
+    def _store(self, key: tuple[int, int], **values: bytes | str) -> None:
+        self._cache.setdefault(key, {}).update(values)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+
+def _input_file(vmid: int, png: bytes) -> BufferedInputFile:
+    return BufferedInputFile(png, filename=f'telemetry_{vmid}.png')
+
+
+def _redis_key(key: tuple[int, int]) -> str:
+    return f'{KEY_PREFIX}{key[0]}:{key[1]}'
+
+
+def init_chart_renderer() -> 'ChartRenderer':
+    global _renderer
+    if _renderer is None:
+        settings = create_settings()
+        executor = ProcessPoolExecutor(
+            settings.bot_settings.CHART_WORKERS,
+            # fork процесса с работающим event loop и потоками небезопасен
+            mp_context=multiprocessing.get_context('spawn')
+        )
+        # Прогрев: процессы пула стартуют сейчас, а не на первом запросе пользователя
+        for _ in range(settings.bot_settings.CHART_WORKERS):
+            executor.submit(render_chart, '', [], [], 1, [], [])
+        _renderer = ChartRenderer(
+            Redis.from_url(settings.redis_settings.DATABASE_URL),
+            executor,
+            settings.bot_settings.CHART_BUCKET,
+            settings.bot_settings.CHART_CACHE_SIZE
+        )
+    return _renderer
+
+
+def get_chart_renderer() -> 'ChartRenderer':
+    if _renderer is None:
+        raise RuntimeError("ChartRenderer has not been initialized yet.")
+    return _renderer
+
+
+async def close_chart_renderer() -> None:
+    global _renderer
+    if _renderer is not None:
+        await _renderer.close()
+        _renderer = None
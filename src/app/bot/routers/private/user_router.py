@@ -1,3 +1,4 @@
+from logging import getLogger
 from typing import TYPE_CHECKING
 
 from aiogram import F
@@ -8,14 +9,18 @@ from aiogram.types import CallbackQuery, FSInputFile, Message, User
 from app.bot.callback_data.container import ContainerCallData
 from app.bot.keyboards.inline.private.private_keyboards import PrivateInlineKeyboards
 from app.bot.locales import ru
+from app.bot.misc.charts import get_chart_renderer
 from app.bot.routers import BaseRouter
 from app.bot.routers.helper import edit_message
+from app.config import create_settings
 from app.domain.models.tg_user import TgUserInDB
 from app.domain.models.user import UserInDB
 
 if TYPE_CHECKING:
     from app.domain.services.container import ContainerService
 
+logger = getLogger(__name__)
+
 
 class UserRouter(BaseRouter):
     chat_types = ChatType.PRIVATE
@@ -81,7 +86,22 @@ class UserRouter(BaseRouter):
 
                 keyboard = PrivateInlineKeyboards.container_telemetry(vmid)
 
-                await edit_message(event, text, keyboard, FSInputFile('app/public/PostMessage_4.png'))
+                settings = create_settings().bot_settings
+                charts = get_chart_renderer()
+                photo, bucket = FSInputFile('app/public/PostMessage_4.png'), None
+                try:
+                    photo, bucket = await charts.photo(
+                        vmid,
+                        container_telemetry.container.name,
+                        container_telemetry.ram.ram_bytes,
+                        lambda: container_service.get_telemetry_history(vmid, settings.CHART_WINDOW, settings.CHART_STEP)
+                    )
+                except Exception as e:
+                    logger.warning(f'Telemetry chart for {vmid} failed: {e}')
+
+                message = await edit_message(event, text, keyboard, photo)
+                if bucket is not None:
+                    await charts.remember(vmid, bucket, message)
 
         @self.callback_query(F.data == 'support')
         async def support_handler(event: CallbackQuery):
@@ -5,6 +5,13 @@ class BotSettings(BaseSettings):
     TOKEN: str
     WEBHOOK_URL: str
 
+    # Графики телеметрии: окно и шаг, сек; картинка одна на CHART_BUCKET секунд
+    CHART_WINDOW: int = 3_600
+    CHART_STEP: int = 60
+    CHART_BUCKET: int = 60
+    CHART_WORKERS: int = 2
+    CHART_CACHE_SIZE: int = 256
+
     class Config:
         env_file = '.env'
         env_prefix = "BOT_"
@@ -1,6 +1,13 @@
+from pydantic import BaseModel
 from pydantic_settings import BaseSettings
 
 
+class IpPoolSettings(BaseModel):
+    bridge: str
+    subnet: str
+    gateway: str
+
+
 class ProxmoxSettings(BaseSettings):
     BASE_URL: str = 'https://proxmox.nv-server.online/'
     VERIFY_SSL: bool = False
@@ -10,6 +17,61 @@ class ProxmoxSettings(BaseSettings):
 
     TIMEOUT: int = 30
 
+    # Дедлайны запросов по классам эндпоинтов, сек
+    DEADLINE_READ: float = 10
+    DEADLINE_TASK: float = 5
+    DEADLINE_ACTION: float = 30
+    DEADLINE_CREATE: float = 60
+
+    # Повторы временных ошибок (5xx шлюза, обрыв, таймаут)
+    RETRY_ATTEMPTS: int = 3
+    RETRY_BASE_DELAY: float = 0.2
+    RETRY_MAX_DELAY: float = 2
+
+    # Circuit breaker на ноду
+    BREAKER_FAILURE_THRESHOLD: int = 5
+    BREAKER_RESET_TIMEOUT: float = 30
+
+    # Пул соединений общего провайдера
+    POOL_LIMIT: int = 100
+    POOL_LIMIT_PER_HOST: int = 20
+    KEEPALIVE_TIMEOUT: float = 60
+    DNS_CACHE_TTL: int = 300
+
+    # Кэш чтений status/current, rrddata и cluster/resources
+    CACHE_TTL: float = 2
+    CACHE_MAX_SIZE: int = 4096
+
+    # Текущие скорости контейнера при устаревшей телеметрии:
+    # counters - по счетчикам из чтений cluster/resources и status/current, rrd - по хвосту rrddata
+    TELEMETRY_MODE: str = 'counters'
+    # Минимальный интервал между чтениями и возраст, после которого прошлое чтение не годится, сек
+    RATE_PROBE_INTERVAL: float = 1
+    RATE_MAX_AGE: float = 60
+
+    # Ожидание задач (UPID)
+    TASK_POLL_MIN_INTERVAL: float = 0.25
+    TASK_POLL_MAX_INTERVAL: float = 2
+    TASK_POLL_BACKOFF: float = 1.5
+    # Сколько раз подряд статус задачи может не прочитаться, прежде чем ожидание завершится ошибкой
+    TASK_POLL_MAX_FAILURES: int = 10
+    TASK_TIMEOUT: float = 300
+
+    # Пул VMID: диапазоны через запятую, например "100-199,1000-9999"
+    VMID_RANGES: str = '100-9999'
+    VMID_RECONCILE_INTERVAL: float = 300
+    VMID_LEASE_GRACE: float = 600
+
+    # IPAM: подсети по bridge, JSON-список в PROXMOX_IP_POOLS
+    IP_POOLS: list[IpPoolSettings] = [
+        IpPoolSettings(bridge='vmbr0', subnet='192.168.1.0/24', gateway='192.168.1.1')
+    ]
+
+    # Размещение контейнеров: spread | binpack | least_loaded
+    PLACEMENT_STRATEGY: str = 'spread'
+    PLACEMENT_NODES: list[str] = []  # пусто - все online ноды кластера
+    PLACEMENT_STORAGE: str = 'local-lvm'
+
 
     class Config:
         env_file = '.env'
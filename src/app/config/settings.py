@@ -6,6 +6,7 @@ from app.config.database import DatabaseSettings
 from app.config.logging import LoggingSettings
 from app.config.proxmox import ProxmoxSettings
 from app.config.redis import RedisSettings
+from app.config.telemetry import TelemetrySettings
 
 
 class Settings(BaseSettings):
@@ -15,6 +16,7 @@ class Settings(BaseSettings):
     proxmox_settings: ProxmoxSettings = ProxmoxSettings() # type: ignore
     redis_settings: RedisSettings = RedisSettings() # type: ignore
     bot_settings: BotSettings = BotSettings() # type: ignore
+    telemetry_settings: TelemetrySettings = TelemetrySettings()
     DEV: bool = True
 
     class Config:
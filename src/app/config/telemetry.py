@@ -0,0 +1,68 @@
+from pydantic_settings import BaseSettings
+
+
+class TelemetrySettings(BaseSettings):
+    # Опрос /cluster/resources фоновым сборщиком, сек
+    INTERVAL: float = 5
+    # Сколько последних замеров хранить на контейнер (720 * 5с = 1 час)
+    BUFFER_SIZE: int = 720
+    # Сколько тиков подряд держать слот и историю пропавшего из снимка контейнера
+    # (сбой опроса ноды), прежде чем освободить (12 * 5с = 1 минута)
+    SLOT_GRACE_TICKS: int = 12
+    # Старше этого замеры считаются устаревшими и читаются из Proxmox напрямую
+    STALE_AFTER: float = 30
+    # Уровни агрегатов [шаг, хранить], сек: 5 минут сутки, 1 час 30 дней
+    RETENTION_TIERS: list[tuple[int, int]] = [(300, 86_400), (3_600, 30 * 86_400)]
+    # SSE: интервал keep-alive, сек
+    STREAM_KEEPALIVE: float = 15
+    # Архив сырых замеров в Redis: тиков в чанке и сколько хранить, сек
+    ARCHIVE_CHUNK_SIZE: int = 120
+    ARCHIVE_RETENTION: int = 86_400
+    # Запись замеров в Postgres (COPY в партиции по суткам)
+    SINK_ENABLED: bool = True
+    SINK_BATCH_SIZE: int = 5_000
+    SINK_FLUSH_INTERVAL: float = 10
+    # Сколько замеров держать в памяти, пока БД недоступна
+    SINK_MAX_BUFFER: int = 500_000
+    SINK_RETENTION_DAYS: int = 30
+    SINK_PARTITIONS_AHEAD: int = 2
+    # Сколько раз подряд повторять пакет, отвергнутый БД, прежде чем отбросить
+    SINK_MAX_RETRIES: int = 5
+    # Алерты: проверка правил и рассылка владельцам раз в ALERT_INTERVAL, сек
+    ALERT_ENABLED: bool = True
+    ALERT_INTERVAL: float = 60
+    # Пороги доли использования и сколько секунд они должны держаться
+    ALERT_CPU: float = 0.95
+    ALERT_MEM: float = 0.9
+    ALERT_DISK: float = 0.9
+    ALERT_SUSTAIN: float = 300
+    # Диск кончится раньше чем через HORIZON по тренду за TREND_WINDOW, сек
+    ALERT_DISK_TREND_WINDOW: float = 1_800
+    ALERT_DISK_HORIZON: float = 6 * 3_600
+    # Аномалия сети/диска: z-score к базовой линии буфера и минимальная скорость, байт/с
+    ALERT_ZSCORE: float = 4
+    ALERT_ZSCORE_MIN_RATE: float = 10 * 1024 * 1024
+    # Повтор не снятого алерта, сек
+    ALERT_REPEAT: float = 6 * 3_600
+    # Учет потребления: интервалы между тиками длиннее этого не засчитываются, сек
+    METER_MAX_GAP: float = 60
+    # Прогноз емкости нод: замер раз в FORECAST_INTERVAL, тренд по FORECAST_HISTORY
+    # последним замерам (1008 * 10 мин = 7 суток), не меньше FORECAST_MIN_SAMPLES
+    FORECAST_INTERVAL: float = 600
+    FORECAST_HISTORY: int = 1_008
+    FORECAST_MIN_SAMPLES: int = 12
+    # Размещение избегает нод, которые заполнятся раньше, сек
+    FORECAST_HORIZON: float = 7 * 86_400
+    # Лимит контейнеров на ноду для прогноза; 0 - без лимита
+    FORECAST_MAX_CONTAINERS: int = 0
+    # Bearer-токен для /metrics; пустой - эндпоинт выключен (404)
+    METRICS_TOKEN: str = ''
+    # Метка owner с логином владельца в сериях контейнеров
+    METRICS_OWNER_LABEL: bool = False
+    # Как долго кэшировать владельцев контейнеров (алерты, top), сек
+    OWNERS_TTL: float = 300
+
+    class Config:
+        env_file = '.env'
+        env_prefix = 'TELEMETRY_'
+        extra = 'ignore'
@@ -0,0 +1,93 @@
+import io
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+# Размер как у картинок в app/public
+CARD_SIZE = (1280, 720)
+BACKGROUND = (17, 20, 28)
+GRID = (42, 47, 60)
+TEXT = (230, 233, 240)
+MUTED = (140, 147, 165)
+CPU_COLOR = (94, 234, 212)
+RAM_COLOR = (167, 139, 250)
+NET_IN_COLOR = (96, 165, 250)
+NET_OUT_COLOR = (251, 146, 60)
+
+
+def render_chart(
+    name: str,
+    cpu: list[float | None],
+    ram: list[float | None],
+    ram_total: int,
+    net_in: list[float | None],
+    net_out: list[float | None]
+) -> bytes:
+    """PNG-карточка с тремя спарклайнами; только numpy и Pillow, чтобы процессы пула стартовали быстро"""
+    image = Image.new('RGB', CARD_SIZE, BACKGROUND)
+    draw = ImageDraw.Draw(image)
+    title_font = ImageFont.load_default(size=44)
+    label_font = ImageFont.load_default(size=30)
+    value_font = ImageFont.load_default(size=40)
+
+    draw.text((48, 36), name, font=title_font, fill=TEXT)
+
+    cpu_percent = _series(cpu) * 100
+    ram_mb = _series(ram) / 2 ** 20
+    net_in_kb, net_out_kb = _series(net_in) / 1024, _series(net_out) / 1024
+
+    panels = (
+        ('CPU', f'{_last(cpu_percent):.1f}%', [(cpu_percent, CPU_COLOR)], 100.0),
+        ('RAM', f'{_last(ram_mb):.0f} / {ram_total / 2 ** 20:.0f} MB', [(ram_mb, RAM_COLOR)], ram_total / 2 ** 20),
+        ('NET KB/s', f'in {_last(net_in_kb):.0f}  out {_last(net_out_kb):.0f}',
+         [(net_in_kb, NET_IN_COLOR), (net_out_kb, NET_OUT_COLOR)], None),
+    )
+    top, height, gap = 120, 170, 26
+    for i, (label, value, lines, ceiling) in enumerate(panels):
+        y = top + i * (height + gap)
+        draw.text((48, y + 20), label, font=label_font, fill=MUTED)
+        draw.text((48, y + 70), value, font=value_font, fill=TEXT)
+        _sparkline(draw, (440, y, CARD_SIZE[0] - 48, y + height), lines, ceiling)
+
+    buffer = io.BytesIO()
+    image.save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+def _sparkline(
+    draw: ImageDraw.ImageDraw,
+    box: tuple[int, int, int, int],
+    lines: list[tuple[np.ndarray, tuple[int, int, int]]],
+    ceiling: float | None
+) -> None:
+    left, top, right, bottom = box
+    draw.rounded_rectangle(box, radius=12, outline=GRID, width=2)
+
+    peaks = [np.nanmax(values) for values, _ in lines if not np.isnan(values).all()]
+    scale = ceiling or max(peaks, default=0.0)
+    if not scale:
+        scale = 1.0
+
+    for values, color in lines:
+        if len(values) < 2:
+            continue
+        xs = left + np.arange(len(values)) * (right - left) / (len(values) - 1)
+        ys = bottom - np.clip(values / scale, 0, 1) * (bottom - top - 8) - 4
+        # Пустые шаги (NaN) рвут линию на отрезки
+        valid = ~np.isnan(ys)
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], valid.astype(np.int8), [0]))))
+        for start, end in zip(edges[::2], edges[1::2], strict=True):
+            points = list(zip(xs[start:end].tolist(), ys[start:end].tolist(), strict=True))
+            if len(points) > 1:
+                shade = tuple(channel // 4 for channel in color)
+                draw.polygon([(points[0][0], bottom), *points, (points[-1][0], bottom)], fill=shade)
+                draw.line(points, fill=color, width=4, joint='curve')
+
+
+def _series(values: list[float | None]) -> np.ndarray:
+    return np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+
+
+def _last(values: np.ndarray) -> float:
+    valid = values[~np.isnan(values)]
+    return float(valid[-1]) if len(valid) else 0.0
@@ -0,0 +1,67 @@
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+
+@dataclass
+class _CounterState:
+    # База для следующего расчета: когда и какие значения счетчиков прочитаны
+    timestamp: float
+    counters: tuple[int, ...]
+    uptime: float | None = None
+    rates: tuple[float, ...] | None = None
+    rated_at: float = 0.0
+
+
+class CounterRates:
+    """
+    Скорости накопительных счетчиков (netin/netout/diskread/diskwrite) по
+    разнице двух чтений, по ключу (vmid).
+
+    Чтения ближе min_interval к базе не сдвигают ее: на коротком интервале
+    скорость - шум округления. Счетчик, ставший меньше прошлого, или uptime
+    короче интервала значат рестарт контейнера: тогда скорость - новое значение
+    счетчика за время с рестарта. Если uptime меньше прошлого (рестарт или VMID
+    отдан новому контейнеру), состояние начинается заново, без скорости.
+    """
+
+    def __init__(self, min_interval: float, max_age: float):
+        self._min_interval = min_interval
+        self._max_age = max_age
+        self._states: dict[int, _CounterState] = {}
+
+    def update(self, key: int, timestamp: float, counters: tuple[int, ...], uptime: float | None = None) -> None:
+        state = self._states.get(key)
+        if (
+            state is None
+            or timestamp - state.timestamp > self._max_age
+            or (uptime is not None and state.uptime is not None and uptime < state.uptime)
+        ):
+            self._states[key] = _CounterState(timestamp, counters, uptime)
+            return
+
+        elapsed = timestamp - state.timestamp
+        if elapsed < self._min_interval:
+            return
+
+        restarted = uptime is not None and 0 < uptime < elapsed
+        rates = []
+        for before, after in zip(state.counters, counters, strict=True):
+            if restarted or after < before:
+                # Отсчет пошел с нуля при старте контейнера
+                rates.append(after / (uptime if uptime and uptime < elapsed else elapsed))
+            else:
+                rates.append((after - before) / elapsed)
+
+        state.timestamp, state.counters, state.uptime = timestamp, counters, uptime
+        state.rates, state.rated_at = tuple(rates), timestamp
+
+    def get(self, key: int, now: float) -> tuple[float, ...] | None:
+        """Последние посчитанные скорости, если они не старше max_age"""
+        state = self._states.get(key)
+        if state is None or state.rates is None or now - state.rated_at > self._max_age:
+            return None
+        return state.rates
+
+    def retain(self, keys: Iterable[int]) -> None:
+        """Забывает ключи не из keys: удаленные контейнеры не копятся, а их VMID не наследует счетчики"""
+        self._states = {key: state for key in keys if (state := self._states.get(key)) is not None}
@@ -1,8 +1,8 @@
 from dataclasses import dataclass
-from typing import Literal
+from uuid import UUID
 
 
-@dataclass
+@dataclass(slots=True)
 class CreatedContainer:
     node: str
     vmid: int
@@ -14,31 +14,67 @@ class CreatedContainer:
     rom_bytes: int
     ram_bytes: int
 
+    upid: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class HAInfo:
     managed: int
 
-@dataclass
+
+@dataclass(slots=True)
 class CurrentContainerInfo:
-    status: Literal['stopped', 'running']
-    maxdisk: int
-    diskread: int
-    type: str
-    maxswap: int
-    ha: HAInfo
-    cpus: int
-    swap: int
-    uptime: int
-    cpu: float
-    disk: int
-    netout: int
-    mem: int
-    maxmem: int
-    netin: int
-    diskwrite: int
-    name: str
+    # stopped | running; другие значения (например, от новых версий PVE) не отбрасываются
+    status: str
     vmid: int
-    lock: bool | None = None
+    name: str = ''
+    type: str = 'lxc'
+    # Метрики есть не во всех версиях PVE и не у остановленных контейнеров
+    cpu: float = 0
+    cpus: int = 0
+    mem: int = 0
+    maxmem: int = 0
+    swap: int = 0
+    maxswap: int = 0
+    disk: int = 0
+    maxdisk: int = 0
+    netin: int = 0
+    netout: int = 0
+    diskread: int = 0
+    diskwrite: int = 0
+    uptime: int = 0
+    ha: HAInfo | None = None
+    # Имя блокировки (backup, migrate, ...), None - не заблокирован
+    lock: str | None = None
     pid: int | None = None
+
+
+@dataclass(slots=True)
+class ClusterResource:
+    vmid: int
+    node: str
+    type: str
+    status: str
+    name: str = ''
+    cpu: float = 0
+    maxcpu: int = 0
+    mem: int = 0
+    maxmem: int = 0
+    disk: int = 0
+    maxdisk: int = 0
+    netin: int = 0
+    netout: int = 0
+    diskread: int = 0
+    diskwrite: int = 0
+    uptime: int = 0
+    template: int = 0
+
+
+@dataclass(slots=True)
+class ContainerOwner:
+    vmid: int
+    name: str
+    owner_id: UUID
+    username: str
+    # None - у владельца не привязан Telegram
+    chat_id: int | None = None
@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class IpLease:
+    bridge: str
+    address: str  # ip/prefix, например 192.168.1.10/24
+    gateway: str
+
+    def to_network_config(self) -> dict[str, Any]:
+        return {"bridge": self.bridge, "ip": self.address, "gw": self.gateway}
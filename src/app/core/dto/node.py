@@ -0,0 +1,39 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+# Что прогнозирует CapacityForecaster, в порядке колонок его истории
+CAPACITY_RESOURCES = ('ram_committed', 'ram_used', 'disk', 'containers')
+
+
+@dataclass
+class NodeCapacity:
+    node: str
+    cpu: float  # загрузка CPU, 0..1
+    cpus: int
+    mem_total: int
+    mem_free: int
+    storage_total: int
+    storage_free: int
+
+
+@dataclass
+class PlacementRequest:
+    cpu_cores: int
+    ram_bytes: int
+    rom_bytes: int
+
+
+@dataclass
+class CapacityForecast:
+    node: str
+    # Хранилище для resource == 'disk', иначе None
+    storage: str | None
+    resource: str
+    used: float
+    # 0 - лимита нет (число контейнеров без FORECAST_MAX_CONTAINERS)
+    total: float
+    # Рост по линейному тренду, единиц resource в сутки
+    growth_per_day: float
+    # None - ресурс не растет или истории пока мало
+    exhausted_at: datetime | None
+    samples: int
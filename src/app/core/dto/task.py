@@ -0,0 +1,13 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class TaskStatus:
+    node: str
+    upid: str
+    status: str
+    exitstatus: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.exitstatus == 'OK'
@@ -0,0 +1,60 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+HISTORY_SERIES = ('cpu', 'mem', 'disk', 'netin', 'netout', 'io')
+HISTORY_STATS = ('min', 'max', 'mean', 'p95')
+TOP_METRICS = ('cpu', 'mem', 'disk', 'netin', 'netout')
+
+
+@dataclass
+class TelemetrySample:
+    vmid: int
+    node: str
+    name: str
+    status: str
+    time: float
+
+    cpu: float
+    cpus: int
+    mem: int
+    maxmem: int
+    disk: int
+    maxdisk: int
+
+    # Накопительные счетчики, байты
+    netin: int
+    netout: int
+    diskread: int
+    diskwrite: int
+
+    # Скорости между двумя последними замерами, байт/с
+    netin_rate: float = 0
+    netout_rate: float = 0
+    diskread_rate: float = 0
+    diskwrite_rate: float = 0
+
+
+@dataclass
+class TelemetryHistory:
+    # Начало каждого шага, unix-время
+    time: np.ndarray
+    # Фактический шаг: не мельче шага уровня, из которого взяты данные
+    step: int
+    # Серия из HISTORY_SERIES -> матрица (шаги, HISTORY_STATS); пустые шаги - NaN
+    stats: dict[str, np.ndarray]
+
+
+ALERT_KINDS = ('cpu', 'mem', 'disk', 'disk_trend', 'net_anomaly', 'io_anomaly')
+
+
+@dataclass
+class TelemetryAlert:
+    vmid: int
+    # Одно из ALERT_KINDS
+    kind: str
+    # Значение, на котором сработало правило: доля, секунды до заполнения или z-score
+    value: float
+    threshold: float
+    # False - правило сработало, True - условие ушло
+    resolved: bool = False
@@ -0,0 +1,20 @@
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID
+
+# Поля часового итога в порядке колонок матриц UsageMeter
+USAGE_FIELDS = ('cpu_seconds', 'ram_gb_hours', 'disk_gb_hours', 'net_in_bytes', 'net_out_bytes')
+
+
+@dataclass
+class UsageRecord:
+    owner_id: UUID
+    # Начало часа, UTC
+    hour: datetime
+    # Процессорное время: доля ядер * ядра * секунды
+    cpu_seconds: float
+    # Занятые RAM и диск, ГиБ * час
+    ram_gb_hours: float
+    disk_gb_hours: float
+    net_in_bytes: int
+    net_out_bytes: int
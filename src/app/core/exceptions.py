@@ -0,0 +1,28 @@
+from app.core.dto.task import TaskStatus
+
+
+class ProxmoxUnavailable(Exception):
+    """
+    Proxmox (или конкретная нода) сейчас не отвечает.
+    sent=False - запрос точно не дошел до Proxmox (circuit открыт или не удалось соединиться).
+    """
+
+    def __init__(self, node: str | None, reason: str, sent: bool = True):
+        super().__init__(f'Proxmox node {node or "cluster"} is unavailable: {reason}')
+        self.node = node
+        self.sent = sent
+
+
+class ProxmoxRejected(Exception):
+    """Proxmox ответил на запрос ошибкой: задача не запущена"""
+
+    def __init__(self, node: str | None, status: int, reason: str):
+        super().__init__(f'Proxmox node {node or "cluster"} rejected request ({status}): {reason}')
+        self.node = node
+        self.status = status
+
+
+class ProxmoxTaskError(Exception):
+    def __init__(self, task: TaskStatus):
+        super().__init__(f'Proxmox task {task.upid} failed: {task.exitstatus}')
+        self.task = task
@@ -0,0 +1,39 @@
+from ipaddress import IPv4Interface, IPv4Network, ip_interface
+
+
+def empty_bitmap(subnet: IPv4Network, gateway: str) -> bytearray:
+    """Битовая карта подсети с занятыми адресом сети, broadcast и шлюзом"""
+    bitmap = bytearray((subnet.num_addresses + 7) // 8)
+    set_bit(bitmap, 0)
+    set_bit(bitmap, subnet.num_addresses - 1)
+    set_bit(bitmap, address_offset(subnet, gateway))
+    return bitmap
+
+
+def first_free(bitmap: bytes, size: int) -> int | None:
+    value = int.from_bytes(bitmap, 'little')
+    free = ~value & ((1 << size) - 1)
+    if not free:
+        return None
+    return (free & -free).bit_length() - 1
+
+
+def set_bit(bitmap: bytearray, offset: int) -> None:
+    bitmap[offset >> 3] |= 1 << (offset & 7)
+
+
+def clear_bit(bitmap: bytearray, offset: int) -> None:
+    bitmap[offset >> 3] &= ~(1 << (offset & 7)) & 0xFF
+
+
+def address_offset(subnet: IPv4Network, address: str) -> int:
+    return int(ip_interface(address).ip) - int(subnet.network_address)
+
+
+def address_at(subnet: IPv4Network, offset: int) -> str:
+    return str(IPv4Interface((int(subnet.network_address) + offset, subnet.prefixlen)))
+
+
+def parse_net0(net0: str) -> dict[str, str]:
+    """'name=eth0,bridge=vmbr0,ip=10.0.0.5/24' -> {'name': 'eth0', ...}"""
+    return dict(part.split('=', 1) for part in net0.split(',') if '=' in part)
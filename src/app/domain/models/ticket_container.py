@@ -10,6 +10,7 @@ from .base import BaseEntity
 class TicketContainerInDB(BaseEntity):
     id: UUID | None = None
     name: str
+    proxmox_node: Optional[str] = None
     owner_id: UUID | None
     closed: bool = False
     rom_bytes: int = Field(...)
@@ -0,0 +1,16 @@
+from abc import ABC, abstractmethod
+
+from app.core.dto.node import CapacityForecast, PlacementRequest
+
+
+class CapacityForecastProvider(ABC):
+    @abstractmethod
+    def forecast(self) -> list[CapacityForecast]:
+        """Прогноз исчерпания ресурсов по всем нодам и хранилищам"""
+
+    @abstractmethod
+    def runway(self, node: str, request: PlacementRequest) -> float | None:
+        """
+        Через сколько секунд на ноде кончится RAM или диск, если
+        разместить на ней request; None - по ноде еще нет прогноза.
+        """
@@ -3,13 +3,22 @@ from typing import Any
 
 from pydantic_settings import BaseSettings
 
-from app.core.dto.container import CreatedContainer, CurrentContainerInfo
+from app.core.dto.container import (
+    ClusterResource,
+    CreatedContainer,
+    CurrentContainerInfo,
+)
+from app.core.dto.node import NodeCapacity
+from app.core.dto.task import TaskStatus
 
 
 class ContainerAPIProvider(ABC):
     @abstractmethod
     def __init__(self, settings: BaseSettings) -> None: ...
 
+    @abstractmethod
+    async def start(self) -> None: ...
+
     @abstractmethod
     async def close(self) -> None: ...
 
@@ -21,6 +30,7 @@ class ContainerAPIProvider(ABC):
         self,
         node: str,
         host_name: str,
+        vmid: int,
         storage: str = "local-lvm",
         ostemplate: str = "local:vztmpl/ubuntu-22.04-standard_22.04-1_amd64.tar.zst",
         ram_bytes: int = 1_048_576,  # 1GB в байтах
@@ -31,6 +41,9 @@ class ContainerAPIProvider(ABC):
         network_config: dict[str, Any] | None = None
         ) -> CreatedContainer: ...
 
+    @abstractmethod
+    async def get_container_config(self, node: str, vmid: int) -> dict[str, Any]: ...
+
     @abstractmethod
     async def restart_container(self, node: str, vmid: int) -> dict[str, Any]: ...
 
@@ -46,9 +59,20 @@ class ContainerAPIProvider(ABC):
     @abstractmethod
     async def get_container_telemetry(self, node: str, vmid: int) -> dict[str, Any]: ...
 
+    @abstractmethod
+    async def get_container_rates(self, node: str, vmid: int) -> dict[str, float] | None:
+        """Текущие скорости netin/netout/diskread/diskwrite, байт/с; None - еще не посчитаны"""
+
+    @abstractmethod
+    def get_cached_rates(self, vmid: int) -> dict[str, float] | None:
+        """Скорости из уже сделанных чтений, без запросов; None - их нет или они устарели"""
+
     @abstractmethod
     async def get_actual_container_info(self, node: str, vmid: int, timeframe: str = 'hour') -> dict[str, Any]: ...
 
+    @abstractmethod
+    async def wait_task(self, node: str, upid: str | None, timeout: float | None = None) -> TaskStatus | None: ...
+
     @abstractmethod
     async def container_action(self, node: str, vmid: int, action: str) -> dict[str, Any]: ...
 
@@ -58,6 +82,14 @@ class ContainerAPIProvider(ABC):
     @abstractmethod
     async def get_info_all_containers(self, node: str) -> dict[str, Any]: ...
 
+    @abstractmethod
+    async def get_cluster_resources(self) -> dict[int, ClusterResource]: ...
+
     @abstractmethod
     async def get_info_node(self, node: str) -> dict[str, Any]: ...
 
+    @abstractmethod
+    async def get_nodes(self) -> list[str]: ...
+
+    @abstractmethod
+    async def get_node_capacity(self, node: str, storage: str) -> NodeCapacity: ...
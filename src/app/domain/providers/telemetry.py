@@ -0,0 +1,31 @@
+from abc import ABC, abstractmethod
+
+from app.core.dto.telemetry import TelemetryHistory, TelemetrySample
+
+
+class TelemetrySubscription(ABC):
+    @abstractmethod
+    async def get(self, timeout: float | None = None) -> TelemetrySample | None:
+        """Следующий замер или None, если за timeout ничего не пришло"""
+
+    @abstractmethod
+    def close(self) -> None: ...
+
+
+class TelemetryProvider(ABC):
+    @abstractmethod
+    def latest(self, vmid: int) -> TelemetrySample | None: ...
+
+    @abstractmethod
+    def latest_many(self, vmids: list[int]) -> dict[int, TelemetrySample]:
+        """Последние замеры сразу нескольких контейнеров; кого нет в свежем тике - нет в ответе"""
+
+    @abstractmethod
+    def history(self, vmid: int, window: int, step: int) -> TelemetryHistory | None: ...
+
+    @abstractmethod
+    def subscribe(self, vmids: set[int]) -> TelemetrySubscription: ...
+
+    @abstractmethod
+    def top(self, metric: str, n: int) -> list[tuple[TelemetrySample, float]]:
+        """Самые нагруженные по metric контейнеры последнего замера: (замер, значение)"""
@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 
+from app.core.dto.container import ContainerOwner
 from app.domain.models.container import ContainerInDB
 
 
@@ -14,6 +15,28 @@ class ContainerRepository(ABC):
     async def get_by_vmid(self, vmid: int) -> Optional[ContainerInDB]:
         raise NotImplementedError
 
+    @abstractmethod
+    async def get_by_vmids(self, vmids: List[int]) -> List[ContainerInDB]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_by_owner(self, owner_id: UUID) -> List[ContainerInDB]:
+        """Все контейнеры владельца, без пагинации"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_vmids(self) -> List[int]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def count_by_owner(self, owner_id: UUID) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_owners(self) -> Dict[int, ContainerOwner]:
+        """vmid -> владелец контейнера одним запросом, для кэшей OwnerIndex"""
+        raise NotImplementedError
+
     @abstractmethod
     async def search(
         self,
@@ -0,0 +1,22 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from app.core.dto.network import IpLease
+
+
+class IpPoolRepository(ABC):
+    @abstractmethod
+    async def ensure_pool(self, bridge: str, subnet: str, gateway: str) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def allocate(self, bridge: str) -> Optional[IpLease]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def mark_used(self, address: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def release(self, address: str) -> None:
+        raise NotImplementedError
@@ -0,0 +1,16 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from uuid import UUID
+
+from app.core.dto.usage import UsageRecord
+
+
+class UsageRepository(ABC):
+    @abstractmethod
+    async def upsert(self, records: list[UsageRecord]) -> None:
+        """Записывает часовые итоги; к итогу за тот же (owner_id, hour) прибавляются"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_by_owner(self, owner_id: UUID, start: datetime, end: datetime) -> list[UsageRecord]:
+        raise NotImplementedError
@@ -0,0 +1,16 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class VmidRepository(ABC):
+    @abstractmethod
+    async def allocate(self) -> Optional[int]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def release(self, vmid: int) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def reconcile(self, ranges: list[tuple[int, int]], used: set[int], grace_seconds: float) -> None:
+        raise NotImplementedError
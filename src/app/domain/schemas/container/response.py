@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import Literal
 from uuid import UUID
 
@@ -23,6 +24,26 @@ class ContainerAdminInfo(BaseModel):
     status: Literal['stopped', 'running', 'deleted'] = Field(..., description="Status Container")
 
 
+class ContainerTopInfo(BaseModel):
+    id: int = Field(..., description="Container VMID")
+    name: str = Field(..., description="Container host name")
+    node: str = Field(..., description="Proxmox node")
+    status: str = Field(..., description="Status Container")
+    owner_username: str = Field(..., description="Username owner this is container")
+    value: float = Field(..., description="cpu - fraction of allocated cores, mem/disk - used fraction, netin/netout - bytes per second")
+
+
+class CapacityForecastInfo(BaseModel):
+    node: str = Field(..., description="Proxmox node")
+    storage: str | None = Field(None, description="Storage for the disk resource")
+    resource: Literal['ram_committed', 'ram_used', 'disk', 'containers'] = Field(..., description="ram_committed - RAM allocated to containers, ram_used - RAM used on the node")
+    used: float = Field(..., description="Latest value: bytes, or containers count")
+    total: float = Field(..., description="Limit in the same units, 0 - no limit")
+    growth_per_day: float = Field(..., description="Linear trend, units per day")
+    exhausted_at: datetime | None = Field(None, description="Projected exhaustion time, null if not growing or not enough history")
+    samples: int = Field(..., description="Samples the trend is fitted on")
+
+
 class ContainerInfo(BaseModel):
     id: int = Field(..., description="Container VMID")
     name: str = Field(..., description="Container host name")
@@ -68,3 +89,23 @@ class ContainerTelemetry(BaseModel):
     rom: RomInfo = Field(..., description="ROM usage information")
     io: IoInfo = Field(..., description="Disk input/output activity")
     network: NetworkTrafficInfo = Field(..., description="Network traffic information")
+
+
+class MetricSeries(BaseModel):
+    min: list[float | None] = Field(..., description="Minimum per step")
+    max: list[float | None] = Field(..., description="Maximum per step")
+    mean: list[float | None] = Field(..., description="Mean per step")
+    p95: list[float | None] = Field(..., description="95th percentile per step")
+
+
+class ContainerTelemetryHistory(BaseModel):
+    container: ContainerInfo = Field(..., description="Container details")
+    window: int = Field(..., description="Window length in seconds")
+    step: int = Field(..., description="Step length in seconds")
+    time: list[int] = Field(..., description="Unix time of each step start")
+    cpu: MetricSeries = Field(..., description="CPU usage, fraction of allocated cores")
+    ram: MetricSeries = Field(..., description="Used RAM in bytes")
+    rom: MetricSeries = Field(..., description="Used ROM in bytes")
+    network_in: MetricSeries = Field(..., description="Incoming network traffic in bytes per second")
+    network_out: MetricSeries = Field(..., description="Outgoing network traffic in bytes per second")
+    io: MetricSeries = Field(..., description="Disk read and write in bytes per second")
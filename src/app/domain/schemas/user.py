@@ -11,3 +11,24 @@ class UserProfile(BaseModel):
     registration_date: datetime
     is_superuser: bool
     tg_passcode: str | None
+
+
+class UsageHour(BaseModel):
+    hour: datetime
+    cpu_seconds: float
+    ram_gb_hours: float
+    disk_gb_hours: float
+    net_in_bytes: int
+    net_out_bytes: int
+
+
+class UserUsage(BaseModel):
+    start: datetime
+    end: datetime
+    hours: list[UsageHour]
+    # Суммы по всем часам периода
+    cpu_seconds: float
+    ram_gb_hours: float
+    disk_gb_hours: float
+    net_in_bytes: int
+    net_out_bytes: int
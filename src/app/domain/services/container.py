@@ -1,49 +1,77 @@
-from asyncio import gather
-from typing import Any, AsyncContextManager
+import asyncio
+import time
+from dataclasses import asdict
+from logging import getLogger
+from typing import AsyncGenerator
 from uuid import UUID
 
+import numpy as np
+
+from app.core.dto.container import ClusterResource, CreatedContainer
+from app.core.dto.network import IpLease
+from app.core.dto.node import PlacementRequest
+from app.core.dto.telemetry import HISTORY_STATS, TelemetrySample
+from app.core.exceptions import ProxmoxRejected, ProxmoxTaskError, ProxmoxUnavailable
 from app.domain.models.container import ContainerInDB
 from app.domain.models.ticket_container import TicketContainerInDB
 from app.domain.models.user import UserInDB
 from app.domain.providers.container import ContainerAPIProvider
+from app.domain.providers.telemetry import TelemetryProvider
 from app.domain.schemas.container.request import CreateContainer
 from app.domain.schemas.container.response import (
+    CapacityForecastInfo,
     ContainerAdminInfo,
     ContainerInfo,
     ContainerTelemetry,
+    ContainerTelemetryHistory,
+    ContainerTopInfo,
     CpuInfo,
     CreateTicket,
     IoInfo,
+    MetricSeries,
     NetworkTrafficInfo,
     RamInfo,
     RomInfo,
     UserPrivacyInfo,
 )
+from app.domain.services.owner_index import OwnerIndex
+from app.domain.services.placement import PlacementEngine
 from app.domain.uow.abstract import AbstractUnitOfWork
 from app.presentation.exceptions.auth import NoPermissions
 from app.presentation.exceptions.container import (
     ContainerNotFound,
+    IpPoolExhausted,
+    TelemetryWindowTooLarge,
     TicketContainerClosed,
+    TicketContainerNotFound,
+    VmidPoolExhausted,
 )
 
+logger = getLogger(__name__)
+
+MAX_HISTORY_POINTS = 1440
+
 
 class ContainerService:
-    def __init__(self, uow: AbstractUnitOfWork, container_provider: AsyncContextManager[ContainerAPIProvider], user: UserInDB):
+    def __init__(
+        self,
+        uow: AbstractUnitOfWork,
+        container_provider: ContainerAPIProvider,
+        user: UserInDB,
+        placement: PlacementEngine,
+        telemetry: TelemetryProvider,
+        owners: OwnerIndex
+    ):
         self._uow = uow
         self._container_provider = container_provider
-        self._node = 'nvcloud'
+        self._placement = placement
+        self._telemetry = telemetry
+        self._owners = owners
+        self._bridge = 'vmbr0'
         self._user = user
 
         self._is_template = [100]
 
-    '''async def get_info_node(self) -> NodeInfo:
-        if not self._user.is_superuser:
-            raise NoPermissions
-
-        async with self._container_provider as container_provider:
-            raw_info_node = await container_provider.get_info_node(self._node)
-        print(raw_info_node)'''
-
     async def check_permissions(self, vmid: int) -> ContainerInDB:
         async with self._uow:
             container = await self._uow.container_repo.get_by_vmid(vmid)
@@ -56,36 +84,68 @@ class ContainerService:
 
         return container
 
+    async def check_permissions_many(self, vmids: list[int]) -> list[ContainerInDB]:
+        """Проверка прав на несколько контейнеров одним запросом к БД"""
+        async with self._uow:
+            containers = await self._uow.container_repo.get_by_vmids(vmids)
+
+        if len(containers) != len(set(vmids)):
+            raise ContainerNotFound
+
+        if not self._user.is_superuser and any(container.owner_id != self._user.id for container in containers):
+            raise NoPermissions
+
+        return containers
+
+    async def _permitted_containers(self, vmids: list[int] | None) -> list[ContainerInDB]:
+        """Контейнеры из vmids с проверкой прав, а без vmids - все свои"""
+        if vmids:
+            return await self.check_permissions_many(vmids)
+        async with self._uow:
+            return await self._uow.container_repo.get_by_owner(self._user.id) # type: ignore
+
+    async def _allocate_resources(self) -> tuple[int, IpLease]:
+        """VMID и адрес выделяются в одной транзакции текущего uow (см. _provision)"""
+        vmid = await self._uow.vmid_repo.allocate()
+        if vmid is None:
+            raise VmidPoolExhausted
+
+        ip_lease = await self._uow.ip_pool_repo.allocate(self._bridge)
+        if ip_lease is None:
+            raise IpPoolExhausted
+
+        return vmid, ip_lease
+
     async def delete_container(self, vmid: int):
-        await self.check_permissions(vmid)
+        container = await self.check_permissions(vmid)
 
-        async with self._container_provider as container_provider:
-            await container_provider.delete_container(self._node, vmid)
+        response = await self._container_provider.delete_container(container.proxmox_node, vmid)
+        await self._container_provider.wait_task(container.proxmox_node, response.get('data'))
         async with self._uow:
             await self._uow.container_repo.delete_by_vmid(vmid)
+            await self._uow.vmid_repo.release(vmid)
+            if container.lxc_config and 'ip' in container.lxc_config:
+                await self._uow.ip_pool_repo.release(container.lxc_config['ip'])
 
         return True
 
     async def restart_container(self, vmid: int):
-        await self.check_permissions(vmid)
+        container = await self.check_permissions(vmid)
 
-        async with self._container_provider as container_provider:
-            info_restarted = await container_provider.restart_container(self._node, vmid)
-        print(info_restarted)
+        response = await self._container_provider.restart_container(container.proxmox_node, vmid)
+        await self._container_provider.wait_task(container.proxmox_node, response.get('data'))
 
     async def stop_container(self, vmid: int):
-        await self.check_permissions(vmid)
+        container = await self.check_permissions(vmid)
 
-        async with self._container_provider as container_provider:
-            info_restarted = await container_provider.stop_container(self._node, vmid)
-        print(info_restarted)
+        response = await self._container_provider.stop_container(container.proxmox_node, vmid)
+        await self._container_provider.wait_task(container.proxmox_node, response.get('data'))
 
     async def start_container(self, vmid: int):
-        await self.check_permissions(vmid)
+        container = await self.check_permissions(vmid)
 
-        async with self._container_provider as container_provider:
-            info_restarted = await container_provider.start_container(self._node, vmid)
-        print(info_restarted)
+        response = await self._container_provider.start_container(container.proxmox_node, vmid)
+        await self._container_provider.wait_task(container.proxmox_node, response.get('data'))
 
 
     async def get_all_info_containers(self) -> list[ContainerAdminInfo]:
@@ -94,28 +154,26 @@ class ContainerService:
 
         async with self._uow:
             _containers = await self._uow.container_repo.search()
-        async with self._container_provider as container_provider:
-            info_containers = await container_provider.get_info_all_containers(self._node)
+        resources = await self._container_provider.get_cluster_resources()
 
         containers = {container.proxmox_vmid: container for container in _containers}
-        info_containers = {info_container['vmid']: info_container for info_container in info_containers['data'] if 'vmid' in info_container} # type: ignore
 
         all_info_containers = [
             ContainerAdminInfo(
-                id=int(vmid),
-                name=info_vmid.get('name', 'Undefined'),
+                id=vmid,
+                name=resource.name or 'Undefined',
                 owner_username=containers.get(vmid).owner_username if vmid in containers else 'Undefined', # type: ignore
-                rom_bytes=info_vmid.get('maxdisk'),
-                ram_bytes=info_vmid.get('maxmem'),
-                cpu_cores=info_vmid.get('cpus'),
-                status=info_vmid.get('status', 'stopped'),
+                rom_bytes=resource.maxdisk,
+                ram_bytes=resource.maxmem,
+                cpu_cores=resource.maxcpu,
+                status=resource.status, # type: ignore
             )
-            for vmid, info_vmid in info_containers.items()
-            if vmid not in self._is_template
+            for vmid, resource in resources.items()
+            if vmid not in self._is_template and not resource.template
         ]
 
         for vmid, container in containers.items():
-            if vmid not in info_containers and vmid not in self._is_template:
+            if vmid not in resources and vmid not in self._is_template:
                 all_info_containers.append(ContainerAdminInfo(
                 id=int(vmid), # type: ignore
                 name=container.name,
@@ -129,6 +187,33 @@ class ContainerService:
 
         return all_info_containers
 
+    async def get_top_containers(self, metric: str, n: int) -> list[ContainerTopInfo]:
+        if not self._user.is_superuser:
+            raise NoPermissions
+
+        owners = await self._owners.get()
+        return [
+            ContainerTopInfo(
+                id=sample.vmid,
+                name=sample.name,
+                node=sample.node,
+                status=sample.status,
+                owner_username=owners[sample.vmid].username if sample.vmid in owners else 'Undefined',
+                value=value
+            )
+            for sample, value in self._telemetry.top(metric, n)
+            if sample.vmid not in self._is_template
+        ]
+
+    async def get_capacity_forecast(self) -> list[CapacityForecastInfo]:
+        if not self._user.is_superuser:
+            raise NoPermissions
+
+        forecast = self._placement.forecast
+        if forecast is None:
+            return []
+        return [CapacityForecastInfo(**asdict(item)) for item in forecast.forecast()]
+
     async def get_tickets_container(self) -> list[TicketContainerInDB]:
         if not self._user.is_superuser:
             raise NoPermissions
@@ -157,103 +242,195 @@ class ContainerService:
     async def get_telemetry_container(self, vmid: int) -> ContainerTelemetry | None:
         container = await self.check_permissions(vmid)
 
-        async with self._container_provider as container_provider:
-            container_telemetries = await container_provider.get_container_telemetry(container.proxmox_node, container.proxmox_vmid) # type: ignore
-
-            container_info = await container_provider.get_container_info(container.proxmox_node, container.proxmox_vmid) # type: ignore
-
-            container_telemetry: dict[str, Any] = next(
-                (item for item in reversed(container_telemetries['data']) if 'cpu' in item),
-                None # type: ignore
+        sample = self._telemetry.latest(container.proxmox_vmid)
+        if sample is None:
+            # Сборщик еще не видел контейнер или отстал - читаем Proxmox напрямую
+            sample = await self._fetch_telemetry_sample(container)
+
+        return self._build_telemetry(container, sample)
+
+    async def get_telemetry_containers(self, vmids: list[int] | None) -> list[ContainerTelemetry]:
+        """
+        Телеметрия нескольких контейнеров: одна проверка прав, замеры из
+        последнего тика сборщика, а кого в нем нет - из одного /cluster/resources.
+        """
+        containers = await self._permitted_containers(vmids)
+        by_vmid = {container.proxmox_vmid: container for container in containers}
+
+        samples = self._telemetry.latest_many(list(by_vmid)) # type: ignore
+        missing = [vmid for vmid in by_vmid if vmid not in samples]
+        if missing:
+            resources = await self._container_provider.get_cluster_resources()
+            now = time.time()
+            samples.update(
+                (vmid, _resource_sample(resources[vmid], now, self._container_provider.get_cached_rates(vmid))) # type: ignore
+                for vmid in missing if vmid in resources
             )
 
-        status = container_info.status
-
-        status_stop = status == 'stopped'
+        return [
+            self._build_telemetry(container, samples[vmid])
+            for vmid, container in by_vmid.items() if vmid in samples
+        ]
 
-        if not container_telemetry:
-            container_telemetry = {}
+    async def stream_telemetry(
+        self,
+        vmids: list[int] | None,
+        keepalive: float
+    ) -> AsyncGenerator[ContainerTelemetry | None, None]:
+        """
+        Проверяет права и возвращает поток: текущая телеметрия контейнеров,
+        затем обновления с каждым тиком сборщика. None - за keepalive секунд
+        обновлений не было.
+        """
+        containers = await self._permitted_containers(vmids)
+
+        return self._telemetry_events(
+            {container.proxmox_vmid: container for container in containers}, # type: ignore
+            keepalive
+        )
 
-        if status_stop:
-            con_tel = ContainerTelemetry(
-                container=ContainerInfo(id=container.proxmox_vmid, name=container_info.name, status=container_info.status), # type: ignore
+    async def _telemetry_events(
+        self,
+        by_vmid: dict[int, ContainerInDB],
+        keepalive: float
+    ) -> AsyncGenerator[ContainerTelemetry | None, None]:
+        subscription = self._telemetry.subscribe(set(by_vmid)) # type: ignore
+        try:
+            for vmid, container in by_vmid.items():
+                sample = self._telemetry.latest(vmid) # type: ignore
+                if sample is not None:
+                    yield self._build_telemetry(container, sample)
+
+            while True:
+                sample = await subscription.get(keepalive)
+                yield self._build_telemetry(by_vmid[sample.vmid], sample) if sample else None
+        finally:
+            subscription.close()
+
+    def _build_telemetry(self, container: ContainerInDB, sample: TelemetrySample) -> ContainerTelemetry:
+        if sample.status == 'stopped':
+            return ContainerTelemetry(
+                container=ContainerInfo(id=container.proxmox_vmid, name=sample.name, status=sample.status), # type: ignore
                 user=UserPrivacyInfo(username='root', password=container.password), # type: ignore
-                cpu=CpuInfo(cpu_cores=container_info.cpus, free_cpu=1),
-                ram=RamInfo(ram_bytes=int(container_telemetry.get('maxmem', 0)), free_ram_bytes=int(container_telemetry.get('maxmem', 0))),
-                rom=RomInfo(rom_bytes=int(container_telemetry.get('maxdisk', 0)), free_rom_bytes=int(container_telemetry.get('maxdisk', 0))),
+                cpu=CpuInfo(cpu_cores=sample.cpus, free_cpu=1),
+                ram=RamInfo(ram_bytes=sample.maxmem, free_ram_bytes=sample.maxmem),
+                rom=RomInfo(rom_bytes=sample.maxdisk, free_rom_bytes=sample.maxdisk),
                 io=IoInfo(io_operations=0),
                 network=NetworkTrafficInfo(
-                    incoming_total_bytes=int(container_info.netin),
-                    outgoing_total_bytes=int(container_info.netout),
+                    incoming_total_bytes=sample.netin,
+                    outgoing_total_bytes=sample.netout,
                     incoming_current_bytes=0,
                     outgoing_current_bytes=0
                     )
                 )
-        else:
-            con_tel = ContainerTelemetry(
-                container=ContainerInfo(id=container.proxmox_vmid, name=container_info.name, status=container_info.status), # type: ignore
-                user=UserPrivacyInfo(username='root', password=container.password), # type: ignore
-                cpu=CpuInfo(cpu_cores=container_info.cpus, free_cpu=1-container_info.cpu),
-                ram=RamInfo(ram_bytes=int(container_telemetry.get('maxmem', 0)), free_ram_bytes=int(container_telemetry.get('maxmem', 0) - container_telemetry.get('mem', 0))),
-                rom=RomInfo(rom_bytes=int(container_telemetry.get('maxdisk', 0)), free_rom_bytes=int(container_telemetry.get('maxdisk', 0) - container_telemetry.get('disk', 0))),
-                io=IoInfo(io_operations=int(container_telemetry.get('diskread', 0) + container_telemetry.get('diskwrite', 0))),
-                network=NetworkTrafficInfo(
-                    incoming_total_bytes=int(container_info.netin),
-                    outgoing_total_bytes=int(container_info.netout),
-                    incoming_current_bytes=int(container_telemetry.get('netin', 0)),
-                    outgoing_current_bytes=int(container_telemetry.get('netout', 0))
-                )
+
+        return ContainerTelemetry(
+            container=ContainerInfo(id=container.proxmox_vmid, name=sample.name, status=sample.status), # type: ignore
+            user=UserPrivacyInfo(username='root', password=container.password), # type: ignore
+            cpu=CpuInfo(cpu_cores=sample.cpus, free_cpu=1-sample.cpu),
+            ram=RamInfo(ram_bytes=sample.maxmem, free_ram_bytes=sample.maxmem - sample.mem),
+            rom=RomInfo(rom_bytes=sample.maxdisk, free_rom_bytes=sample.maxdisk - sample.disk),
+            io=IoInfo(io_operations=int(sample.diskread_rate + sample.diskwrite_rate)),
+            network=NetworkTrafficInfo(
+                incoming_total_bytes=sample.netin,
+                outgoing_total_bytes=sample.netout,
+                incoming_current_bytes=int(sample.netin_rate),
+                outgoing_current_bytes=int(sample.netout_rate)
             )
+        )
+
+    async def get_telemetry_history(self, vmid: int, window: int, step: int) -> ContainerTelemetryHistory:
+        container = await self.check_permissions(vmid)
+        if window / step > MAX_HISTORY_POINTS:
+            raise TelemetryWindowTooLarge
+
+        history = self._telemetry.history(container.proxmox_vmid, window, step)
+        latest = self._telemetry.latest(container.proxmox_vmid)
+
+        def series(name: str) -> MetricSeries:
+            if history is None:
+                return MetricSeries(min=[], max=[], mean=[], p95=[])
+            stats = history.stats[name]
+            # NaN (нет данных за шаг) -> null
+            columns = np.where(np.isnan(stats), None, stats).T.tolist()
+            return MetricSeries(**dict(zip(HISTORY_STATS, columns, strict=True)))
+
+        return ContainerTelemetryHistory(
+            container=ContainerInfo(
+                id=container.proxmox_vmid,
+                name=latest.name if latest else container.name,
+                status=latest.status if latest else 'stopped' # type: ignore
+            ),
+            window=window,
+            step=history.step if history else step,
+            time=history.time.astype(int).tolist() if history else [],
+            cpu=series('cpu'),
+            ram=series('mem'),
+            rom=series('disk'),
+            network_in=series('netin'),
+            network_out=series('netout'),
+            io=series('io')
+        )
 
-        return con_tel
+    async def _fetch_telemetry_sample(self, container: ContainerInDB) -> TelemetrySample:
+        container_info, rates = await asyncio.gather(
+            self._container_provider.get_container_info(container.proxmox_node, container.proxmox_vmid), # type: ignore
+            self._container_provider.get_container_rates(container.proxmox_node, container.proxmox_vmid) # type: ignore
+        )
+
+        return TelemetrySample(
+            vmid=container.proxmox_vmid,
+            node=container.proxmox_node,
+            name=container_info.name,
+            status=container_info.status,
+            time=time.time(),
+            cpu=container_info.cpu,
+            cpus=container_info.cpus,
+            mem=int(container_info.mem),
+            maxmem=int(container_info.maxmem),
+            disk=int(container_info.disk),
+            maxdisk=int(container_info.maxdisk),
+            netin=int(container_info.netin),
+            netout=int(container_info.netout),
+            diskread=int(container_info.diskread),
+            diskwrite=int(container_info.diskwrite),
+            # Скорости еще не посчитаны (контейнер только появился) - нули
+            netin_rate=rates['netin'] if rates else 0.0,
+            netout_rate=rates['netout'] if rates else 0.0,
+            diskread_rate=rates['diskread'] if rates else 0.0,
+            diskwrite_rate=rates['diskwrite'] if rates else 0.0
+        )
 
     async def get_containers(self) -> list[ContainerInfo]:
         async with self._uow:
             containers = await self._uow.container_repo.search(owner_id=self._user.id)
 
-        async with self._container_provider as container_provider:
-            containers_telemetry = await gather(*[
-                container_provider.get_container_info(container.proxmox_node, container.proxmox_vmid)
-                for container in containers
-            ])
+        resources = await self._container_provider.get_cluster_resources()
 
         containers_info = [
             ContainerInfo(
-                id=container.proxmox_vmid, name=container.name, status=container_telemetry.status
+                id=container.proxmox_vmid,
+                name=container.name,
+                status=resources[container.proxmox_vmid].status if container.proxmox_vmid in resources else 'stopped' # type: ignore
             )
-            for container, container_telemetry in zip(containers, containers_telemetry, strict=True)
+            for container in containers
         ]
 
         return containers_info
 
     async def create_container(self, create_container: CreateContainer) -> ContainerInfo:
-        async with self._container_provider as container_provider:
-            created_container = await container_provider.create_container(
-                node=self._node,
-                host_name=create_container.host_name,
+        container = await self._provision(
+            PlacementRequest(
+                cpu_cores=create_container.cpu_cores,
                 ram_bytes=create_container.ram_bytes,
-                rom_bytes=create_container.rom_bytes,
-                cpu_cores=create_container.cpu_cores
-            )
-
-        container = ContainerInDB(
-            proxmox_node=created_container.node,
-            proxmox_vmid=created_container.vmid,
-            name=created_container.hostname,
-            password=created_container.password,
-            lxc_config={
-                'cpu_cores': created_container.cpu_cores,
-                'rom_bytes': created_container.rom_bytes,
-                'ram_bytes': created_container.ram_bytes
-            },
-            owner_id=self._user.id,
-            owner_username=self._user.username
+                rom_bytes=create_container.rom_bytes
+            ),
+            create_container.host_name,
+            self._user.id, # type: ignore
+            self._user.username # type: ignore
         )
 
-        async with self._uow:
-            await self._uow.container_repo.add(container)
-
-        container_telemetry = await container_provider.get_container_info(container.proxmox_node, container.proxmox_vmid)
+        container_telemetry = await self._container_provider.get_container_info(container.proxmox_node, container.proxmox_vmid)
 
         return ContainerInfo(
             id=container.proxmox_vmid,
@@ -264,40 +441,167 @@ class ContainerService:
     async def create_container_by_ticket(self, id: UUID) -> ContainerInfo:
         async with self._uow:
             ticket_container = await self._uow.ticket_container_repo.get(id)
-            if ticket_container:
-                if ticket_container.closed:
-                    raise TicketContainerClosed
-                ticket_container.closed = True
-                async with self._container_provider as container_provider:
-                    created_container = await container_provider.create_container(
-                        node=self._node,
-                        host_name=ticket_container.name,
-                        ram_bytes=ticket_container.ram_bytes,
-                        rom_bytes=ticket_container.rom_bytes,
-                        cpu_cores=ticket_container.cpu_cores
-                    )
-
-                container = ContainerInDB(
-                    proxmox_node=created_container.node,
-                    proxmox_vmid=created_container.vmid,
-                    name=created_container.hostname,
-                    password=created_container.password,
-                    lxc_config={
-                        'cpu_cores': created_container.cpu_cores,
-                        'rom_bytes': created_container.rom_bytes,
-                        'ram_bytes': created_container.ram_bytes
-                    },
-                    owner_id=ticket_container.owner_id,
-                    owner_username=ticket_container.owner_username
-                )
-
-                await self._uow.container_repo.add(container)
-                await self._uow.ticket_container_repo.update(ticket_container)
+            if not ticket_container:
+                raise TicketContainerNotFound
+            if ticket_container.closed:
+                raise TicketContainerClosed
+            ticket_container.closed = True
+            await self._uow.ticket_container_repo.update(ticket_container)
+
+        container = await self._provision(
+            PlacementRequest(
+                cpu_cores=ticket_container.cpu_cores,
+                ram_bytes=ticket_container.ram_bytes,
+                rom_bytes=ticket_container.rom_bytes
+            ),
+            ticket_container.name,
+            ticket_container.owner_id, # type: ignore
+            ticket_container.owner_username, # type: ignore
+            ticket_container
+        )
 
-                container_telemetry = await container_provider.get_container_info(container.proxmox_node, container.proxmox_vmid)
+        container_telemetry = await self._container_provider.get_container_info(container.proxmox_node, container.proxmox_vmid)
 
         return ContainerInfo(
             id=container.proxmox_vmid,
             name=container.name,
             status=container_telemetry.status
         )
+
+    async def _provision(
+        self,
+        placement_request: PlacementRequest,
+        host_name: str,
+        owner_id: UUID,
+        owner_username: str,
+        ticket: TicketContainerInDB | None = None
+    ) -> ContainerInDB:
+        """
+        Выделяет VMID и адрес короткой транзакцией, создает контейнер в Proxmox
+        вне ее и сохраняет запись о нем (и тикет, если создание по тикету).
+
+        VMID и адрес возвращаются в пул, а тикет открывается снова, только если
+        контейнер точно не создан. При неясном исходе (таймаут, обрыв после
+        отправки) аренда остается: VMID освободит сверка пула, если контейнер
+        так и не появится, а адрес не будет выдан второму контейнеру.
+        """
+        async with self._uow:
+            vmid, ip_lease = await self._allocate_resources()
+
+        requested = False
+        try:
+            async with self._placement.place(placement_request) as node:
+                requested = True
+                created_container = await self._container_provider.create_container(
+                    node=node,
+                    host_name=host_name,
+                    vmid=vmid,
+                    storage=self._placement.storage,
+                    network_config=ip_lease.to_network_config(),
+                    ram_bytes=placement_request.ram_bytes,
+                    rom_bytes=placement_request.rom_bytes,
+                    cpu_cores=placement_request.cpu_cores
+                )
+                await self._container_provider.wait_task(created_container.node, created_container.upid)
+        except Exception as e:
+            if not requested or _not_created(e):
+                await self._release(vmid, ip_lease, ticket)
+            else:
+                logger.warning(f'Container {vmid} may have been created despite {e!r}, keeping VMID and {ip_lease.address} leased')
+            raise
+
+        container = _container_record(created_container, ip_lease, owner_id, owner_username)
+        try:
+            async with self._uow:
+                await self._uow.container_repo.add(container)
+                if ticket is not None:
+                    ticket.proxmox_node = created_container.node
+                    await self._uow.ticket_container_repo.update(ticket)
+        except Exception:
+            # Контейнер без записи в БД никому не принадлежит - удаляем его
+            await self._discard(created_container, ip_lease, ticket)
+            raise
+
+        return container
+
+    async def _release(self, vmid: int, ip_lease: IpLease, ticket: TicketContainerInDB | None) -> None:
+        """Возвращает VMID и адрес в пул, тикет можно исполнить повторно"""
+        async with self._uow:
+            await self._uow.vmid_repo.release(vmid)
+            await self._uow.ip_pool_repo.release(ip_lease.address)
+            if ticket is not None:
+                ticket.closed = False
+                ticket.proxmox_node = None
+                await self._uow.ticket_container_repo.update(ticket)
+
+    async def _discard(self, created_container: CreatedContainer, ip_lease: IpLease, ticket: TicketContainerInDB | None) -> None:
+        """Удаляет созданный контейнер, запись о котором не удалось сохранить"""
+        try:
+            response = await self._container_provider.delete_container(created_container.node, created_container.vmid)
+            await self._container_provider.wait_task(created_container.node, response.get('data'))
+            await self._release(created_container.vmid, ip_lease, ticket)
+        except Exception as e:
+            logger.error(
+                f'Orphaned container {created_container.vmid} on {created_container.node} '
+                f'({ip_lease.address}) has no database record: {e!r}'
+            )
+
+
+def _not_created(error: Exception) -> bool:
+    """Ошибка после отправки запроса на создание, при которой контейнер точно не появился"""
+    if isinstance(error, (ProxmoxTaskError, ProxmoxRejected)):
+        return True
+    return isinstance(error, ProxmoxUnavailable) and not error.sent
+
+
+def _container_record(
+    created_container: CreatedContainer,
+    ip_lease: IpLease,
+    owner_id: UUID,
+    owner_username: str
+) -> ContainerInDB:
+    return ContainerInDB(
+        proxmox_node=created_container.node,
+        proxmox_vmid=created_container.vmid,
+        name=created_container.hostname,
+        password=created_container.password,
+        lxc_config={
+            'cpu_cores': created_container.cpu_cores,
+            'rom_bytes': created_container.rom_bytes,
+            'ram_bytes': created_container.ram_bytes,
+            'ip': ip_lease.address,
+            'bridge': ip_lease.bridge
+        },
+        owner_id=owner_id,
+        owner_username=owner_username
+    )
+
+
+def _resource_sample(
+    resource: ClusterResource,
+    timestamp: float,
+    rates: dict[str, float] | None
+) -> TelemetrySample:
+    """Замер из /cluster/resources; скорости - посчитанные провайдером по прошлым чтениям счетчиков"""
+    rates = rates or {}
+    return TelemetrySample(
+        vmid=resource.vmid,
+        node=resource.node,
+        name=resource.name,
+        status=resource.status,
+        time=timestamp,
+        cpu=resource.cpu,
+        cpus=resource.maxcpu,
+        mem=resource.mem,
+        maxmem=resource.maxmem,
+        disk=resource.disk,
+        maxdisk=resource.maxdisk,
+        netin=resource.netin,
+        netout=resource.netout,
+        diskread=resource.diskread,
+        diskwrite=resource.diskwrite,
+        netin_rate=rates.get('netin', 0.0),
+        netout_rate=rates.get('netout', 0.0),
+        diskread_rate=rates.get('diskread', 0.0),
+        diskwrite_rate=rates.get('diskwrite', 0.0)
+    )
@@ -0,0 +1,62 @@
+from logging import getLogger
+from typing import Callable
+
+from app.config.proxmox import IpPoolSettings
+from app.core.ipam import parse_net0
+from app.domain.providers.container import ContainerAPIProvider
+from app.domain.uow.abstract import AbstractUnitOfWork
+
+logger = getLogger(__name__)
+
+
+class IpamService:
+    """
+    Синхронизация пулов адресов с настройками.
+
+    Адреса выдаются через uow.ip_pool_repo.allocate() в той же транзакции,
+    что и VMID. Для нового пула занятыми помечаются адреса уже существующих
+    контейнеров; у старых контейнеров без lxc_config['ip'] адрес берется
+    из net0 в конфиге Proxmox и сохраняется в lxc_config.
+    """
+
+    def __init__(
+        self,
+        uow_factory: Callable[[], AbstractUnitOfWork],
+        container_provider: ContainerAPIProvider,
+        pools: list[IpPoolSettings]
+    ):
+        self._uow_factory = uow_factory
+        self._container_provider = container_provider
+        self._pools = pools
+
+    async def sync(self) -> None:
+        uow = self._uow_factory()
+        async with uow:
+            created = [
+                pool for pool in self._pools
+                if await uow.ip_pool_repo.ensure_pool(pool.bridge, pool.subnet, pool.gateway)
+            ]
+
+            if not created:
+                return
+
+            offset = 0
+            while containers := await uow.container_repo.search(offset=offset):
+                offset += len(containers)
+                for container in containers:
+                    lxc_config = container.lxc_config or {}
+                    if 'ip' not in lxc_config:
+                        try:
+                            raw = await self._container_provider.get_container_config(container.proxmox_node, container.proxmox_vmid)
+                        except Exception as e:
+                            logger.warning(f'Cannot read network config of {container.proxmox_vmid}: {e}')
+                            continue
+                        net0 = parse_net0(raw['data'].get('net0', ''))
+                        if net0.get('ip', 'dhcp') == 'dhcp':
+                            continue
+                        container.lxc_config = {**lxc_config, 'ip': net0['ip'], 'bridge': net0.get('bridge')}
+                        await uow.container_repo.update(container)
+
+                    await uow.ip_pool_repo.mark_used(container.lxc_config['ip']) # type: ignore
+
+        logger.info(f'IP pools created: {[pool.subnet for pool in created]}')
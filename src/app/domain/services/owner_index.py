@@ -0,0 +1,39 @@
+import asyncio
+import time
+from typing import Callable
+
+from app.core.dto.container import ContainerOwner
+from app.domain.uow.abstract import AbstractUnitOfWork
+
+
+class OwnerIndex:
+    """
+    Кэш vmid -> владелец контейнера для горячих путей (top, алерты, метрики):
+    одна выборка из БД раз в ttl секунд вместо запроса на каждый вызов.
+    version растет с каждой перезагрузкой - по нему кэшируют производное от индекса.
+    """
+
+    def __init__(self, uow_factory: Callable[[], AbstractUnitOfWork], ttl: float):
+        self._uow_factory = uow_factory
+        self._ttl = ttl
+        self._owners: dict[int, ContainerOwner] = {}
+        self._expire = 0.0
+        self.version = 0
+        self._lock = asyncio.Lock()
+
+    async def get(self) -> dict[int, ContainerOwner]:
+        if time.monotonic() < self._expire:
+            return self._owners
+
+        async with self._lock:
+            # Пока ждали блокировку, индекс мог обновить другой запрос
+            if time.monotonic() >= self._expire:
+                uow = self._uow_factory()
+                async with uow:
+                    self._owners = await uow.container_repo.get_owners()
+                self.version += 1
+                self._expire = time.monotonic() + self._ttl
+        return self._owners
+
+    def invalidate(self) -> None:
+        self._expire = 0.0
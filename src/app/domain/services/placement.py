@@ -0,0 +1,149 @@
+import asyncio
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from logging import getLogger
+from typing import AsyncIterator
+
+from app.core.dto.node import NodeCapacity, PlacementRequest
+from app.domain.providers.capacity import CapacityForecastProvider
+from app.domain.providers.container import ContainerAPIProvider
+from app.presentation.exceptions.container import NoNodeAvailable
+
+logger = getLogger(__name__)
+
+
+class PlacementStrategy(ABC):
+    """Оценка ноды под запрос: чем больше score, тем лучше нода"""
+
+    @abstractmethod
+    def score(self, capacity: NodeCapacity, request: PlacementRequest) -> float: ...
+
+
+class SpreadStrategy(PlacementStrategy):
+    """Самая свободная по памяти и диску нода - нагрузка размазывается по кластеру"""
+
+    def score(self, capacity: NodeCapacity, request: PlacementRequest) -> float:
+        mem_left = (capacity.mem_free - request.ram_bytes) / capacity.mem_total
+        storage_left = (capacity.storage_free - request.rom_bytes) / capacity.storage_total
+        return min(mem_left, storage_left)
+
+
+class BinPackStrategy(PlacementStrategy):
+    """Самая заполненная нода, на которую запрос еще помещается"""
+
+    def score(self, capacity: NodeCapacity, request: PlacementRequest) -> float:
+        return -SpreadStrategy().score(capacity, request)
+
+
+class LeastLoadedStrategy(PlacementStrategy):
+    """Нода с наименьшей загрузкой CPU на ядро запроса"""
+
+    def score(self, capacity: NodeCapacity, request: PlacementRequest) -> float:
+        idle_cores = (1 - capacity.cpu) * capacity.cpus
+        return idle_cores - request.cpu_cores
+
+
+PLACEMENT_STRATEGIES: dict[str, type[PlacementStrategy]] = {
+    'spread': SpreadStrategy,
+    'binpack': BinPackStrategy,
+    'least_loaded': LeastLoadedStrategy,
+}
+
+
+class PlacementEngine:
+    """
+    Выбор ноды для нового контейнера.
+
+    Емкость нод берется из кэшированных /nodes/{node}/status и статуса
+    хранилища. Пока контейнер создается, его ресурсы зарезервированы
+    за выбранной нодой, чтобы параллельные создания не выбрали одну и
+    ту же ноду по устаревшему снимку.
+
+    С подключенным прогнозом емкости ноды, которые с новым контейнером
+    заполнятся раньше чем через horizon, выбираются только если других нет.
+    """
+
+    def __init__(
+        self,
+        container_provider: ContainerAPIProvider,
+        strategy: PlacementStrategy,
+        storage: str,
+        nodes: list[str] | None = None
+    ):
+        self._container_provider = container_provider
+        self._strategy = strategy
+        self.storage = storage
+        self._nodes = nodes or []
+        self._reserved: dict[str, list[PlacementRequest]] = {}
+        self.forecast: CapacityForecastProvider | None = None
+        self._horizon = 0.0
+
+    def set_forecast(self, forecast: CapacityForecastProvider, horizon: float) -> None:
+        self.forecast = forecast
+        self._horizon = horizon
+
+    async def get_capacities(self) -> list[NodeCapacity]:
+        nodes = self._nodes or await self._container_provider.get_nodes()
+        results = await asyncio.gather(
+            *[self._container_provider.get_node_capacity(node, self.storage) for node in nodes],
+            return_exceptions=True
+        )
+
+        capacities = []
+        for node, result in zip(nodes, results, strict=True):
+            if isinstance(result, BaseException):
+                logger.warning(f'Node {node} skipped for placement: {result}')
+                continue
+            capacities.append(self._apply_reservations(result))
+        return capacities
+
+    def _apply_reservations(self, capacity: NodeCapacity) -> NodeCapacity:
+        reserved = self._reserved.get(capacity.node, [])
+        return NodeCapacity(
+            node=capacity.node,
+            cpu=min(1.0, capacity.cpu + sum(r.cpu_cores for r in reserved) / max(capacity.cpus, 1)),
+            cpus=capacity.cpus,
+            mem_total=capacity.mem_total,
+            mem_free=capacity.mem_free - sum(r.ram_bytes for r in reserved),
+            storage_total=capacity.storage_total,
+            storage_free=capacity.storage_free - sum(r.rom_bytes for r in reserved)
+        )
+
+    async def select_node(self, request: PlacementRequest) -> str:
+        candidates = [
+            capacity for capacity in await self.get_capacities()
+            if capacity.mem_total and capacity.storage_total
+            and capacity.mem_free >= request.ram_bytes
+            and capacity.storage_free >= request.rom_bytes
+        ]
+        if not candidates:
+            raise NoNodeAvailable
+        candidates = self._prefer_runway(candidates, request)
+
+        best = max(candidates, key=lambda capacity: self._strategy.score(capacity, request))
+        return best.node
+
+    def _prefer_runway(self, candidates: list[NodeCapacity], request: PlacementRequest) -> list[NodeCapacity]:
+        if self.forecast is None:
+            return candidates
+
+        lasting = []
+        for capacity in candidates:
+            runway = self.forecast.runway(capacity.node, request)
+            if runway is None or runway >= self._horizon:
+                lasting.append(capacity)
+        if not lasting:
+            logger.warning('Every node is forecast to run out of capacity within the placement horizon')
+            return candidates
+        return lasting
+
+    @asynccontextmanager
+    async def place(self, request: PlacementRequest) -> AsyncIterator[str]:
+        """Выбирает ноду и держит резерв на время создания контейнера"""
+        node = await self.select_node(request)
+        reserved = self._reserved.setdefault(node, [])
+        reserved.append(request)
+        try:
+            yield node
+        finally:
+            reserved.remove(request)
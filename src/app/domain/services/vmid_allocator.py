@@ -0,0 +1,57 @@
+import asyncio
+from logging import getLogger
+from typing import Callable
+
+from app.domain.providers.container import ContainerAPIProvider
+from app.domain.uow.abstract import AbstractUnitOfWork
+
+logger = getLogger(__name__)
+
+
+def parse_vmid_ranges(value: str) -> list[tuple[int, int]]:
+    """'100-199,1000-1999' -> [(100, 199), (1000, 1999)]"""
+    ranges = []
+    for part in value.split(','):
+        start, _, end = part.strip().partition('-')
+        ranges.append((int(start), int(end or start)))
+    return ranges
+
+
+class VmidAllocator:
+    """
+    Фоновая сверка пула VMID с Proxmox и таблицей контейнеров.
+
+    Сами id выдаются через uow.vmid_repo.allocate() в транзакции создания
+    контейнера; сверка добавляет новые диапазоны, помечает занятые в кластере
+    id и возвращает в пул id, выданные под так и не созданные контейнеры.
+    """
+
+    def __init__(
+        self,
+        uow_factory: Callable[[], AbstractUnitOfWork],
+        container_provider: ContainerAPIProvider,
+        ranges: list[tuple[int, int]],
+        lease_grace: float
+    ):
+        self._uow_factory = uow_factory
+        self._container_provider = container_provider
+        self._ranges = ranges
+        self._lease_grace = lease_grace
+
+    async def reconcile(self) -> None:
+        resources = await self._container_provider.get_cluster_resources()
+
+        uow = self._uow_factory()
+        async with uow:
+            used = set(resources) | set(await uow.container_repo.get_vmids())
+            await uow.vmid_repo.reconcile(self._ranges, used, self._lease_grace)
+
+        logger.info(f'VMID pool reconciled: {len(used)} ids in use')
+
+    async def run(self, interval: float) -> None:
+        while True:
+            try:
+                await self.reconcile()
+            except Exception as e:
+                logger.error(f'VMID pool reconcile failed: {e}')
+            await asyncio.sleep(interval)
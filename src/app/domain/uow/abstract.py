@@ -1,9 +1,12 @@
 from abc import ABC, abstractmethod
 
 from app.domain.repo.container import ContainerRepository
+from app.domain.repo.ip_pool import IpPoolRepository
 from app.domain.repo.tg_user import TgUserRepository
 from app.domain.repo.ticket_container import TicketContainerRepository
+from app.domain.repo.usage import UsageRepository
 from app.domain.repo.user import UserRepository
+from app.domain.repo.vmid import VmidRepository
 
 
 class AbstractUnitOfWork(ABC):
@@ -27,6 +30,21 @@ class AbstractUnitOfWork(ABC):
     def tg_users_repo(self) -> TgUserRepository:
         raise NotImplementedError
 
+    @property
+    @abstractmethod
+    def vmid_repo(self) -> VmidRepository:
+        raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def ip_pool_repo(self) -> IpPoolRepository:
+        raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def usage_repo(self) -> UsageRepository:
+        raise NotImplementedError
+
     @abstractmethod
     async def __aenter__(self) -> 'AbstractUnitOfWork':
         raise NotImplementedError
@@ -2,9 +2,10 @@ from typing import Protocol
 
 from app.domain.models.user import UserInDB
 from app.domain.schemas.user import UserProfile
+from app.domain.uow.abstract import AbstractUnitOfWork
 
 
 class ProfileUserUseCase(Protocol):
-    def __init__(self, user: UserInDB): ...
+    def __init__(self, user: UserInDB, uow: AbstractUnitOfWork): ...
 
     async def __call__(self) -> UserProfile: ...
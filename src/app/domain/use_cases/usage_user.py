@@ -0,0 +1,12 @@
+from datetime import datetime
+from typing import Protocol
+
+from app.domain.models.user import UserInDB
+from app.domain.schemas.user import UserUsage
+from app.domain.uow.abstract import AbstractUnitOfWork
+
+
+class UsageUserUseCase(Protocol):
+    def __init__(self, user: UserInDB, uow: AbstractUnitOfWork): ...
+
+    async def __call__(self, start: datetime, end: datetime) -> UserUsage: ...
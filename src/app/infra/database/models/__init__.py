@@ -1,3 +1,6 @@
 from .base import Base
 from .container import Container
+from .ip_pool import IpPool
+from .usage import Usage
 from .user import User
+from .vmid import Vmid
@@ -0,0 +1,13 @@
+from sqlalchemy import LargeBinary, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class IpPool(Base):
+    bridge: Mapped[str] = mapped_column(String(32), nullable=False, index=True)
+    subnet: Mapped[str] = mapped_column(String(43), unique=True, nullable=False)
+    gateway: Mapped[str] = mapped_column(String(39), nullable=False)
+
+    # Бит на каждый адрес подсети, 1 - адрес занят
+    bitmap: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
@@ -7,7 +7,7 @@ from .base import Base
 
 
 class TicketContainer(Base):
-    proxmox_node: Mapped[str] = mapped_column(String(64), nullable=False)
+    proxmox_node: Mapped[str | None] = mapped_column(String(64), nullable=True)
     name: Mapped[str] = mapped_column(String(128), nullable=False, index=True)
     password: Mapped[str] = mapped_column(String, server_default="")
 
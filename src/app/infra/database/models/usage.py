@@ -0,0 +1,21 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import BigInteger, DateTime, Float, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class Usage(Base):
+    """Часовые итоги потребления по владельцу, пишет UsageMeter"""
+    __table_args__ = (UniqueConstraint('owner_id', 'hour'),)
+
+    owner_id: Mapped[UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    hour: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    cpu_seconds: Mapped[float] = mapped_column(Float, nullable=False)
+    ram_gb_hours: Mapped[float] = mapped_column(Float, nullable=False)
+    disk_gb_hours: Mapped[float] = mapped_column(Float, nullable=False)
+    net_in_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    net_out_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False)
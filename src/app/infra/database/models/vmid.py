@@ -0,0 +1,25 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Boolean, DateTime, Index, Integer, text
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import expression
+
+from .base import Base
+
+
+class Vmid(Base):
+    # Пул VMID: строка на каждый id из настроенных диапазонов
+    vmid: Mapped[int] = mapped_column(Integer, unique=True, nullable=False)
+    allocated: Mapped[bool] = mapped_column(
+        Boolean,
+        default=False,
+        server_default=expression.false(),
+        nullable=False
+    )
+    allocated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Свободные id выбираются по этому индексу за O(log n)
+        Index('ix_vmids_free', 'vmid', postgresql_where=text('NOT allocated')),
+    )
@@ -2,14 +2,17 @@ from logging import getLogger
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import and_
+from sqlalchemy import and_, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
 
+from app.core.dto.container import ContainerOwner
 from app.domain.models.container import ContainerInDB
 from app.domain.repo.container import ContainerRepository
 from app.infra.database.models.container import Container
+from app.infra.database.models.tg_user import TgUser
+from app.infra.database.models.user import User
 
 logger = getLogger(__name__)
 
@@ -36,6 +39,37 @@ class SQLAlchemyContainerRepository(ContainerRepository):
             return self._map_to_domain(orm_container)
         return None
 
+    async def get_by_vmids(self, vmids: list[int]) -> list[ContainerInDB]:
+        stmt = select(Container).where(Container.proxmox_vmid.in_(vmids)).options(selectinload(Container.owner))
+        result = await self.session.execute(stmt)
+        return [self._map_to_domain(orm_container) for orm_container in result.scalars()]
+
+    async def get_by_owner(self, owner_id: UUID) -> list[ContainerInDB]:
+        stmt = select(Container).where(Container.owner_id == owner_id).options(selectinload(Container.owner))
+        result = await self.session.execute(stmt)
+        return [self._map_to_domain(orm_container) for orm_container in result.scalars()]
+
+    async def get_vmids(self) -> list[int]:
+        result = await self.session.execute(select(Container.proxmox_vmid))
+        return list(result.scalars())
+
+    async def count_by_owner(self, owner_id: UUID) -> int:
+        stmt = select(func.count()).select_from(Container).where(Container.owner_id == owner_id)
+        result = await self.session.execute(stmt)
+        return result.scalar_one()
+
+    async def get_owners(self) -> dict[int, ContainerOwner]:
+        stmt = (
+            select(Container.proxmox_vmid, Container.name, Container.owner_id, User.username, TgUser.chat_id)
+            .join(User, User.id == Container.owner_id)
+            .outerjoin(TgUser, and_(TgUser.user_id == User.id, TgUser.is_deleted.is_(False)))
+        )
+        result = await self.session.execute(stmt)
+        return {
+            vmid: ContainerOwner(vmid=vmid, name=name, owner_id=owner_id, username=username, chat_id=chat_id)
+            for vmid, name, owner_id, username, chat_id in result
+        }
+
     async def search(
         self,
         name: Optional[str] = None,
@@ -0,0 +1,95 @@
+from ipaddress import IPv4Network, ip_interface
+from logging import getLogger
+from typing import Optional
+
+from sqlalchemy import cast
+from sqlalchemy.dialects.postgresql import CIDR, INET
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.core.dto.network import IpLease
+from app.core.ipam import (
+    address_at,
+    address_offset,
+    clear_bit,
+    empty_bitmap,
+    first_free,
+    set_bit,
+)
+from app.domain.repo.ip_pool import IpPoolRepository
+from app.infra.database.models.ip_pool import IpPool
+
+logger = getLogger(__name__)
+
+
+class SQLAlchemyIpPoolRepository(IpPoolRepository):
+    def __init__(self, session: AsyncSession) -> None:
+        self.session: AsyncSession = session
+
+    async def ensure_pool(self, bridge: str, subnet: str, gateway: str) -> bool:
+        network = IPv4Network(subnet)
+        result = await self.session.execute(select(IpPool).where(IpPool.subnet == str(network)))
+        if result.scalars().first():
+            return False
+
+        self.session.add(IpPool(
+            bridge=bridge,
+            subnet=str(network),
+            gateway=gateway,
+            bitmap=bytes(empty_bitmap(network, gateway))
+        ))
+        await self.session.flush()
+        return True
+
+    async def allocate(self, bridge: str) -> Optional[IpLease]:
+        stmt = (
+            select(IpPool)
+            .where(IpPool.bridge == bridge)
+            .order_by(IpPool.subnet)
+            .with_for_update()
+        )
+        result = await self.session.execute(stmt)
+
+        for pool in result.scalars():
+            network = IPv4Network(pool.subnet)
+            offset = first_free(pool.bitmap, network.num_addresses)
+            if offset is None:
+                continue
+
+            bitmap = bytearray(pool.bitmap)
+            set_bit(bitmap, offset)
+            pool.bitmap = bytes(bitmap)
+            await self.session.flush()
+
+            return IpLease(bridge=pool.bridge, address=address_at(network, offset), gateway=pool.gateway)
+
+        return None
+
+    async def mark_used(self, address: str) -> None:
+        await self._update_bit(address, used=True)
+
+    async def release(self, address: str) -> None:
+        await self._update_bit(address, used=False)
+
+    async def _update_bit(self, address: str, used: bool) -> None:
+        ip = ip_interface(address).ip
+        stmt = (
+            select(IpPool)
+            .where(cast(IpPool.subnet, CIDR).op('>>')(cast(str(ip), INET)))
+            .with_for_update()
+        )
+        result = await self.session.execute(stmt)
+
+        for pool in result.scalars():
+            network = IPv4Network(pool.subnet)
+            bitmap = bytearray(pool.bitmap)
+            offset = address_offset(network, address)
+            if used:
+                set_bit(bitmap, offset)
+            else:
+                clear_bit(bitmap, offset)
+            pool.bitmap = bytes(bitmap)
+            await self.session.flush()
+            return
+
+        logger.warning(f'Address {address} does not belong to any IP pool')
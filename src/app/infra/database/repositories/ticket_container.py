@@ -56,6 +56,7 @@ class SQLAlchemyTicketContainerRepository(TicketContainerRepository):
             raise ValueError(f"Container with id {container.id} not found")
 
         orm_container.name = container.name
+        orm_container.proxmox_node = container.proxmox_node
         orm_container.closed = container.closed
 
         await self.session.flush()
@@ -75,6 +76,7 @@ class SQLAlchemyTicketContainerRepository(TicketContainerRepository):
         return TicketContainerInDB(
             id=orm_container.id,
             name=orm_container.name,
+            proxmox_node=orm_container.proxmox_node,
             ram_bytes=orm_container.ram_bytes,
             cpu_cores=orm_container.cpu_cores,
             rom_bytes=orm_container.rom_bytes,
@@ -86,7 +88,7 @@ class SQLAlchemyTicketContainerRepository(TicketContainerRepository):
 
     def _map_to_orm(self, container: TicketContainerInDB) -> TicketContainer:
         return TicketContainer(
-            proxmox_node='nvcloud',
+            proxmox_node=container.proxmox_node,
             id=container.id,
             name=container.name,
             ram_bytes=container.ram_bytes,
@@ -0,0 +1,47 @@
+from dataclasses import asdict
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.dto.usage import USAGE_FIELDS, UsageRecord
+from app.domain.repo.usage import UsageRepository
+from app.infra.database.models.usage import Usage
+
+
+class SQLAlchemyUsageRepository(UsageRepository):
+    def __init__(self, session: AsyncSession) -> None:
+        self.session: AsyncSession = session
+
+    async def upsert(self, records: list[UsageRecord]) -> None:
+        if not records:
+            return
+        stmt = insert(Usage).values([asdict(record) for record in records])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Usage.owner_id, Usage.hour],
+            # Час мог записываться частями (остановка посреди часа) - итоги складываются
+            set_={field: getattr(Usage, field) + stmt.excluded[field] for field in USAGE_FIELDS}
+        )
+        await self.session.execute(stmt)
+
+    async def get_by_owner(self, owner_id: UUID, start: datetime, end: datetime) -> list[UsageRecord]:
+        stmt = (
+            select(Usage)
+            .where(Usage.owner_id == owner_id, Usage.hour >= start, Usage.hour < end)
+            .order_by(Usage.hour)
+        )
+        result = await self.session.execute(stmt)
+        return [
+            UsageRecord(
+                owner_id=usage.owner_id,
+                hour=usage.hour,
+                cpu_seconds=usage.cpu_seconds,
+                ram_gb_hours=usage.ram_gb_hours,
+                disk_gb_hours=usage.disk_gb_hours,
+                net_in_bytes=usage.net_in_bytes,
+                net_out_bytes=usage.net_out_bytes
+            )
+            for usage in result.scalars()
+        ]
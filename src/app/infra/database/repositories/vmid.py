@@ -0,0 +1,86 @@
+from logging import getLogger
+from typing import Optional
+
+from sqlalchemy import and_, delete, func, not_, or_, select, text, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.repo.vmid import VmidRepository
+from app.infra.database.models.vmid import Vmid
+
+logger = getLogger(__name__)
+
+# Ключ advisory lock, под которым работает сверка пула
+RECONCILE_LOCK_KEY = 0x766D6964
+
+
+class SQLAlchemyVmidRepository(VmidRepository):
+    def __init__(self, session: AsyncSession) -> None:
+        self.session: AsyncSession = session
+
+    async def allocate(self) -> Optional[int]:
+        free_vmid = (
+            select(Vmid.vmid)
+            .where(not_(Vmid.allocated))
+            .order_by(Vmid.vmid)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        stmt = (
+            update(Vmid)
+            .where(Vmid.vmid == free_vmid)
+            .values(allocated=True, allocated_at=func.now())
+            .returning(Vmid.vmid)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def release(self, vmid: int) -> None:
+        await self.session.execute(
+            update(Vmid)
+            .where(Vmid.vmid == vmid)
+            .values(allocated=False, allocated_at=None)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def reconcile(self, ranges: list[tuple[int, int]], used: set[int], grace_seconds: float) -> None:
+        await self.session.execute(text("SET LOCAL lock_timeout = '5s'"))
+        await self.session.execute(select(func.pg_advisory_xact_lock(RECONCILE_LOCK_KEY)))
+
+        in_ranges = or_(*[Vmid.vmid.between(start, end) for start, end in ranges])
+        used_ids = list(used)
+
+        for start, end in ranges:
+            await self.session.execute(
+                insert(Vmid)
+                .from_select(['vmid'], select(func.generate_series(start, end)), include_defaults=False)
+                .on_conflict_do_nothing(index_elements=['vmid'])
+            )
+
+        await self.session.execute(
+            delete(Vmid)
+            .where(and_(not_(Vmid.allocated), not_(in_ranges)))
+            .execution_options(synchronize_session=False)
+        )
+
+        if used_ids:
+            await self.session.execute(
+                update(Vmid)
+                .where(and_(not_(Vmid.allocated), Vmid.vmid.in_(used_ids)))
+                .values(allocated=True, allocated_at=func.now())
+                .execution_options(synchronize_session=False)
+            )
+
+        # Выданные, но так и не созданные id возвращаются в пул после grace-периода
+        await self.session.execute(
+            update(Vmid)
+            .where(and_(
+                Vmid.allocated,
+                Vmid.vmid.not_in(used_ids),
+                Vmid.allocated_at < func.now() - func.make_interval(0, 0, 0, 0, 0, 0, grace_seconds)
+            ))
+            .values(allocated=False, allocated_at=None)
+            .execution_options(synchronize_session=False)
+        )
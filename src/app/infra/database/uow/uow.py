@@ -3,11 +3,14 @@ from sqlalchemy.orm import sessionmaker
 
 from app.domain.uow.abstract import AbstractUnitOfWork
 from app.infra.database.repositories.container import SQLAlchemyContainerRepository
+from app.infra.database.repositories.ip_pool import SQLAlchemyIpPoolRepository
 from app.infra.database.repositories.tg_user import SQLAlchemyTgUserRepository
 from app.infra.database.repositories.ticket_container import (
     SQLAlchemyTicketContainerRepository,
 )
+from app.infra.database.repositories.usage import SQLAlchemyUsageRepository
 from app.infra.database.repositories.user import SQLAlchemyUserRepository
+from app.infra.database.repositories.vmid import SQLAlchemyVmidRepository
 
 
 class SQLAlchemyUnitOfWork(AbstractUnitOfWork):
@@ -18,6 +21,9 @@ class SQLAlchemyUnitOfWork(AbstractUnitOfWork):
         self._container_repo: SQLAlchemyContainerRepository = None # type: ignore
         self._ticket_container_repo: SQLAlchemyTicketContainerRepository = None # type: ignore
         self._tg_users_repo: SQLAlchemyTgUserRepository = None # type: ignore
+        self._vmid_repo: SQLAlchemyVmidRepository = None # type: ignore
+        self._ip_pool_repo: SQLAlchemyIpPoolRepository = None # type: ignore
+        self._usage_repo: SQLAlchemyUsageRepository = None # type: ignore
 
     @property
     def user_repo(self):
@@ -35,12 +41,27 @@ class SQLAlchemyUnitOfWork(AbstractUnitOfWork):
     def tg_users_repo(self):
         return self._tg_users_repo
 
+    @property
+    def vmid_repo(self):
+        return self._vmid_repo
+
+    @property
+    def ip_pool_repo(self):
+        return self._ip_pool_repo
+
+    @property
+    def usage_repo(self):
+        return self._usage_repo
+
     async def __aenter__(self):
         self.session = self._session_factory()
         self._user_repo = SQLAlchemyUserRepository(self.session)
         self._container_repo = SQLAlchemyContainerRepository(self.session)
         self._ticket_container_repo = SQLAlchemyTicketContainerRepository(self.session)
         self._tg_users_repo = SQLAlchemyTgUserRepository(self.session)
+        self._vmid_repo = SQLAlchemyVmidRepository(self.session)
+        self._ip_pool_repo = SQLAlchemyIpPoolRepository(self.session)
+        self._usage_repo = SQLAlchemyUsageRepository(self.session)
         await self.session.begin()
         return self
 
@@ -1,8 +1,51 @@
 from app.config import create_settings
+from app.domain.services.placement import PLACEMENT_STRATEGIES, PlacementEngine
 
 from .proxmox_provider import ProxmoxProvider
 
+_provider: ProxmoxProvider | None = None
+_placement: PlacementEngine | None = None
+
 
 def create_provider() -> ProxmoxProvider:
     settings = create_settings().proxmox_settings
     return ProxmoxProvider(settings)
+
+
+def create_placement(provider: ProxmoxProvider) -> PlacementEngine:
+    settings = create_settings().proxmox_settings
+    return PlacementEngine(
+        provider,
+        PLACEMENT_STRATEGIES[settings.PLACEMENT_STRATEGY](),
+        settings.PLACEMENT_STORAGE,
+        settings.PLACEMENT_NODES
+    )
+
+
+async def init_provider() -> ProxmoxProvider:
+    global _provider, _placement
+    if _provider is None:
+        _provider = create_provider()
+        await _provider.start()
+        _placement = create_placement(_provider)
+    return _provider
+
+
+def get_provider() -> ProxmoxProvider:
+    if _provider is None:
+        raise RuntimeError("ProxmoxProvider has not been initialized yet.")
+    return _provider
+
+
+def get_placement() -> PlacementEngine:
+    if _placement is None:
+        raise RuntimeError("PlacementEngine has not been initialized yet.")
+    return _placement
+
+
+async def close_provider() -> None:
+    global _provider, _placement
+    if _provider is not None:
+        await _provider.close()
+        _provider = None
+        _placement = None
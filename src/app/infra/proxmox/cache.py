@@ -0,0 +1,78 @@
+import asyncio
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Awaitable, Callable
+
+CacheKey = tuple[str | None, int | None, str]
+
+
+class TTLCache:
+    """
+    LRU-кэш ответов Proxmox с TTL.
+
+    Ключ - (node, vmid, endpoint). Параллельные промахи по одному ключу
+    ждут один и тот же запрос (single-flight). Для кластерных запросов
+    node и vmid равны None.
+    """
+
+    def __init__(self, ttl: float, max_size: int):
+        self._ttl = ttl
+        self._max_size = max_size
+        self._entries: OrderedDict[CacheKey, tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[CacheKey, asyncio.Task[Any]] = {}
+
+    async def get_or_load(self, key: CacheKey, loader: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > monotonic():
+                self._entries.move_to_end(key)
+                return value
+            del self._entries[key]
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._load(key, loader))
+            task.add_done_callback(_consume_exception)
+            self._inflight[key] = task
+
+        # shield: отмена одного ожидающего не отменяет общий запрос
+        return await asyncio.shield(task)
+
+    async def _load(self, key: CacheKey, loader: Callable[[], Awaitable[Any]]) -> Any:
+        task = asyncio.current_task()
+        try:
+            value = await loader()
+            # Если ключ инвалидировали во время запроса - результат не кэшируем
+            if self._inflight.get(key) is task:
+                self._store(key, value)
+            return value
+        finally:
+            if self._inflight.get(key) is task:
+                del self._inflight[key]
+
+    def _store(self, key: CacheKey, value: Any) -> None:
+        self._entries[key] = (monotonic() + self._ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, node: str, vmid: int, *shared: CacheKey) -> None:
+        """
+        Сбрасывает записи контейнера, общие записи его ноды (vmid None)
+        и перечисленные shared - кластерные снимки, в которые входит контейнер
+        """
+        for keys in (list(self._entries), list(self._inflight)):
+            for key in keys:
+                if key in shared or (key[0] == node and key[1] in (vmid, None)):
+                    self._entries.pop(key, None)
+                    self._inflight.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._inflight.clear()
+
+
+def _consume_exception(task: asyncio.Task[Any]) -> None:
+    if not task.cancelled():
+        task.exception()
@@ -0,0 +1,419 @@
+"""
+Локальная замена Proxmox API для нагрузочных прогонов без кластера.
+
+Держит состояние контейнеров в памяти, выполняет действия как асинхронные
+задачи (UPID) и умеет добавлять задержку и ошибки:
+
+    python -m app.infra.proxmox.fake_server --port 8006 --containers 500 \\
+        --latency 0.02 --failure-rate 0.01
+
+Провайдер подключается через PROXMOX_BASE_URL=http://127.0.0.1:8006/
+"""
+import argparse
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+from aiohttp import web
+
+GiB = 1024 ** 3
+
+Handler = Callable[[web.Request], Awaitable[web.StreamResponse]]
+
+
+class FakeProxmoxError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class FakeContainer:
+    node: str
+    vmid: int
+    name: str
+    cores: int
+    maxmem: int
+    maxdisk: int
+    net0: str = 'name=eth0,bridge=vmbr0,ip=dhcp'
+    status: str = 'stopped'
+    template: bool = False
+    started_at: float | None = None
+    lock: str | None = None
+    # Базовая нагрузка, вокруг которой шумят метрики
+    load: float = field(default_factory=lambda: random.uniform(0.02, 0.3))
+
+    @property
+    def uptime(self) -> int:
+        return int(time.time() - self.started_at) if self.started_at else 0
+
+    def sample(self) -> dict[str, Any]:
+        """Текущие метрики; счетчики трафика и IO растут с аптаймом"""
+        running = self.status == 'running'
+        uptime = self.uptime
+        cpu = min(max(random.gauss(self.load, 0.05), 0.0), 1.0) * self.cores if running else 0.0
+        return {
+            'cpu': cpu / self.cores,
+            'cpus': self.cores,
+            'maxcpu': self.cores,
+            'mem': int(self.maxmem * self.load * 0.8) if running else 0,
+            'maxmem': self.maxmem,
+            'disk': int(self.maxdisk * 0.3),
+            'maxdisk': self.maxdisk,
+            'swap': 0,
+            'maxswap': 512 * 1024 ** 2,
+            'netin': int(uptime * 40_000 * self.load),
+            'netout': int(uptime * 25_000 * self.load),
+            'diskread': int(uptime * 8_000 * self.load),
+            'diskwrite': int(uptime * 12_000 * self.load),
+            'uptime': uptime,
+        }
+
+
+@dataclass
+class FakeTask:
+    node: str
+    upid: str
+    type: str
+    starttime: int
+    status: str = 'running'
+    exitstatus: str | None = None
+
+
+class FakeProxmox:
+    def __init__(
+        self,
+        nodes: list[str],
+        latency: float = 0.0,
+        failure_rate: float = 0.0,
+        task_duration: float = 0.5,
+        node_mem: int = 256 * GiB,
+        node_storage: int = 4096 * GiB,
+        node_cpus: int = 128
+    ):
+        self.nodes = nodes
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.task_duration = task_duration
+        self.node_mem = node_mem
+        self.node_storage = node_storage
+        self.node_cpus = node_cpus
+
+        self.containers: dict[int, FakeContainer] = {}
+        self.tasks: dict[str, FakeTask] = {}
+        self.requests = 0
+        self._pid = 0
+        self._background: set[asyncio.Task[None]] = set()
+
+    def populate(self, count: int, first_vmid: int = 1000, running_share: float = 0.8) -> None:
+        for i in range(count):
+            vmid = first_vmid + i
+            container = FakeContainer(
+                node=self.nodes[i % len(self.nodes)],
+                vmid=vmid,
+                name=f'ct-{vmid}',
+                cores=random.choice((1, 2, 4)),
+                maxmem=random.choice((1, 2, 4)) * GiB,
+                maxdisk=random.choice((5, 10, 20)) * GiB
+            )
+            if random.random() < running_share:
+                container.status = 'running'
+                container.started_at = time.time() - random.uniform(60, 86_400)
+            self.containers[vmid] = container
+
+    # --- инфраструктура -------------------------------------------------
+
+    def build_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._chaos_middleware])
+        prefix = '/api2/json'
+        app.router.add_get(f'{prefix}/nodes', self.list_nodes)
+        app.router.add_get(f'{prefix}/nodes/{{node}}/status', self.node_status)
+        app.router.add_get(f'{prefix}/nodes/{{node}}/storage/{{storage}}/status', self.storage_status)
+        app.router.add_get(f'{prefix}/nodes/{{node}}/lxc', self.list_containers)
+        app.router.add_get(f'{prefix}/nodes/{{node}}/lxc/', self.list_containers)
+        app.router.add_post(f'{prefix}/nodes/{{node}}/lxc', self.create_container)
+        app.router.add_delete(f'{prefix}/nodes/{{node}}/lxc/{{vmid}}', self.delete_container)
+        app.router.add_get(f'{prefix}/nodes/{{node}}/lxc/{{vmid}}/config', self.get_config)
+        app.router.add_put(f'{prefix}/nodes/{{node}}/lxc/{{vmid}}/config', self.update_config)
+        app.router.add_get(f'{prefix}/nodes/{{node}}/lxc/{{vmid}}/status/current', self.status_current)
+        app.router.add_post(f'{prefix}/nodes/{{node}}/lxc/{{vmid}}/status/{{action}}', self.status_action)
+        app.router.add_get(f'{prefix}/nodes/{{node}}/lxc/{{vmid}}/rrddata', self.rrddata)
+        app.router.add_get(f'{prefix}/nodes/{{node}}/tasks/{{upid}}/status', self.task_status)
+        app.router.add_post(f'{prefix}/nodes/{{node}}/network', self.noop)
+        app.router.add_post(f'{prefix}/nodes/{{node}}/firewall/rules', self.noop)
+        app.router.add_get(f'{prefix}/cluster/resources', self.cluster_resources)
+        app.on_cleanup.append(self._cancel_background)
+        return app
+
+    @web.middleware
+    async def _chaos_middleware(self, request: web.Request, handler: Handler) -> web.StreamResponse:
+        self.requests += 1
+        if not request.headers.get('Authorization', '').startswith('PVEAPIToken='):
+            return _error(401, 'authentication failure')
+        if self.latency:
+            await asyncio.sleep(random.expovariate(1 / self.latency))
+        if self.failure_rate and random.random() < self.failure_rate:
+            return _error(random.choice((502, 503, 595)), 'simulated failure')
+        try:
+            return await handler(request)
+        except FakeProxmoxError as e:
+            return _error(e.status, str(e))
+
+    async def _cancel_background(self, _: web.Application) -> None:
+        for task in self._background:
+            task.cancel()
+        await asyncio.gather(*self._background, return_exceptions=True)
+
+    def _container(self, request: web.Request) -> FakeContainer:
+        node = request.match_info['node']
+        vmid = int(request.match_info['vmid'])
+        container = self.containers.get(vmid)
+        if container is None or container.node != node:
+            raise FakeProxmoxError(500, f"Configuration file 'nodes/{node}/lxc/{vmid}.conf' does not exist")
+        return container
+
+    def _start_task(
+        self,
+        node: str,
+        task_type: str,
+        vmid: int,
+        apply: Callable[[], str | None]
+    ) -> str:
+        """Запускает задачу; apply вызывается по ее завершении и возвращает текст ошибки или None"""
+        self._pid += 1
+        starttime = int(time.time())
+        upid = f'UPID:{node}:{self._pid:08X}:{self._pid * 7:08X}:{starttime:08X}:{task_type}:{vmid}:root@pam:'
+        task = FakeTask(node=node, upid=upid, type=task_type, starttime=starttime)
+        self.tasks[upid] = task
+
+        async def run() -> None:
+            await asyncio.sleep(random.uniform(0.5, 1.5) * self.task_duration)
+            error = apply()
+            task.status = 'stopped'
+            task.exitstatus = error or 'OK'
+
+        background = asyncio.create_task(run())
+        self._background.add(background)
+        background.add_done_callback(self._background.discard)
+        return upid
+
+    # --- ноды -----------------------------------------------------------
+
+    async def list_nodes(self, request: web.Request) -> web.Response:
+        return _data([
+            {'node': node, 'status': 'online', 'type': 'node', 'maxcpu': self.node_cpus, 'maxmem': self.node_mem}
+            for node in self.nodes
+        ])
+
+    async def node_status(self, request: web.Request) -> web.Response:
+        node = request.match_info['node']
+        guests = [c for c in self.containers.values() if c.node == node and c.status == 'running']
+        used_mem = sum(c.sample()['mem'] for c in guests)
+        cpu = min(sum(c.load * c.cores for c in guests) / self.node_cpus, 1.0)
+        return _data({
+            'cpu': cpu,
+            'cpuinfo': {'cpus': self.node_cpus, 'cores': self.node_cpus // 2, 'sockets': 2},
+            'memory': {'total': self.node_mem, 'used': used_mem, 'free': self.node_mem - used_mem},
+            'uptime': 1_000_000,
+        })
+
+    async def storage_status(self, request: web.Request) -> web.Response:
+        node = request.match_info['node']
+        used = sum(c.maxdisk for c in self.containers.values() if c.node == node)
+        return _data({'total': self.node_storage, 'used': used, 'avail': self.node_storage - used})
+
+    # --- контейнеры -----------------------------------------------------
+
+    async def list_containers(self, request: web.Request) -> web.Response:
+        node = request.match_info['node']
+        return _data([
+            {'vmid': c.vmid, 'name': c.name, 'status': c.status, **c.sample()}
+            for c in self.containers.values() if c.node == node
+        ])
+
+    async def create_container(self, request: web.Request) -> web.Response:
+        node = request.match_info['node']
+        config = await request.json()
+        vmid = int(config['vmid'])
+        if vmid in self.containers:
+            return _error(500, f'CT {vmid} already exists')
+
+        rootfs_gb = int(str(config.get('rootfs', '8')).rsplit(':', 1)[-1])
+        container = FakeContainer(
+            node=node,
+            vmid=vmid,
+            name=config.get('hostname', f'CT{vmid}'),
+            cores=int(config.get('cores', 1)),
+            maxmem=int(config.get('memory', 512)) * 1024 ** 2,
+            maxdisk=rootfs_gb * GiB,
+            net0=config.get('net0', FakeContainer.net0),
+            lock='create'
+        )
+        self.containers[vmid] = container
+
+        def apply() -> None:
+            container.lock = None
+            if config.get('start'):
+                container.status = 'running'
+                container.started_at = time.time()
+
+        return _data(self._start_task(node, 'vzcreate', vmid, apply))
+
+    async def delete_container(self, request: web.Request) -> web.Response:
+        container = self._container(request)
+        if container.status == 'running':
+            return _error(500, f'CT {container.vmid} is running - destroy failed')
+
+        def apply() -> None:
+            self.containers.pop(container.vmid, None)
+
+        return _data(self._start_task(container.node, 'vzdestroy', container.vmid, apply))
+
+    async def get_config(self, request: web.Request) -> web.Response:
+        container = self._container(request)
+        return _data({
+            'hostname': container.name,
+            'cores': container.cores,
+            'memory': container.maxmem // 1024 ** 2,
+            'rootfs': f'local-lvm:vm-{container.vmid}-disk-0,size={container.maxdisk // GiB}G',
+            'net0': container.net0,
+            'onboot': 1,
+            'unprivileged': 1,
+        })
+
+    async def update_config(self, request: web.Request) -> web.Response:
+        container = self._container(request)
+        config = await request.json()
+        if 'net0' in config:
+            container.net0 = config['net0']
+        return _data(None)
+
+    async def status_current(self, request: web.Request) -> web.Response:
+        container = self._container(request)
+        return _data({
+            'vmid': container.vmid,
+            'name': container.name,
+            'status': container.status,
+            'type': 'lxc',
+            'ha': {'managed': 0},
+            'pid': 10_000 + container.vmid if container.status == 'running' else None,
+            **{key: value for key, value in container.sample().items() if key != 'maxcpu'},
+        })
+
+    async def status_action(self, request: web.Request) -> web.Response:
+        container = self._container(request)
+        action = request.match_info['action']
+        targets = {
+            'start': 'running',
+            'stop': 'stopped',
+            'shutdown': 'stopped',
+            'reboot': 'running',
+            'suspend': 'stopped',
+            'resume': 'running',
+        }
+        if action not in targets:
+            return _error(501, f"Method 'POST /nodes/{container.node}/lxc/{container.vmid}/status/{action}' not implemented")
+        if container.lock:
+            return _error(500, f"CT is locked ({container.lock})")
+
+        def apply() -> str | None:
+            if action == 'start' and container.status == 'running':
+                return f'CT {container.vmid} already running'
+            if action == 'reboot' and container.status != 'running':
+                return f'CT {container.vmid} not running'
+            container.status = targets[action]
+            container.started_at = time.time() if container.status == 'running' else None
+            return None
+
+        return _data(self._start_task(container.node, f'vz{action}', container.vmid, apply))
+
+    async def rrddata(self, request: web.Request) -> web.Response:
+        container = self._container(request)
+        steps = {'hour': 60, 'day': 1_440, 'week': 10_080, 'month': 43_200, 'year': 525_600}
+        step = steps.get(request.query.get('timeframe', 'hour'), 60)
+        now = int(time.time()) // step * step
+        points = []
+        for i in range(70):
+            sample = container.sample()
+            point: dict[str, Any] = {'time': now - (69 - i) * step}
+            if container.status == 'running':
+                point.update({
+                    key: sample[key]
+                    for key in ('cpu', 'maxcpu', 'mem', 'maxmem', 'disk', 'maxdisk')
+                })
+                point.update({
+                    key: sample[key] / max(sample['uptime'], 1)
+                    for key in ('netin', 'netout', 'diskread', 'diskwrite')
+                })
+            points.append(point)
+        return _data(points)
+
+    async def task_status(self, request: web.Request) -> web.Response:
+        task = self.tasks.get(request.match_info['upid'])
+        if task is None:
+            return _error(500, 'no such task')
+        data: dict[str, Any] = {
+            'upid': task.upid,
+            'node': task.node,
+            'type': task.type,
+            'starttime': task.starttime,
+            'status': task.status,
+        }
+        if task.exitstatus is not None:
+            data['exitstatus'] = task.exitstatus
+        return _data(data)
+
+    async def cluster_resources(self, request: web.Request) -> web.Response:
+        if request.query.get('type', 'vm') != 'vm':
+            return _data([])
+        return _data([
+            {
+                'id': f'lxc/{c.vmid}',
+                'type': 'lxc',
+                'vmid': c.vmid,
+                'node': c.node,
+                'name': c.name,
+                'status': c.status,
+                'template': int(c.template),
+                **{key: value for key, value in c.sample().items() if key not in ('cpus', 'swap', 'maxswap')},
+            }
+            for c in self.containers.values()
+        ])
+
+    async def noop(self, request: web.Request) -> web.Response:
+        return _data(None)
+
+
+def _data(data: Any) -> web.Response:
+    return web.json_response({'data': data})
+
+
+def _error(status: int, message: str) -> web.Response:
+    return web.json_response({'data': None, 'message': f'{message}\n'}, status=status)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Fake Proxmox API server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8006)
+    parser.add_argument('--nodes', default='nvcloud', help='список нод через запятую')
+    parser.add_argument('--containers', type=int, default=100, help='сколько контейнеров создать при старте')
+    parser.add_argument('--latency', type=float, default=0.0, help='средняя задержка ответа, сек')
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='доля ответов 5xx')
+    parser.add_argument('--task-duration', type=float, default=0.5, help='средняя длительность задачи, сек')
+    args = parser.parse_args()
+
+    fake = FakeProxmox(
+        nodes=args.nodes.split(','),
+        latency=args.latency,
+        failure_rate=args.failure_rate,
+        task_duration=args.task_duration
+    )
+    fake.populate(args.containers)
+    web.run_app(fake.build_app(), host=args.host, port=args.port)
+
+
+if __name__ == '__main__':
+    main()
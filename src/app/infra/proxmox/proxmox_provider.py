@@ -1,16 +1,80 @@
-from typing import Any, Optional
+import asyncio
+import json
+from logging import getLogger
+from time import monotonic
+from typing import Any, Callable, Optional
 
 import aiohttp
+import msgspec
 
 from app.config.proxmox import ProxmoxSettings
-from app.core.dto.container import CreatedContainer, CurrentContainerInfo, HAInfo
+from app.core.dto.container import (
+    ClusterResource,
+    CreatedContainer,
+    CurrentContainerInfo,
+)
+from app.core.counters import CounterRates
+from app.core.dto.node import NodeCapacity
+from app.core.dto.task import TaskStatus
+from app.core.exceptions import ProxmoxRejected
 from app.core.security.password import generate_password
 
+from .cache import CacheKey, TTLCache
+from .resilience import (
+    CircuitBreaker,
+    EndpointPolicy,
+    ProxmoxUnavailable,
+    backoff_delay,
+    endpoint_class,
+    is_retryable,
+    is_transient,
+    node_of,
+)
+from .tasks import TaskTracker
+
+logger = getLogger(__name__)
+
+RATE_METRICS = ('netin', 'netout', 'diskread', 'diskwrite')
+
+# Снимок кластера со статусами контейнеров: сбрасывается вместе с записями контейнера
+CLUSTER_RESOURCES_KEY: CacheKey = (None, None, 'cluster/resources')
+
+
+class _ContainerStatus(msgspec.Struct):
+    data: CurrentContainerInfo
+
+
+class _ClusterResources(msgspec.Struct):
+    data: list[ClusterResource]
+
+
+# Разбор сразу в slots-датаклассы: лишние поля ответа пропускаются без создания
+# dict; strict=False прощает числа строками, как в ответах некоторых версий PVE
+_decode_container_status = msgspec.json.Decoder(_ContainerStatus, strict=False).decode
+_decode_cluster_resources = msgspec.json.Decoder(_ClusterResources, strict=False).decode
+
 
 class ProxmoxProvider:
     def __init__(self, settings: ProxmoxSettings):
         self.settings = settings
         self._session: Optional[aiohttp.ClientSession] = None
+        self._cache = TTLCache(settings.CACHE_TTL, settings.CACHE_MAX_SIZE)
+        self._tasks = TaskTracker(
+            self.get_task_status,
+            settings.TASK_POLL_MIN_INTERVAL,
+            settings.TASK_POLL_MAX_INTERVAL,
+            settings.TASK_POLL_BACKOFF,
+            settings.TASK_POLL_MAX_FAILURES
+        )
+        self._policies = {
+            'read': EndpointPolicy(settings.DEADLINE_READ, settings.RETRY_ATTEMPTS),
+            'task': EndpointPolicy(settings.DEADLINE_TASK, 1),
+            'create': EndpointPolicy(settings.DEADLINE_CREATE, settings.RETRY_ATTEMPTS),
+            'action': EndpointPolicy(settings.DEADLINE_ACTION, settings.RETRY_ATTEMPTS),
+        }
+        self._breakers: dict[str | None, CircuitBreaker] = {}
+        # Скорости по счетчикам из всех чтений status/current и cluster/resources
+        self._rates = CounterRates(settings.RATE_PROBE_INTERVAL, settings.RATE_MAX_AGE)
 
     async def _ensure_session(self) -> None:
         if self._session is None or self._session.closed:
@@ -19,30 +83,93 @@ class ProxmoxProvider:
                 headers={
                     "Authorization": f"PVEAPIToken={self.settings.API_TOKEN_ID}={self.settings.API_TOKEN_SECRET}"
                 },
-                connector=aiohttp.TCPConnector(ssl=self.settings.VERIFY_SSL),
+                connector=aiohttp.TCPConnector(
+                    ssl=self.settings.VERIFY_SSL,
+                    limit=self.settings.POOL_LIMIT,
+                    limit_per_host=self.settings.POOL_LIMIT_PER_HOST,
+                    keepalive_timeout=self.settings.KEEPALIVE_TIMEOUT,
+                    ttl_dns_cache=self.settings.DNS_CACHE_TTL,
+                    use_dns_cache=True
+                ),
                 timeout=aiohttp.ClientTimeout(total=self.settings.TIMEOUT)
             )
 
+    async def start(self) -> None:
+        """Открывает общий пул соединений (вызывается один раз в lifespan)"""
+        await self._ensure_session()
+
     async def close(self) -> None:
+        await self._tasks.close()
         if self._session and not self._session.closed:
             await self._session.close()
+        self._session = None
+        self._cache.clear()
 
     async def _request(
         self,
         method: str,
         endpoint: str,
         params: Optional[dict[str, Any]] = None,
-        json: Optional[dict[str, Any]] = None
+        json: Optional[dict[str, Any]] = None,
+        parse: Optional[Callable[[bytes], Any]] = None
     ) -> dict[str, Any]:
+        """
+        Запрос с дедлайном по классу эндпоинта, повторами с джиттером
+        и circuit breaker на ноду. Тело разбирается msgspec; parse - свой разбор,
+        например сразу в типизированные структуры.
+        """
         await self._ensure_session()
-        async with self._session.request( # type: ignore
-            method=method,
-            url=endpoint,
-            params=params,
-            json=json
-        ) as response:
-            response.raise_for_status()
-            return await response.json() # type: ignore
+
+        policy = self._policies[endpoint_class(method, endpoint)]
+        node = node_of(endpoint)
+        breaker = self._breakers.get(node)
+        if breaker is None:
+            breaker = self._breakers[node] = CircuitBreaker(
+                self.settings.BREAKER_FAILURE_THRESHOLD,
+                self.settings.BREAKER_RESET_TIMEOUT
+            )
+
+        deadline = monotonic() + policy.deadline
+        attempt = 0
+        # Пока все попытки падали на соединении, запрос до Proxmox не дошел
+        sent = False
+        while True:
+            if not breaker.allow():
+                raise ProxmoxUnavailable(node, 'circuit is open', sent)
+
+            try:
+                async with self._session.request( # type: ignore
+                    method=method,
+                    url=endpoint,
+                    params=params,
+                    json=json,
+                    timeout=aiohttp.ClientTimeout(total=max(deadline - monotonic(), 0.001))
+                ) as response:
+                    response.raise_for_status()
+                    result = (parse or msgspec.json.decode)(await response.read())
+            except msgspec.DecodeError as e:
+                # Нода ответила, но не тем, что ожидалось: повтор не поможет
+                breaker.record_success()
+                raise ProxmoxUnavailable(node, f'unexpected response to {method} {endpoint}: {e}') from e
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if not is_transient(e):
+                    breaker.record_success()
+                    raise
+                breaker.record_failure()
+                sent = sent or not isinstance(e, aiohttp.ClientConnectorError)
+
+                reason = str(e) or type(e).__name__
+                attempt += 1
+                delay = backoff_delay(attempt, self.settings.RETRY_BASE_DELAY, self.settings.RETRY_MAX_DELAY)
+                if attempt >= policy.attempts or not is_retryable(method, e) or monotonic() + delay >= deadline:
+                    raise ProxmoxUnavailable(node, reason, sent) from e
+
+                logger.warning(f'{method} {endpoint} failed ({reason}), retry {attempt} in {delay:.2f}s')
+                await asyncio.sleep(delay)
+                continue
+
+            breaker.record_success()
+            return result
 
     async def create_network_bridge(self, node: str, bridge_name: str = "vmbr0") -> dict[str, Any]:
         """Создает bridge-интерфейс если не существует"""
@@ -60,6 +187,7 @@ class ProxmoxProvider:
         self,
         node: str,
         host_name: str,
+        vmid: int,
         storage: str = "local-lvm",
         ostemplate: str = "local:vztmpl/vzdump-lxc-100-2025_05_13-17_31_15.tar.zst",
         ram_bytes: int = 1_024 ** 3,  # 1GB в байтах
@@ -72,6 +200,7 @@ class ProxmoxProvider:
         """
         Создает контейнер с автоматической настройкой сети и генерацией пароля
 
+        :param vmid: id, выделенный из пула VMID
         :param network_config: {
             "bridge": "vmbr0",
             "ip": "192.168.100.100/24",
@@ -81,21 +210,14 @@ class ProxmoxProvider:
         :param ram_bytes: ОЗУ в байтах (будет переведено в МБ для API)
         :param rom_bytes: Диск в байтах (будет переведено в ГБ для API)
         """
-        vmids = await self.get_container_vmids('nvcloud')
-
-        vmid = 100
-        while vmid in vmids:
-            vmid += 1
-
-        if vmid > 199:
-            raise Exception(f'Max vmid: {vmid}')
-
         if network_config is None:
-            network_config = {"bridge": "vmbr0", 'gw': '192.168.1.1'}
-
+            network_config = {"bridge": "vmbr0", "dhcp": True}
 
         net0 = f"name=eth0,bridge={network_config['bridge']}"
-        net0 += f",ip=192.168.1.{vmid}/24,gw={network_config['gw']}"
+        if network_config.get('dhcp'):
+            net0 += ",ip=dhcp"
+        else:
+            net0 += f",ip={network_config['ip']},gw={network_config['gw']}"
 
         random_password = generate_password(12, use_special_chars=False)
 
@@ -119,7 +241,7 @@ class ProxmoxProvider:
         }
 
         try:
-            await self._request(
+            response = await self._request(
                 "POST",
                 f"/api2/json/nodes/{node}/lxc",
                 json=config
@@ -133,12 +255,23 @@ class ProxmoxProvider:
                 password=random_password,
                 cpu_cores=cpu_cores,
                 rom_bytes=rom_bytes,
-                ram_bytes=ram_bytes
+                ram_bytes=ram_bytes,
+                upid=response.get('data')
             )
 
+        except ProxmoxUnavailable:
+            raise
+        except aiohttp.ClientResponseError as e:
+            raise ProxmoxRejected(node, e.status, e.message) from e
         except Exception as e:
             raise Exception(f'Error creating container: {e} {e.args}') from e
 
+    async def get_container_config(self, node: str, vmid: int) -> dict[str, Any]:
+        return await self._request(
+            "GET",
+            f"/api2/json/nodes/{node}/lxc/{vmid}/config"
+        )
+
     async def configure_container_network(
         self,
         node: str,
@@ -192,49 +325,110 @@ class ProxmoxProvider:
             )
 
     async def get_container_info(self, node: str, vmid: int) -> CurrentContainerInfo:
-        raw: dict[str, Any] = await self._request( # type: ignore
-            "GET",
-            f"/api2/json/nodes/{node}/lxc/{vmid}/status/current"
+        return await self._cache.get_or_load(  # type: ignore
+            (node, vmid, 'status/current'),
+            lambda: self._fetch_container_info(node, vmid)
         )
 
-        container_info = CurrentContainerInfo(
-            **{
-                **raw['data'],
-                'ha': HAInfo(**raw['data']['ha'])
-            }
+    async def _fetch_container_info(self, node: str, vmid: int) -> CurrentContainerInfo:
+        raw: _ContainerStatus = await self._request( # type: ignore
+            "GET",
+            f"/api2/json/nodes/{node}/lxc/{vmid}/status/current",
+            parse=_decode_container_status
+        )
+        container_info = raw.data
+        self._rates.update(
+            vmid,
+            monotonic(),
+            tuple(int(getattr(container_info, metric)) for metric in RATE_METRICS),
+            container_info.uptime
         )
 
         return container_info
 
     async def get_container_telemetry(self, node: str, vmid: int, timeframe: str = 'hour') -> dict[str, Any]:
-        return await self._request(
+        return await self._cache.get_or_load(  # type: ignore
+            (node, vmid, f'rrddata/{timeframe}'),
+            lambda: self._request(
+                "GET",
+                f"/api2/json/nodes/{node}/lxc/{vmid}/rrddata?timeframe={timeframe}&cf=AVERAGE"
+            )
+        )
+
+    async def get_container_rates(self, node: str, vmid: int) -> dict[str, float] | None:
+        """
+        Текущие скорости netin/netout/diskread/diskwrite, байт/с.
+
+        В режиме counters скорости считаются локально по счетчикам из чтений
+        cluster/resources сборщика и status/current (кэшированного, общего с
+        get_container_info), без отдельных запросов и ожиданий; None - контейнер
+        только появился и второго чтения еще не было. В режиме rrd - из
+        последней точки rrddata, разобранной без построения всего массива.
+        """
+        if (rates := self.get_cached_rates(vmid)) is not None:
+            return rates
+        if self.settings.TELEMETRY_MODE == 'rrd':
+            return await self._cache.get_or_load(  # type: ignore
+                (node, vmid, 'rates'),
+                lambda: self._fetch_rrd_rates(node, vmid)
+            )
+        # Чтение status/current обновит базу счетчиков - скорость появится со следующим
+        await self.get_container_info(node, vmid)
+        return self.get_cached_rates(vmid)
+
+    def get_cached_rates(self, vmid: int) -> dict[str, float] | None:
+        """Скорости из уже сделанных чтений, без запросов к Proxmox"""
+        rates = self._rates.get(vmid, monotonic())
+        return dict(zip(RATE_METRICS, rates, strict=True)) if rates is not None else None
+
+    async def _fetch_rrd_rates(self, node: str, vmid: int) -> dict[str, float]:
+        point = await self._request(
             "GET",
-            f"/api2/json/nodes/{node}/lxc/{vmid}/rrddata?timeframe={timeframe}&cf=AVERAGE"
+            f"/api2/json/nodes/{node}/lxc/{vmid}/rrddata?timeframe=hour&cf=AVERAGE",
+            parse=_rrd_tail
         )
+        return {metric: float(point.get(metric, 0)) for metric in RATE_METRICS}
 
-    async def delete_container(self, node: str, vmid: int) -> dict[str, Any]:
+    async def _container_status_action(self, method: str, node: str, vmid: int, endpoint: str) -> dict[str, Any]:
+        try:
+            response = await self._request(method, f"/api2/json/nodes/{node}/lxc/{vmid}{endpoint}")
+        finally:
+            self._cache.invalidate(node, vmid, CLUSTER_RESOURCES_KEY)
+
+        if upid := response.get('data'):
+            # Статус меняется по завершении задачи - сбрасываем кэш еще раз
+            self._tasks.track(node, upid).add_done_callback(
+                lambda _: self._cache.invalidate(node, vmid, CLUSTER_RESOURCES_KEY)
+            )
+        return response
+
+    async def get_task_status(self, node: str, upid: str) -> dict[str, Any]:
         return await self._request(
-            "DELETE",
-            f"/api2/json/nodes/{node}/lxc/{vmid}"
+            "GET",
+            f"/api2/json/nodes/{node}/tasks/{upid}/status"
         )
 
+    def track_task(self, node: str, upid: str) -> asyncio.Future[TaskStatus]:
+        """Future, которая завершится вместе с задачей Proxmox"""
+        return self._tasks.track(node, upid)
+
+    async def wait_task(self, node: str, upid: str | None, timeout: float | None = None) -> TaskStatus | None:
+        """Ждет завершения задачи, ProxmoxTaskError если задача упала"""
+        if not upid:
+            return None
+        return await self._tasks.wait(node, upid, timeout or self.settings.TASK_TIMEOUT)
+
+    async def delete_container(self, node: str, vmid: int) -> dict[str, Any]:
+        return await self._container_status_action("DELETE", node, vmid, "")
+
     async def restart_container(self, node: str, vmid: int) -> dict[str, Any]:
-        return await self._request(
-            "POST",
-            f"/api2/json/nodes/{node}/lxc/{vmid}/status/reboot"
-        )
+        return await self._container_status_action("POST", node, vmid, "/status/reboot")
 
     async def start_container(self, node: str, vmid: int) -> dict[str, Any]:
-        return await self._request(
-            "POST",
-            f"/api2/json/nodes/{node}/lxc/{vmid}/status/start"
-        )
+        return await self._container_status_action("POST", node, vmid, "/status/start")
 
     async def stop_container(self, node: str, vmid: int) -> dict[str, Any]:
-        return await self._request(
-            "POST",
-            f"/api2/json/nodes/{node}/lxc/{vmid}/status/stop"
-        )
+        return await self._container_status_action("POST", node, vmid, "/status/stop")
 
     async def get_info_all_containers(self, node: str) -> dict[str, Any]:
         return await self._request(
@@ -242,17 +436,74 @@ class ProxmoxProvider:
             f"/api2/json/nodes/{node}/lxc"
         )
 
+    async def get_cluster_resources(self) -> dict[int, ClusterResource]:
+        """Статус и метрики всех гостей кластера одним запросом, по vmid"""
+        return await self._cache.get_or_load(  # type: ignore
+            CLUSTER_RESOURCES_KEY,
+            self._fetch_cluster_resources
+        )
+
+    async def _fetch_cluster_resources(self) -> dict[int, ClusterResource]:
+        raw: _ClusterResources = await self._request( # type: ignore
+            "GET",
+            "/api2/json/cluster/resources",
+            params={'type': 'vm'},
+            parse=_decode_cluster_resources
+        )
+
+        resources = {resource.vmid: resource for resource in raw.data}
+        # Снимок - все гости кластера: чего в нем нет, то удалено
+        self._rates.retain(resources)
+        timestamp = monotonic()
+        for vmid, resource in resources.items():
+            self._rates.update(
+                vmid,
+                timestamp,
+                (resource.netin, resource.netout, resource.diskread, resource.diskwrite),
+                resource.uptime
+            )
+        return resources
+
     async def get_info_node(self, node: str) -> dict[str, Any]:
         return await self._request(
             "GET",
             f"/api2/json/nodes/{node}/status"
         )
 
-    async def container_action(self, node: str, vmid: int, action: str) -> dict[str, Any]:
-        return await self._request(
-            "POST",
-            f"/api2/json/nodes/{node}/lxc/{vmid}/status/{action}"
+    async def get_nodes(self) -> list[str]:
+        """Ноды кластера в статусе online"""
+        raw = await self._cache.get_or_load(
+            (None, None, 'nodes'),
+            lambda: self._request("GET", "/api2/json/nodes")
+        )
+        return [item['node'] for item in raw['data'] if item.get('status') == 'online']
+
+    async def get_node_capacity(self, node: str, storage: str) -> NodeCapacity:
+        return await self._cache.get_or_load(  # type: ignore
+            (node, None, f'capacity/{storage}'),
+            lambda: self._fetch_node_capacity(node, storage)
+        )
+
+    async def _fetch_node_capacity(self, node: str, storage: str) -> NodeCapacity:
+        node_status, storage_status = await asyncio.gather(
+            self.get_info_node(node),
+            self._request("GET", f"/api2/json/nodes/{node}/storage/{storage}/status")
         )
+        node_data = node_status['data']
+        storage_data = storage_status['data']
+
+        return NodeCapacity(
+            node=node,
+            cpu=float(node_data.get('cpu', 0)),
+            cpus=int(node_data.get('cpuinfo', {}).get('cpus', 0)),
+            mem_total=int(node_data['memory']['total']),
+            mem_free=int(node_data['memory']['free']),
+            storage_total=int(storage_data.get('total', 0)),
+            storage_free=int(storage_data.get('avail', 0))
+        )
+
+    async def container_action(self, node: str, vmid: int, action: str) -> dict[str, Any]:
+        return await self._container_status_action("POST", node, vmid, f"/status/{action}")
 
     async def get_container_vmids(self, node: str) -> list[int]:
         data: dict[str, Any] = await self._request(
@@ -262,3 +513,20 @@ class ProxmoxProvider:
         vmids = [vm.get('vmid') for vm in data['data']]
 
         return vmids
+
+
+def _rrd_tail(body: bytes) -> dict[str, Any]:
+    """
+    Последняя точка rrddata с метриками. Точки - плоские объекты, поэтому
+    хвост ищется по '{' с конца, и в dict превращаются только последние точки.
+    """
+    text = body.decode()
+    decoder = json.JSONDecoder()
+    lower = text.find('[')
+    end = len(text)
+    while (start := text.rfind('{', lower, end)) > lower >= 0:
+        point, _ = decoder.raw_decode(text, start)
+        if 'cpu' in point:
+            return point
+        end = start
+    return {}
@@ -0,0 +1,92 @@
+import asyncio
+import random
+import re
+from dataclasses import dataclass
+from time import monotonic
+
+import aiohttp
+
+from app.core.exceptions import ProxmoxUnavailable as ProxmoxUnavailable
+
+# 595/596 - pveproxy не смог связаться с нодой
+TRANSIENT_STATUSES = frozenset({502, 503, 504, 595, 596})
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+
+_NODE_RE = re.compile(r'/nodes/([^/]+)')
+
+
+@dataclass(frozen=True)
+class EndpointPolicy:
+    deadline: float
+    attempts: int
+
+
+def endpoint_class(method: str, endpoint: str) -> str:
+    """read | task | create | action"""
+    if method == 'GET':
+        return 'task' if '/tasks/' in endpoint else 'read'
+    if method == 'POST' and re.search(r'/nodes/[^/]+/lxc/?$', endpoint):
+        return 'create'
+    return 'action'
+
+
+def node_of(endpoint: str) -> str | None:
+    match = _NODE_RE.search(endpoint)
+    return match.group(1) if match else None
+
+
+def is_transient(error: BaseException) -> bool:
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status in TRANSIENT_STATUSES
+    return isinstance(error, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+
+
+def is_retryable(method: str, error: BaseException) -> bool:
+    """
+    Идемпотентные запросы повторяются при любой временной ошибке,
+    остальные - только если соединение не было установлено
+    """
+    if isinstance(error, aiohttp.ClientConnectorError):
+        return True
+    return method in IDEMPOTENT_METHODS and is_transient(error)
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """Экспоненциальная задержка с полным джиттером"""
+    return random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """
+    Размыкается после failure_threshold временных ошибок подряд и отклоняет
+    запросы reset_timeout секунд. Затем пропускает пробный запрос:
+    успех замыкает цепь, ошибка снова размыкает.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None and monotonic() - self._opened_at < self._reset_timeout
+
+    def allow(self) -> bool:
+        if self._opened_at is None:
+            return True
+        if self.is_open:
+            return False
+        # half-open: следующий пробный запрос возможен не раньше чем через reset_timeout
+        self._opened_at = monotonic()
+        return True
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._opened_at is not None or self._failures >= self._failure_threshold:
+            self._opened_at = monotonic()
@@ -0,0 +1,135 @@
+import asyncio
+from logging import getLogger
+from typing import Any, Awaitable, Callable
+
+from app.core.dto.task import TaskStatus
+from app.core.exceptions import ProxmoxTaskError as ProxmoxTaskError
+from app.core.exceptions import ProxmoxUnavailable
+
+logger = getLogger(__name__)
+
+
+class TaskTracker:
+    """
+    Отслеживает задачи Proxmox (UPID) до завершения.
+
+    На каждую ноду работает один цикл опроса /nodes/{node}/tasks/{upid}/status
+    для всех ожидаемых задач. Интервал растет от min_interval до max_interval,
+    пока ничего не меняется, и сбрасывается при новой задаче.
+
+    Задача перестает опрашиваться, когда wait() не дождался ее за timeout
+    или статус не удалось получить max_failures раз подряд (неизвестный UPID,
+    недоступная нода): ее future завершается ошибкой.
+    """
+
+    def __init__(
+        self,
+        fetch_status: Callable[[str, str], Awaitable[dict[str, Any]]],
+        min_interval: float,
+        max_interval: float,
+        backoff: float,
+        max_failures: int
+    ):
+        self._fetch_status = fetch_status
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._backoff = backoff
+        self._max_failures = max_failures
+        self._waiters: dict[str, dict[str, asyncio.Future[TaskStatus]]] = {}
+        self._wakeups: dict[str, asyncio.Event] = {}
+        self._loops: dict[str, asyncio.Task[None]] = {}
+
+    def track(self, node: str, upid: str) -> asyncio.Future[TaskStatus]:
+        waiters = self._waiters.setdefault(node, {})
+        future = waiters.get(upid)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            # Ошибку уже получил wait() или записал лог - не ругаемся на неполученное исключение
+            future.add_done_callback(lambda done: done.cancelled() or done.exception())
+            waiters[upid] = future
+
+        self._wakeups.setdefault(node, asyncio.Event()).set()
+        poll_loop = self._loops.get(node)
+        if poll_loop is None or poll_loop.done():
+            self._loops[node] = asyncio.create_task(self._poll_node(node))
+
+        return future
+
+    async def wait(self, node: str, upid: str, timeout: float | None = None) -> TaskStatus:
+        try:
+            task = await asyncio.wait_for(asyncio.shield(self.track(node, upid)), timeout)
+        except asyncio.TimeoutError:
+            self._drop(node, upid, asyncio.TimeoutError(f'Proxmox task {upid} did not finish in {timeout}s'))
+            raise
+        if not task.ok:
+            raise ProxmoxTaskError(task)
+        return task
+
+    async def _poll_node(self, node: str) -> None:
+        waiters = self._waiters[node]
+        wakeup = self._wakeups[node]
+        interval = self._min_interval
+        failures: dict[str, int] = {}
+
+        while waiters:
+            wakeup.clear()
+            upids = list(waiters)
+            results = await asyncio.gather(
+                *[self._fetch_status(node, upid) for upid in upids],
+                return_exceptions=True
+            )
+
+            for upid, result in zip(upids, results, strict=True):
+                if isinstance(result, BaseException):
+                    failures[upid] = failures.get(upid, 0) + 1
+                    logger.warning(f'Failed to poll task {upid} ({failures[upid]}/{self._max_failures}): {result}')
+                    if failures[upid] >= self._max_failures:
+                        error = ProxmoxUnavailable(node, f'cannot poll task {upid}: {result}')
+                        error.__cause__ = result
+                        self._drop(node, upid, error)
+                    continue
+
+                failures.pop(upid, None)
+                data = result['data']
+                if data.get('status') != 'stopped':
+                    continue
+
+                future = waiters.pop(upid, None)
+                if future is not None and not future.done():
+                    future.set_result(TaskStatus(
+                        node=node,
+                        upid=upid,
+                        status=data['status'],
+                        exitstatus=data.get('exitstatus')
+                    ))
+
+            for upid in list(failures):
+                if upid not in waiters:
+                    del failures[upid]
+
+            if not waiters:
+                break
+
+            try:
+                await asyncio.wait_for(wakeup.wait(), interval)
+                interval = self._min_interval
+            except asyncio.TimeoutError:
+                interval = min(interval * self._backoff, self._max_interval)
+
+    def _drop(self, node: str, upid: str, error: Exception) -> None:
+        """Перестает опрашивать задачу и завершает ее future ошибкой"""
+        future = self._waiters.get(node, {}).pop(upid, None)
+        if future is not None and not future.done():
+            logger.warning(f'Stopped tracking task {upid}: {error}')
+            future.set_exception(error)
+
+    async def close(self) -> None:
+        for poll_loop in self._loops.values():
+            poll_loop.cancel()
+        await asyncio.gather(*self._loops.values(), return_exceptions=True)
+        for waiters in self._waiters.values():
+            for future in waiters.values():
+                future.cancel()
+        self._loops.clear()
+        self._waiters.clear()
+        self._wakeups.clear()
@@ -0,0 +1,142 @@
+from logging import getLogger
+
+from redis.asyncio import Redis
+
+from app.config import create_settings
+from app.domain.providers.container import ContainerAPIProvider
+from app.domain.services.owner_index import OwnerIndex
+from app.domain.services.placement import PlacementEngine
+from app.infra.database.session import engine
+from app.infra.database.uow import get_uow
+
+from .alerts import AlertEngine
+from .archive import TelemetryArchive
+from .collector import TelemetryCollector
+from .exporter import PrometheusExporter
+from .forecast import CapacityForecaster
+from .metering import UsageMeter
+from .sink import TelemetrySink
+from .store import TelemetryStore
+
+logger = getLogger(__name__)
+
+_store: TelemetryStore | None = None
+_collector: TelemetryCollector | None = None
+_sink: TelemetrySink | None = None
+_owners: OwnerIndex | None = None
+_exporter: PrometheusExporter | None = None
+_forecaster: CapacityForecaster | None = None
+_meter: UsageMeter | None = None
+_redis: Redis | None = None
+
+
+def init_telemetry(container_provider: ContainerAPIProvider, placement: PlacementEngine) -> TelemetryCollector:
+    global _store, _collector, _sink, _owners, _exporter, _forecaster, _meter, _redis
+    if _collector is None:
+        settings = create_settings().telemetry_settings
+        _redis = Redis.from_url(create_settings().redis_settings.DATABASE_URL)
+        _store = TelemetryStore(
+            settings.BUFFER_SIZE,
+            settings.INTERVAL,
+            settings.STALE_AFTER,
+            settings.RETENTION_TIERS,
+            settings.SLOT_GRACE_TICKS
+        )
+        archive = TelemetryArchive(
+            _redis,
+            settings.ARCHIVE_CHUNK_SIZE,
+            settings.INTERVAL,
+            settings.ARCHIVE_RETENTION
+        )
+        if settings.SINK_ENABLED:
+            _sink = TelemetrySink(
+                engine,
+                settings.SINK_BATCH_SIZE,
+                settings.SINK_FLUSH_INTERVAL,
+                settings.SINK_MAX_BUFFER,
+                settings.SINK_RETENTION_DAYS,
+                settings.SINK_PARTITIONS_AHEAD,
+                settings.SINK_MAX_RETRIES
+            )
+        _owners = OwnerIndex(get_uow, settings.OWNERS_TTL)
+        _meter = UsageMeter(_store, get_uow, _owners, settings.METER_MAX_GAP)
+        _collector = TelemetryCollector(container_provider, _store, settings.INTERVAL, archive, _sink, _meter)
+        _exporter = PrometheusExporter(_store)
+        _forecaster = CapacityForecaster(
+            placement,
+            _store,
+            _redis,
+            settings.FORECAST_INTERVAL,
+            settings.FORECAST_HISTORY,
+            settings.FORECAST_MIN_SAMPLES,
+            settings.FORECAST_MAX_CONTAINERS
+        )
+        placement.set_forecast(_forecaster, settings.FORECAST_HORIZON)
+    return _collector
+
+
+def get_telemetry() -> TelemetryStore:
+    if _store is None:
+        raise RuntimeError("TelemetryStore has not been initialized yet.")
+    return _store
+
+
+def get_owner_index() -> OwnerIndex:
+    if _owners is None:
+        raise RuntimeError("OwnerIndex has not been initialized yet.")
+    return _owners
+
+
+def get_exporter() -> PrometheusExporter:
+    if _exporter is None:
+        raise RuntimeError("PrometheusExporter has not been initialized yet.")
+    return _exporter
+
+
+def get_forecaster() -> CapacityForecaster:
+    if _forecaster is None:
+        raise RuntimeError("CapacityForecaster has not been initialized yet.")
+    return _forecaster
+
+
+def create_alert_engine() -> AlertEngine:
+    settings = create_settings().telemetry_settings
+    return AlertEngine(
+        get_telemetry(),
+        {'cpu': settings.ALERT_CPU, 'mem': settings.ALERT_MEM, 'disk': settings.ALERT_DISK},
+        settings.ALERT_SUSTAIN,
+        settings.ALERT_DISK_TREND_WINDOW,
+        settings.ALERT_DISK_HORIZON,
+        settings.ALERT_ZSCORE,
+        settings.ALERT_ZSCORE_MIN_RATE,
+        settings.ALERT_REPEAT
+    )
+
+
+def get_telemetry_sink() -> TelemetrySink | None:
+    """None, если запись в Postgres выключена (TELEMETRY_SINK_ENABLED)"""
+    return _sink
+
+
+async def close_telemetry() -> None:
+    global _store, _collector, _sink, _owners, _exporter, _forecaster, _meter, _redis
+    if _meter is not None:
+        try:
+            await _meter.close()
+        except Exception as e:
+            logger.error(f'Usage metering final flush failed: {e}')
+    _meter = None
+    if _sink is not None:
+        try:
+            await _sink.flush()
+        except Exception as e:
+            logger.error(f'Telemetry sink final flush failed: {e}')
+    _sink = None
+    if _redis is not None:
+        await _redis.aclose()
+    _redis = None
+    _store = None
+    _collector = None
+    _owners = None
+    _exporter = None
+    _forecaster = None
@@ -0,0 +1,84 @@
+import warnings
+
+import numpy as np
+
+
+def counter_rates(times: np.ndarray, counters: np.ndarray) -> np.ndarray:
+    """
+    Скорости (в секунду) накопительных счетчиков counters[..., sample, metric].
+
+    Первый замер и интервалы со сбросом счетчика - NaN.
+    """
+    rates = np.full(counters.shape, np.nan)
+    if len(times) < 2:
+        return rates
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        deltas = np.diff(counters, axis=-2) / np.diff(times)[:, None]
+    deltas[deltas < 0] = np.nan
+    rates[..., 1:, :] = deltas
+    return rates
+
+
+def nan_last(values: np.ndarray, axis: int) -> np.ndarray:
+    """Последнее не-NaN значение вдоль оси (NaN, если таких нет)"""
+    present = ~np.isnan(values)
+    index = values.shape[axis] - 1 - np.argmax(np.flip(present, axis=axis), axis=axis)
+    last = np.take_along_axis(values, np.expand_dims(index, axis), axis=axis).squeeze(axis)
+    last[~present.any(axis=axis)] = np.nan
+    return last
+
+
+def nan_mean_max(values: np.ndarray, axis: int) -> tuple[np.ndarray, np.ndarray]:
+    with warnings.catch_warnings():
+        # Пустые срезы дают NaN - так и задумано
+        warnings.simplefilter('ignore', RuntimeWarning)
+        return np.nanmean(values, axis=axis), np.nanmax(values, axis=axis)
+
+
+def bucket_stats(
+    times: np.ndarray,
+    series: np.ndarray,
+    start: float,
+    step: float,
+    buckets: int
+) -> np.ndarray:
+    """
+    min/max/mean/p95 по шагам без циклов Python.
+
+    times[sample] отсортированы по возрастанию, series[sample, metric].
+    Результат - (buckets, metric, 4); шаги без данных - NaN.
+    """
+    result = np.full((buckets, series.shape[1], 4), np.nan)
+
+    index = np.floor((times - start) / step).astype(np.intp)
+    in_range = (index >= 0) & (index < buckets)
+    index, series = index[in_range], series[in_range]
+    if not len(index):
+        return result
+
+    # Раскладываем замеры в плотную матрицу (шаг, позиция в шаге, метрика)
+    first = np.searchsorted(index, index, side='left')
+    position = np.arange(len(index)) - first
+    dense = np.full((buckets, position.max() + 1, series.shape[1]), np.nan)
+    dense[index, position] = series
+
+    # NaN при сортировке уходят в конец, поэтому порядковые статистики
+    # берутся по индексу среди count непустых значений шага
+    ordered = np.sort(dense, axis=1)
+    count = np.count_nonzero(~np.isnan(dense), axis=1)
+    last = np.maximum(count - 1, 0)
+
+    rank = 0.95 * last
+    lower = np.floor(rank).astype(np.intp)
+    upper = np.minimum(lower + 1, last)
+    lower_value = np.take_along_axis(ordered, lower[:, None, :], axis=1)[:, 0]
+    upper_value = np.take_along_axis(ordered, upper[:, None, :], axis=1)[:, 0]
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        result[..., 0] = ordered[:, 0]
+        result[..., 1] = np.take_along_axis(ordered, last[:, None, :], axis=1)[:, 0]
+        result[..., 2] = np.nansum(dense, axis=1) / count
+        result[..., 3] = lower_value + (upper_value - lower_value) * (rank - lower)
+    result[count == 0] = np.nan
+    return result
@@ -0,0 +1,158 @@
+import time
+import warnings
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.core.dto.telemetry import TelemetryAlert
+
+from .aggregate import counter_rates, nan_last
+from .store import TelemetryStore
+
+# Меньше замеров в окне правила - решения не принимаем
+MIN_SAMPLES = 3
+# Минимум замеров в базовой линии для z-score
+MIN_BASELINE = 30
+
+GAUGES = ['cpu', 'mem', 'maxmem', 'disk', 'maxdisk']
+# Парами: сеть (in, out) и диск (read, write)
+COUNTERS = ['netin', 'netout', 'diskread', 'diskwrite']
+
+
+@dataclass
+class _RuleResult:
+    # Маски по слотам: условие выполнено / явно снято; между ними состояние не меняется
+    fire: np.ndarray
+    clear: np.ndarray
+    value: np.ndarray
+    threshold: float
+
+
+class AlertEngine:
+    """
+    Правила алертов поверх буферов TelemetryStore: каждое правило - одна
+    векторная проверка по всем контейнерам сразу.
+
+    - cpu/mem/disk: доля выше порога во всех замерах за sustain;
+      гаснет, когда все замеры окна ниже порога (без дребезга у границы)
+    - disk_trend: по наклону диска за trend_window место кончится раньше horizon
+    - net_anomaly/io_anomaly: средняя скорость за sustain выше базовой линии
+      буфера на zscore сигм и не меньше min_rate
+
+    Сработавший алерт повторяется не чаще раза в repeat секунд.
+    """
+
+    def __init__(
+        self,
+        store: TelemetryStore,
+        thresholds: dict[str, float],
+        sustain: float,
+        trend_window: float,
+        horizon: float,
+        zscore: float,
+        min_rate: float,
+        repeat: float
+    ):
+        self._store = store
+        self._thresholds = thresholds
+        self._sustain = sustain
+        self._trend_window = trend_window
+        self._horizon = horizon
+        self._zscore = zscore
+        self._min_rate = min_rate
+        self._repeat = repeat
+        # (vmid, kind) -> когда последний раз сообщали
+        self._active: dict[tuple[int, str], float] = {}
+
+    def evaluate(self, now: float | None = None) -> list[TelemetryAlert]:
+        now = time.time() if now is None else now
+        # Датчики нужны только за окно правил, счетчики - за весь буфер (базовая линия)
+        vmids, times, gauges = self._store.snapshot(GAUGES, now - max(self._sustain, self._trend_window))
+        recent = times >= now - self._sustain
+        if np.count_nonzero(recent) < MIN_SAMPLES:
+            # Сборщик стоит - по старым данным состояние не меняем
+            return []
+        _, counter_times, counters = self._store.snapshot(COUNTERS)
+
+        def gauge(name: str) -> np.ndarray:
+            return gauges[..., GAUGES.index(name)]
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            results = {
+                'cpu': _threshold(gauge('cpu')[:, recent], self._thresholds['cpu']),
+                'mem': _threshold((gauge('mem') / gauge('maxmem'))[:, recent], self._thresholds['mem']),
+                'disk': _threshold((gauge('disk') / gauge('maxdisk'))[:, recent], self._thresholds['disk']),
+                'disk_trend': self._disk_trend(times, gauge('disk'), gauge('maxdisk'), now),
+            }
+            # Сумма счетчиков - тоже счетчик: скорость считаем один раз на пару
+            rates = counter_rates(counter_times, counters[..., 0::2] + counters[..., 1::2])
+            counter_recent = counter_times >= now - self._sustain
+            results['net_anomaly'] = self._anomaly(rates[..., 0], counter_recent)
+            results['io_anomaly'] = self._anomaly(rates[..., 1], counter_recent)
+
+        return self._transitions(vmids, results, now)
+
+    def _disk_trend(self, times: np.ndarray, disk: np.ndarray, maxdisk: np.ndarray, now: float) -> _RuleResult:
+        window = times >= now - self._trend_window
+        if not window.any():
+            nothing = np.zeros(disk.shape[0], dtype=bool)
+            return _RuleResult(nothing, ~nothing, np.full(disk.shape[0], np.nan), self._horizon)
+        t, used = times[window] - now, disk[:, window]
+
+        # МНК-наклон по каждому слоту с учетом пропусков
+        present = ~np.isnan(used)
+        count = present.sum(axis=1)
+        t_mean = np.where(present, t, 0).sum(axis=1) / count
+        used_mean = np.nansum(used, axis=1) / count
+        dt = np.where(present, t - t_mean[:, None], 0)
+        du = np.where(present, used - used_mean[:, None], 0)
+        slope = (dt * du).sum(axis=1) / (dt * dt).sum(axis=1)
+
+        eta = (nan_last(maxdisk[:, window], axis=1) - nan_last(used, axis=1)) / slope
+        fire = (count >= MIN_SAMPLES) & (slope > 0) & (eta < self._horizon)
+        return _RuleResult(fire, ~fire, eta, self._horizon)
+
+    def _anomaly(self, rates: np.ndarray, recent: np.ndarray) -> _RuleResult:
+        baseline, current = rates[:, ~recent], rates[:, recent]
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            mean, std = np.nanmean(baseline, axis=1), np.nanstd(baseline, axis=1)
+            level = np.nanmean(current, axis=1)
+
+        score = (level - mean) / np.maximum(std, 1.0)
+        enough = np.count_nonzero(~np.isnan(baseline), axis=1) >= MIN_BASELINE
+        fire = enough & (score > self._zscore) & (level >= self._min_rate)
+        return _RuleResult(fire, ~fire, score, self._zscore)
+
+    def _transitions(self, vmids: np.ndarray, results: dict[str, _RuleResult], now: float) -> list[TelemetryAlert]:
+        alerts = []
+        firing = set()
+        for kind, result in results.items():
+            for slot in np.flatnonzero(result.fire & (vmids >= 0)):
+                key = (int(vmids[slot]), kind)
+                firing.add(key)
+                notified = self._active.get(key)
+                if notified is None or now - notified >= self._repeat:
+                    self._active[key] = now
+                    alerts.append(TelemetryAlert(key[0], kind, float(result.value[slot]), result.threshold))
+
+        slots = {int(vmid): slot for slot, vmid in enumerate(vmids) if vmid >= 0}
+        for key in list(self._active.keys() - firing):
+            vmid, kind = key
+            current = slots.get(vmid)
+            if current is None:
+                # Контейнер пропал из кластера - сообщать не о чем
+                del self._active[key]
+            elif results[kind].clear[current]:
+                del self._active[key]
+                result = results[kind]
+                alerts.append(TelemetryAlert(vmid, kind, float(result.value[current]), result.threshold, resolved=True))
+        return alerts
+
+
+def _threshold(window: np.ndarray, threshold: float) -> _RuleResult:
+    present = ~np.isnan(window)
+    enough = present.sum(axis=1) >= MIN_SAMPLES
+    fire = enough & np.all((window > threshold) | ~present, axis=1)
+    clear = ~enough | np.all((window <= threshold) | ~present, axis=1)
+    return _RuleResult(fire, clear, nan_last(window, axis=1), threshold)
@@ -0,0 +1,57 @@
+import math
+
+import numpy as np
+from redis.asyncio import Redis
+
+from .codec import decode_chunk, encode_chunk
+from .store import METRICS
+
+KEY_PREFIX = 'telemetry:raw:'
+
+# Множители перевода метрик в целые для кодека: cpu - доля ядра с точностью 1e-4,
+# остальное - байты и счетчики, они и так целые
+SCALES = np.array([10_000 if metric == 'cpu' else 1 for metric in METRICS], dtype=np.float64)
+
+
+class TelemetryArchive:
+    """
+    Сжатые чанки сырых замеров в Redis: список telemetry:raw:{vmid},
+    по чанку на chunk_size тиков, старые обрезаются по retention.
+    """
+
+    def __init__(self, redis: Redis, chunk_size: int, interval: float, retention: int):
+        self._redis = redis
+        self.chunk_size = chunk_size
+        self._retention = retention
+        self._max_chunks = max(math.ceil(retention / (chunk_size * interval)), 1)
+
+    async def append(self, series: dict[int, tuple[np.ndarray, np.ndarray]]) -> None:
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for vmid, (times, values) in series.items():
+                key = f'{KEY_PREFIX}{vmid}'
+                pipe.rpush(key, encode_chunk(times, values, SCALES))
+                pipe.ltrim(key, -self._max_chunks, -1)
+                pipe.expire(key, self._retention)
+            await pipe.execute()
+
+    async def load(self) -> dict[int, tuple[np.ndarray, np.ndarray]]:
+        keys = [key async for key in self._redis.scan_iter(match=f'{KEY_PREFIX}*', count=1000)]
+        if not keys:
+            return {}
+
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.lrange(key, 0, -1)
+            chunk_lists = await pipe.execute()
+
+        series = {}
+        for key, chunks in zip(keys, chunk_lists, strict=True):
+            if not chunks:
+                continue
+            vmid = int(key.decode().removeprefix(KEY_PREFIX))
+            decoded = [decode_chunk(chunk, SCALES) for chunk in chunks]
+            series[vmid] = (
+                np.concatenate([times for times, _ in decoded]),
+                np.concatenate([values for _, values in decoded])
+            )
+        return series
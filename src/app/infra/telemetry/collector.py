@@ -0,0 +1,84 @@
+import asyncio
+import time
+from logging import getLogger
+
+from app.domain.providers.container import ContainerAPIProvider
+
+from .archive import TelemetryArchive
+from .metering import UsageMeter
+from .sink import TelemetrySink
+from .store import TelemetryStore
+
+logger = getLogger(__name__)
+
+
+class TelemetryCollector:
+    """Раз в interval снимает /cluster/resources и пишет тик в TelemetryStore"""
+
+    def __init__(
+        self,
+        container_provider: ContainerAPIProvider,
+        store: TelemetryStore,
+        interval: float,
+        archive: TelemetryArchive | None = None,
+        sink: TelemetrySink | None = None,
+        meter: UsageMeter | None = None
+    ):
+        self._container_provider = container_provider
+        self._store = store
+        self._interval = interval
+        self._archive = archive
+        self._sink = sink
+        self._meter = meter
+        self._ticks = 0
+
+    async def collect(self) -> None:
+        resources = await self._container_provider.get_cluster_resources()
+        timestamp = time.time()
+        self._store.ingest(timestamp, resources)
+        if self._sink is not None:
+            self._sink.add(timestamp, resources)
+        self._ticks += 1
+
+        if self._meter is not None:
+            try:
+                await self._meter.observe()
+                if self._meter.pending:
+                    await self._meter.flush()
+            except Exception as e:
+                logger.error(f'Usage metering failed: {e}')
+
+        if self._archive is not None and self._ticks % self._archive.chunk_size == 0:
+            try:
+                await self._archive.append(self._store.export(self._archive.chunk_size))
+            except Exception as e:
+                logger.error(f'Telemetry archive write failed: {e}')
+
+    async def restore(self) -> None:
+        """Прогревает буфер и уровни агрегатов замерами из архива"""
+        if self._archive is None:
+            return
+        try:
+            series = await self._archive.load()
+        except Exception as e:
+            logger.error(f'Telemetry archive restore failed: {e}')
+            return
+        self._store.replay(series)
+        logger.info(f'Telemetry restored from archive: {len(series)} containers, {len(self._store)} ticks')
+
+    async def run(self) -> None:
+        await self.restore()
+        next_tick = time.monotonic()
+        while True:
+            try:
+                await self.collect()
+            except Exception as e:
+                logger.error(f'Telemetry collection failed: {e}')
+
+            # Тики по сетке, без накопления дрейфа от длительности запроса
+            next_tick += self._interval
+            delay = next_tick - time.monotonic()
+            if delay < 0:
+                next_tick = time.monotonic()
+                delay = 0
+            await asyncio.sleep(delay)
@@ -0,0 +1,137 @@
+import numpy as np
+
+from app.core.dto.container import ClusterResource, ContainerOwner
+
+from .store import TelemetryStore
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# (имя, тип, описание, поле ClusterResource)
+CONTAINER_FAMILIES = (
+    ('nvcloud_container_cpu_ratio', 'gauge', 'CPU usage, fraction of allocated cores', 'cpu'),
+    ('nvcloud_container_cpu_cores', 'gauge', 'Allocated CPU cores', 'maxcpu'),
+    ('nvcloud_container_memory_bytes', 'gauge', 'Used memory', 'mem'),
+    ('nvcloud_container_memory_limit_bytes', 'gauge', 'Allocated memory', 'maxmem'),
+    ('nvcloud_container_disk_bytes', 'gauge', 'Used root disk', 'disk'),
+    ('nvcloud_container_disk_limit_bytes', 'gauge', 'Root disk size', 'maxdisk'),
+    ('nvcloud_container_network_receive_bytes_total', 'counter', 'Received network traffic', 'netin'),
+    ('nvcloud_container_network_transmit_bytes_total', 'counter', 'Transmitted network traffic', 'netout'),
+    ('nvcloud_container_disk_read_bytes_total', 'counter', 'Bytes read from disk', 'diskread'),
+    ('nvcloud_container_disk_written_bytes_total', 'counter', 'Bytes written to disk', 'diskwrite'),
+)
+
+# Суммы по гостям ноды: (имя, описание, колонка)
+NODE_FAMILIES = (
+    ('nvcloud_node_containers', 'Containers on the node', 'count'),
+    ('nvcloud_node_containers_running', 'Running containers on the node', 'running'),
+    ('nvcloud_node_guest_cpu_cores', 'CPU cores used by containers', 'cpu'),
+    ('nvcloud_node_guest_memory_bytes', 'Memory used by containers', 'mem'),
+    ('nvcloud_node_guest_disk_bytes', 'Root disk used by containers', 'disk'),
+)
+
+
+class PrometheusExporter:
+    """
+    Текст /metrics из последнего тика TelemetryStore, без запросов к Proxmox.
+
+    Строки меток контейнеров форматируются один раз и пересобираются только
+    при смене имени, ноды или владельца; готовое тело кэшируется до следующего
+    тика сборщика или обновления OwnerIndex, так что частые scrape почти бесплатны.
+    Без owners метки owner нет.
+    """
+
+    def __init__(self, store: TelemetryStore):
+        self._store = store
+        # vmid -> ((name, node, owner), 'vmid="..",name="..",node="..",owner=".."')
+        self._labels: dict[int, tuple[tuple[str, str, str | None], str]] = {}
+        self._body = b''
+        self._rendered_for: tuple[float | None, int | None] | None = None
+
+    def render(self, owners: dict[int, ContainerOwner] | None = None, owners_version: int = 0) -> bytes:
+        """owners_version - версия owners (OwnerIndex.version), по ней сбрасывается кэш тела"""
+        key = (self._store.last_tick, None if owners is None else owners_version)
+        if key == self._rendered_for:
+            return self._body
+
+        resources = self._store.resources
+        labels = [
+            self._label(vmid, resource, None if owners is None else _username(owners.get(vmid)))
+            for vmid, resource in resources.items()
+        ]
+        for vmid in self._labels.keys() - resources.keys():
+            del self._labels[vmid]
+
+        lines = []
+        lines.append('# HELP nvcloud_container_up Container is running\n# TYPE nvcloud_container_up gauge\n')
+        lines.extend(
+            f'nvcloud_container_up{{{label}}} {int(resource.status == "running")}\n'
+            for label, resource in zip(labels, resources.values(), strict=True)
+        )
+        for name, kind, description, field in CONTAINER_FAMILIES:
+            lines.append(f'# HELP {name} {description}\n# TYPE {name} {kind}\n')
+            lines.extend(
+                f'{name}{{{label}}} {getattr(resource, field)}\n'
+                for label, resource in zip(labels, resources.values(), strict=True)
+            )
+
+        lines.extend(self._node_lines(resources))
+
+        last_tick = self._store.last_tick
+        if last_tick is not None:
+            lines.append(
+                '# HELP nvcloud_telemetry_last_collect_timestamp_seconds Time of the last collector tick\n'
+                '# TYPE nvcloud_telemetry_last_collect_timestamp_seconds gauge\n'
+                f'nvcloud_telemetry_last_collect_timestamp_seconds {last_tick}\n'
+            )
+
+        self._body = ''.join(lines).encode()
+        self._rendered_for = key
+        return self._body
+
+    def _label(self, vmid: int, resource: ClusterResource, username: str | None) -> str:
+        """username None - без метки owner"""
+        identity = (resource.name, resource.node, username)
+        cached = self._labels.get(vmid)
+        if cached is not None and cached[0] == identity:
+            return cached[1]
+
+        label = f'vmid="{vmid}",name="{_escape(resource.name)}",node="{_escape(resource.node)}"'
+        if username is not None:
+            label += f',owner="{_escape(username)}"'
+        self._labels[vmid] = (identity, label)
+        return label
+
+    @staticmethod
+    def _node_lines(resources: dict[int, ClusterResource]) -> list[str]:
+        if not resources:
+            return []
+
+        nodes, index = np.unique([resource.node for resource in resources.values()], return_inverse=True)
+        values = np.array(
+            [[resource.cpu, resource.maxcpu, resource.mem, resource.disk, resource.status == 'running']
+             for resource in resources.values()],
+            dtype=np.float64
+        )
+        columns = {
+            'count': np.ones(len(values)),
+            'running': values[:, 4],
+            'cpu': values[:, 0] * values[:, 1],
+            'mem': values[:, 2],
+            'disk': values[:, 3],
+        }
+        node_labels = [f'node="{_escape(str(node))}"' for node in nodes]
+
+        lines = []
+        for name, description, column in NODE_FAMILIES:
+            lines.append(f'# HELP {name} {description}\n# TYPE {name} gauge\n')
+            totals = np.bincount(index, weights=columns[column], minlength=len(nodes))
+            lines.extend(f'{name}{{{label}}} {total!r}\n' for label, total in zip(node_labels, totals.tolist(), strict=True))
+        return lines
+
+
+def _username(owner: ContainerOwner | None) -> str:
+    return owner.username if owner else ''
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
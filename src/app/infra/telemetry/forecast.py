@@ -0,0 +1,228 @@
+import asyncio
+import io
+import time
+from datetime import datetime, timezone
+from logging import getLogger
+
+import numpy as np
+from redis.asyncio import Redis
+
+from app.core.dto.node import CAPACITY_RESOURCES, CapacityForecast, NodeCapacity, PlacementRequest
+from app.domain.providers.capacity import CapacityForecastProvider
+from app.domain.services.placement import PlacementEngine
+
+from .store import TelemetryStore
+
+logger = getLogger(__name__)
+
+HISTORY_KEY = 'telemetry:capacity'
+
+RAM_COMMITTED, RAM_USED, DISK, CONTAINERS = range(len(CAPACITY_RESOURCES))
+
+
+class CapacityForecaster(CapacityForecastProvider):
+    """
+    Прогноз заполнения нод и хранилища размещения.
+
+    Раз в interval снимает емкость нод (PlacementEngine) и из последнего тика
+    телеметрии считает выделенную контейнерам RAM и число контейнеров на ноде.
+    По последним history замерам одним проходом numpy строится линейный тренд
+    (МНК) для всех нод и ресурсов сразу; дата исчерпания - где тренд пересекает
+    лимит. История переживает рестарт через Redis.
+    """
+
+    def __init__(
+        self,
+        placement: PlacementEngine,
+        store: TelemetryStore,
+        redis: Redis,
+        interval: float,
+        history: int,
+        min_samples: int,
+        max_containers: int = 0
+    ):
+        self._placement = placement
+        self._store = store
+        self._redis = redis
+        self._interval = interval
+        self._history = history
+        self._min_samples = max(min_samples, 2)
+        self._max_containers = max_containers
+        self._nodes: list[str] = []
+        self._times = np.zeros(0)
+        # [нода, замер, ресурс]; NaN - нода в этом замере не ответила
+        self._used = np.zeros((0, 0, len(CAPACITY_RESOURCES)))
+        self._totals = np.zeros((0, len(CAPACITY_RESOURCES)))
+        # Результат последней подгонки: уровень тренда на момент fitted_at и наклон в секунду
+        self._level = np.zeros((0, len(CAPACITY_RESOURCES)))
+        self._slope = np.zeros((0, len(CAPACITY_RESOURCES)))
+        self._samples = np.zeros((0, len(CAPACITY_RESOURCES)), dtype=np.int64)
+        self._fitted_at = 0.0
+
+    async def sample(self, timestamp: float | None = None) -> None:
+        timestamp = time.time() if timestamp is None else timestamp
+        capacities = await self._placement.get_capacities()
+        if not capacities:
+            return
+
+        rows = np.full((len(self._nodes), len(CAPACITY_RESOURCES)), np.nan)
+        totals = self._totals.copy()
+        guests = self._guests()
+        for capacity in capacities:
+            row = self._row(capacity.node)
+            if row >= len(rows):
+                rows = np.vstack((rows, np.full((1, len(CAPACITY_RESOURCES)), np.nan)))
+                totals = np.vstack((totals, np.zeros((1, len(CAPACITY_RESOURCES)))))
+            committed, count = guests.get(capacity.node, (0, 0))
+            rows[row] = (committed, capacity.mem_total - capacity.mem_free,
+                         capacity.storage_total - capacity.storage_free, count)
+            totals[row] = _totals(capacity, self._max_containers)
+
+        self._append(timestamp, rows, totals)
+        self._fit()
+
+    def _row(self, node: str) -> int:
+        if node not in self._nodes:
+            self._nodes.append(node)
+        return self._nodes.index(node)
+
+    def _guests(self) -> dict[str, tuple[float, int]]:
+        """Выделенная RAM и число контейнеров по нодам из последнего тика"""
+        resources = [resource for resource in self._store.resources.values() if not resource.template]
+        if not resources:
+            return {}
+        nodes, index = np.unique([resource.node for resource in resources], return_inverse=True)
+        committed = np.bincount(index, weights=[resource.maxmem for resource in resources], minlength=len(nodes))
+        counts = np.bincount(index, minlength=len(nodes))
+        return {str(node): (float(mem), int(count)) for node, mem, count in zip(nodes, committed, counts, strict=True)}
+
+    def _append(self, timestamp: float, rows: np.ndarray, totals: np.ndarray) -> None:
+        grown = len(rows) - len(self._used)
+        if grown:
+            padding = np.full((grown, self._used.shape[1], len(CAPACITY_RESOURCES)), np.nan)
+            self._used = np.concatenate((self._used, padding))
+        self._times = np.append(self._times, timestamp)[-self._history:]
+        self._used = np.concatenate((self._used, rows[:, None, :]), axis=1)[:, -self._history:]
+        self._totals = totals
+
+    def _fit(self) -> None:
+        """МНК по всем (нода, ресурс) сразу; пропуски (NaN) не участвуют"""
+        # Время от последнего замера: наклон тот же, а свободный член - уровень «сейчас»
+        x = (self._times - self._times[-1])[None, :, None]
+        valid = ~np.isnan(self._used)
+        xs = np.where(valid, x, 0.0)
+        ys = np.where(valid, self._used, 0.0)
+
+        n = valid.sum(axis=1)
+        sx, sy = xs.sum(axis=1), ys.sum(axis=1)
+        sxx, sxy = (xs * xs).sum(axis=1), (xs * ys).sum(axis=1)
+        denominator = n * sxx - sx * sx
+
+        fitted = (n >= self._min_samples) & (denominator > 0)
+        safe = np.where(fitted, denominator, 1.0)
+        self._slope = np.where(fitted, (n * sxy - sx * sy) / safe, 0.0)
+        self._level = np.where(fitted, (sy - self._slope * sx) / np.maximum(n, 1), np.nan)
+        self._samples = n
+        self._fitted_at = float(self._times[-1])
+
+    def forecast(self) -> list[CapacityForecast]:
+        if not self._nodes:
+            return []
+
+        seconds = _seconds_left(self._totals - self._level, self._slope, self._level)
+        # Без лимита (число контейнеров) исчерпания нет
+        seconds = np.where(self._totals > 0, seconds, np.nan)
+        latest = _last_valid(self._used)
+
+        forecasts = []
+        for row, node in enumerate(self._nodes):
+            for column, resource in enumerate(CAPACITY_RESOURCES):
+                left = seconds[row, column]
+                forecasts.append(CapacityForecast(
+                    node=node,
+                    storage=self._placement.storage if column == DISK else None,
+                    resource=resource,
+                    used=float(latest[row, column]),
+                    total=float(self._totals[row, column]),
+                    growth_per_day=float(self._slope[row, column] * 86_400),
+                    exhausted_at=_moment(self._fitted_at + left) if np.isfinite(left) else None,
+                    samples=int(self._samples[row, column])
+                ))
+        return forecasts
+
+    def runway(self, node: str, request: PlacementRequest) -> float | None:
+        if node not in self._nodes:
+            return None
+        row = self._nodes.index(node)
+        # Как и select_node, по фактически занятой RAM: выделенная в LXC обычно с оверкоммитом
+        columns = [RAM_USED, DISK]
+        headroom = self._totals[row, columns] - self._level[row, columns] - (request.ram_bytes, request.rom_bytes)
+        seconds = _seconds_left(headroom, self._slope[row, columns], self._level[row, columns])
+        if np.isnan(seconds).all():
+            return None
+        # Тренд построен на момент последнего замера
+        return max(float(np.nanmin(seconds)) - (time.time() - self._fitted_at), 0.0)
+
+    async def save(self) -> None:
+        buffer = io.BytesIO()
+        np.savez_compressed(
+            buffer, nodes=np.array(self._nodes, dtype=str), times=self._times,
+            used=self._used, totals=self._totals
+        )
+        await self._redis.set(HISTORY_KEY, buffer.getvalue())
+
+    async def load(self) -> None:
+        payload = await self._redis.get(HISTORY_KEY)
+        if not payload:
+            return
+        with np.load(io.BytesIO(payload), allow_pickle=False) as data:
+            self._nodes = data['nodes'].tolist()
+            self._times = data['times'][-self._history:]
+            self._used = data['used'][:, -self._history:]
+            self._totals = data['totals']
+        if len(self._times):
+            self._fit()
+        logger.info(f'Capacity history restored: {len(self._nodes)} nodes, {len(self._times)} samples')
+
+    async def run(self) -> None:
+        try:
+            await self.load()
+        except Exception as e:
+            logger.error(f'Capacity history restore failed: {e}')
+
+        while True:
+            # Первый тик телеметрии нужен для выделенной RAM и числа контейнеров
+            await asyncio.sleep(self._interval)
+            try:
+                await self.sample()
+                await self.save()
+            except Exception as e:
+                logger.error(f'Capacity sampling failed: {e}')
+
+
+def _totals(capacity: NodeCapacity, max_containers: int) -> tuple[float, float, float, float]:
+    return (capacity.mem_total, capacity.mem_total, capacity.storage_total, max_containers)
+
+
+def _moment(timestamp: float) -> datetime | None:
+    """Дата исчерпания; при почти нулевом росте она за пределами datetime - считаем, что не наступит"""
+    try:
+        return datetime.fromtimestamp(timestamp, tz=timezone.utc)
+    except (OverflowError, OSError, ValueError):
+        return None
+
+
+def _seconds_left(headroom: np.ndarray, slope: np.ndarray, level: np.ndarray) -> np.ndarray:
+    """Секунды до исчерпания остатка headroom; inf - не растет, nan - тренда нет"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        seconds = np.where(slope > 0, headroom / slope, np.inf)
+    seconds = np.where(headroom <= 0, 0.0, seconds)
+    return np.where(np.isnan(level), np.nan, seconds)
+
+
+def _last_valid(values: np.ndarray) -> np.ndarray:
+    """Последний не-NaN замер по каждой (нода, ресурс)"""
+    valid = ~np.isnan(values)
+    last = values.shape[1] - 1 - np.argmax(valid[:, ::-1], axis=1)
+    latest = np.take_along_axis(values, last[:, None, :], axis=1)[:, 0]
+    return np.where(valid.any(axis=1), latest, np.nan)
@@ -0,0 +1,80 @@
+import asyncio
+from logging import getLogger
+
+from app.core.dto.telemetry import TelemetrySample
+from app.domain.providers.telemetry import TelemetryProvider, TelemetrySubscription
+
+logger = getLogger(__name__)
+
+
+class Subscription(TelemetrySubscription):
+    """
+    Непрочитанные замеры одного подписчика: последний по каждому vmid.
+
+    Если подписчик не успевает читать, более старый замер того же vmid
+    заменяется новым: телеметрия - это состояние, важен последний снимок,
+    а не каждый. Замеры разных vmid друг друга не вытесняют.
+    """
+
+    def __init__(self, hub: 'TelemetryHub', vmids: set[int]):
+        self.vmids = vmids
+        self.dropped = 0
+        self._hub = hub
+        self._pending: dict[int, TelemetrySample] = {}
+        self._wakeup = asyncio.Event()
+
+    def push(self, sample: TelemetrySample) -> None:
+        if sample.vmid in self._pending:
+            self.dropped += 1
+        self._pending[sample.vmid] = sample
+        self._wakeup.set()
+
+    async def get(self, timeout: float | None = None) -> TelemetrySample | None:
+        if not self._pending:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        # Первым отдается vmid, дольше всех ждущий чтения
+        vmid = next(iter(self._pending))
+        sample = self._pending.pop(vmid)
+        if not self._pending:
+            self._wakeup.clear()
+        return sample
+
+    def close(self) -> None:
+        self._hub.unsubscribe(self)
+
+
+class TelemetryHub:
+    """Раздает свежие замеры подписчикам; один снимок vmid на всех его зрителей"""
+
+    def __init__(self) -> None:
+        self._subscribers: dict[int, set[Subscription]] = {}
+
+    @property
+    def watched(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self, vmids: set[int]) -> Subscription:
+        subscription = Subscription(self, vmids)
+        for vmid in vmids:
+            self._subscribers.setdefault(vmid, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        for vmid in subscription.vmids:
+            subscribers = self._subscribers.get(vmid)
+            if subscribers is None:
+                continue
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[vmid]
+        if subscription.dropped:
+            logger.debug(f'Telemetry subscriber dropped {subscription.dropped} samples')
+
+    def publish(self, telemetry: TelemetryProvider) -> None:
+        samples = telemetry.latest_many(list(self._subscribers))
+        for vmid, sample in samples.items():
+            for subscription in self._subscribers[vmid]:
+                subscription.push(sample)
@@ -0,0 +1,176 @@
+from datetime import datetime, timezone
+from logging import getLogger
+from typing import Callable
+from uuid import UUID
+
+import numpy as np
+
+from app.core.dto.container import ContainerOwner
+from app.core.dto.usage import USAGE_FIELDS, UsageRecord
+from app.domain.services.owner_index import OwnerIndex
+from app.domain.uow.abstract import AbstractUnitOfWork
+
+from .store import TelemetryStore
+
+logger = getLogger(__name__)
+
+METER_METRICS = ['cpu', 'maxcpu', 'mem', 'disk', 'netin', 'netout']
+CPU, MAXCPU, MEM, DISK, NETIN, NETOUT = range(len(METER_METRICS))
+
+GIB_HOUR = 2 ** 30 * 3600
+
+
+class UsageMeter:
+    """
+    Учет потребления по тикам сборщика.
+
+    Каждый интервал между двумя тиками интегрируется по всем слотам сразу
+    (трапеции для cpu/ram/disk, приращения счетчиков для сети) и сразу
+    относится на владельца контейнера в момент замера - удаленный посреди
+    часа контейнер все равно попадет в счет. Итоги открытого часа копятся
+    в матрице по владельцам; когда тик переходит в следующий час (и при
+    остановке) они пишутся в usages, прибавляясь к уже записанному.
+
+    Интервалы длиннее max_gap (сборщик стоял) не учитываются: что было
+    внутри, неизвестно. Сброс счетчика (рестарт контейнера) считается
+    как трафик от нуля до нового значения.
+    """
+
+    def __init__(
+        self,
+        store: TelemetryStore,
+        uow_factory: Callable[[], AbstractUnitOfWork],
+        owners: OwnerIndex,
+        max_gap: float
+    ):
+        self._store = store
+        self._uow_factory = uow_factory
+        self._owners = owners
+        self._max_gap = max_gap
+        self._last_tick: float | None = None
+        self._hour: float | None = None
+        # Накопления открытого часа по владельцам: строка - индекс в _owner_ids
+        self._owner_ids: list[UUID] = []
+        self._owner_rows: dict[UUID, int] = {}
+        self._usage = np.zeros((0, len(USAGE_FIELDS)))
+        # Строка владельца по слоту стора (-1 - владельца нет) и для каких vmids/owners она построена
+        self._slot_rows = np.zeros(0, dtype=np.intp)
+        self._slot_vmids = np.zeros(0, dtype=np.int64)
+        self._slot_owners: dict[int, ContainerOwner] | None = None
+        # Закрытые часы, еще не записанные в БД: (час, owner_ids, usage[owner, field])
+        self._pending: list[tuple[float, list[UUID], np.ndarray]] = []
+
+    @property
+    def pending(self) -> bool:
+        return bool(self._pending)
+
+    async def observe(self) -> None:
+        """Учитывает интервал между предыдущим и последним тиком стора"""
+        tick = self._store.last_tick
+        if tick is None or tick == self._last_tick:
+            return
+        previous, self._last_tick = self._last_tick, tick
+        if previous is None:
+            return
+
+        hour = previous // 3600 * 3600
+        if self._hour is None:
+            self._hour = hour
+        elif hour > self._hour:
+            self._close_hour()
+            self._hour = hour
+
+        elapsed = tick - previous
+        if elapsed > self._max_gap:
+            return
+
+        vmids, times, values = self._store.snapshot(METER_METRICS, since=previous)
+        if len(times) != 2:
+            return
+        rows = await self._map_owners(vmids)
+
+        before, after = values[:, 0], values[:, 1]
+        increments = np.zeros((len(vmids), len(USAGE_FIELDS)))
+        increments[:, 0] = (before[:, CPU] * before[:, MAXCPU] + after[:, CPU] * after[:, MAXCPU]) / 2 * elapsed
+        increments[:, 1] = (before[:, MEM] + after[:, MEM]) / 2 * elapsed / GIB_HOUR
+        increments[:, 2] = (before[:, DISK] + after[:, DISK]) / 2 * elapsed / GIB_HOUR
+
+        counters = after[:, [NETIN, NETOUT]] - before[:, [NETIN, NETOUT]]
+        reset = counters < 0
+        counters[reset] = after[:, [NETIN, NETOUT]][reset]
+        increments[:, 3:] = counters
+
+        # NaN - контейнера не было в одном из тиков, интервал ему не засчитываем
+        np.nan_to_num(increments, copy=False, nan=0.0)
+        # Контейнеры без владельца в БД (шаблоны, чужие гости кластера) не тарифицируются
+        owned = rows >= 0
+        np.add.at(self._usage, rows[owned], increments[owned])
+
+    async def _map_owners(self, vmids: np.ndarray) -> np.ndarray:
+        """Строка владельца для каждого слота; пересчитывается при смене vmids слотов или индекса владельцев"""
+        owners = await self._owners.get()
+        changed = not np.array_equal(vmids, self._slot_vmids)
+        if changed:
+            appeared = set(vmids.tolist()) - set(self._slot_vmids.tolist()) - {-1}
+            if appeared - owners.keys():
+                # Появился vmid без владельца в индексе - возможно, контейнер только что создан
+                self._owners.invalidate()
+                owners = await self._owners.get()
+        if not changed and owners is self._slot_owners:
+            return self._slot_rows
+
+        rows = np.full(len(vmids), -1, dtype=np.intp)
+        for slot, vmid in enumerate(vmids.tolist()):
+            owner = owners.get(vmid)
+            if owner is not None:
+                rows[slot] = self._owner_row(owner.owner_id)
+        self._slot_rows, self._slot_vmids, self._slot_owners = rows, vmids.copy(), owners
+        return rows
+
+    def _owner_row(self, owner_id: UUID) -> int:
+        row = self._owner_rows.get(owner_id)
+        if row is None:
+            row = self._owner_rows[owner_id] = len(self._owner_ids)
+            self._owner_ids.append(owner_id)
+            self._usage = np.vstack((self._usage, np.zeros((1, len(USAGE_FIELDS)))))
+        return row
+
+    def _close_hour(self) -> None:
+        used = np.flatnonzero(self._usage.any(axis=1))
+        if len(used):
+            owner_ids = [self._owner_ids[row] for row in used.tolist()]
+            self._pending.append((self._hour, owner_ids, self._usage[used].copy()))  # type: ignore
+        self._usage[:] = 0
+
+    async def flush(self) -> None:
+        """Пишет закрытые часы в БД; при ошибке часы остаются в очереди"""
+        records = [
+            _record(hour, owner_id, row)
+            for hour, owner_ids, usage in self._pending
+            for owner_id, row in zip(owner_ids, usage, strict=True)
+        ]
+
+        uow = self._uow_factory()
+        async with uow:
+            await uow.usage_repo.upsert(records)
+        logger.info(f'Usage metered: {len(self._pending)} hours, {len(records)} owner rows')
+        self._pending = []
+
+    async def close(self) -> None:
+        """При остановке пишет и незакрытый час: следующий процесс допишет его итог"""
+        if self._hour is not None:
+            self._close_hour()
+        if self._pending:
+            await self.flush()
+
+
+def _record(hour: float, owner_id: UUID, row: np.ndarray) -> UsageRecord:
+    return UsageRecord(
+        owner_id=owner_id,
+        hour=datetime.fromtimestamp(hour, tz=timezone.utc),
+        cpu_seconds=float(row[0]),
+        ram_gb_hours=float(row[1]),
+        disk_gb_hours=float(row[2]),
+        net_in_bytes=int(row[3]),
+        net_out_bytes=int(row[4])
+    )
@@ -0,0 +1,106 @@
+import numpy as np
+
+from .aggregate import counter_rates, nan_last, nan_mean_max
+
+# Метрики агрегированных уровней: датчики и накопительные счетчики
+TIER_GAUGES = ('cpu', 'mem', 'disk')
+TIER_COUNTERS = ('netin', 'netout', 'diskread', 'diskwrite')
+TIER_METRICS = TIER_GAUGES + TIER_COUNTERS
+TIER_INDEX = {metric: i for i, metric in enumerate(TIER_METRICS)}
+
+# Для датчиков avg/max - по значениям, для счетчиков - по скорости в секунду;
+# last - последнее значение датчика или самого счетчика
+AVG, MAX, LAST = range(3)
+
+
+class Tier:
+    """
+    Уровень хранения с шагом step: кольцо агрегатов values[slot, column, metric, avg|max|last].
+
+    Слоты совпадают со слотами сырого буфера TelemetryStore.
+    """
+
+    def __init__(self, step: int, retention: int):
+        self.step = step
+        self.retention = retention
+        self.capacity = max(retention // step, 1)
+        self.times = np.full(self.capacity, np.nan)
+        self.values = np.full((0, self.capacity, len(TIER_METRICS), 3), np.nan)
+        self.head = -1
+        self.count = 0
+        # Начало шага, который еще набирается
+        self.open_bucket: float | None = None
+
+    def resize(self, slots: int) -> None:
+        grown = np.full((slots, self.capacity, len(TIER_METRICS), 3), np.nan)
+        grown[:self.values.shape[0]] = self.values
+        self.values = grown
+
+    def clear_slot(self, slot: int) -> None:
+        self.values[slot] = np.nan
+
+    def columns(self, count: int | None = None) -> np.ndarray:
+        """Индексы последних count колонок, от старых к новым"""
+        count = self.count if count is None else count
+        return (self.head - np.arange(count - 1, -1, -1)) % self.capacity
+
+    def append(self, start: float, aggregates: np.ndarray) -> None:
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        self.times[self.head] = start
+        self.values[:, self.head] = np.nan
+        self.values[:len(aggregates), self.head] = aggregates
+
+    def window(self, slot: int, start: float, end: float) -> tuple[np.ndarray, np.ndarray]:
+        """Агрегаты слота за [start, end): times[n], values[n, metric, 3]"""
+        columns = self.columns()
+        times = self.times[columns]
+        mask = (times >= start) & (times < end)
+        return times[mask], self.values[slot, columns[mask]]
+
+    def evict(self, now: float) -> None:
+        """Стирает колонки старше retention (после простоя сборщика кольцо само их не перезапишет)"""
+        expired = self.times < now - self.retention
+        if expired.any():
+            self.times[expired] = np.nan
+            self.values[:, expired] = np.nan
+
+
+def rollup_raw(times: np.ndarray, gauges: np.ndarray, counters: np.ndarray, start: float) -> np.ndarray:
+    """
+    Агрегаты шага из сырых замеров всех слотов.
+
+    gauges[slot, sample, metric], counters[slot, sample, metric]; первый замер
+    может лежать до start - он нужен только для скорости первого интервала.
+    Результат - [slot, metric, avg|max|last].
+    """
+    rates = counter_rates(times, counters)
+    inside = times >= start
+
+    result = np.full((gauges.shape[0], len(TIER_METRICS), 3), np.nan)
+    if not inside.any():
+        return result
+
+    gauges, rates, counters = gauges[:, inside], rates[:, inside], counters[:, inside]
+    gauge_avg, gauge_max = nan_mean_max(gauges, axis=1)
+    rate_avg, rate_max = nan_mean_max(rates, axis=1)
+
+    result[:, :len(TIER_GAUGES), AVG] = gauge_avg
+    result[:, :len(TIER_GAUGES), MAX] = gauge_max
+    result[:, :len(TIER_GAUGES), LAST] = nan_last(gauges, axis=1)
+    result[:, len(TIER_GAUGES):, AVG] = rate_avg
+    result[:, len(TIER_GAUGES):, MAX] = rate_max
+    result[:, len(TIER_GAUGES):, LAST] = nan_last(counters, axis=1)
+    return result
+
+
+def rollup_tier(values: np.ndarray) -> np.ndarray:
+    """Агрегаты шага из колонок более мелкого уровня: values[slot, column, metric, 3]"""
+    result = np.full((values.shape[0], len(TIER_METRICS), 3), np.nan)
+    if not values.shape[1]:
+        return result
+
+    result[..., AVG], _ = nan_mean_max(values[..., AVG], axis=1)
+    _, result[..., MAX] = nan_mean_max(values[..., MAX], axis=1)
+    result[..., LAST] = nan_last(values[..., LAST], axis=1)
+    return result
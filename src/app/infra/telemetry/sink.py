@@ -0,0 +1,184 @@
+import asyncio
+import time
+from collections import deque
+from datetime import date, datetime, timedelta, timezone
+from logging import getLogger
+
+import asyncpg  # type: ignore
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.dto.container import ClusterResource
+
+logger = getLogger(__name__)
+
+TABLE = 'telemetry_samples'
+COLUMNS = (
+    'time', 'vmid', 'node', 'cpu', 'maxcpu', 'mem', 'maxmem',
+    'disk', 'maxdisk', 'netin', 'netout', 'diskread', 'diskwrite'
+)
+
+# Строка COPY в порядке COLUMNS
+Row = tuple[datetime, int, str, float, int, int, int, int, int, int, int, int, int]
+
+# Партиции пересматриваются не чаще раза в час
+MAINTENANCE_INTERVAL = 3600
+
+
+class TelemetrySink:
+    """
+    Буфер замеров и пакетная запись в Postgres через COPY.
+
+    Таблица партиционирована по суткам (UTC): партиции на partitions_ahead дней
+    вперед создаются заранее, старше retention_days - удаляются целиком,
+    так что стоимость записи и очистки не растет с объемом истории. Партиции
+    под дни пакета (после простоя, при сдвиге часов) создаются перед COPY;
+    замеры вне [retention, partitions_ahead] отбрасываются.
+    Пока БД недоступна, замеры копятся в буфере до max_buffer, старые вытесняются;
+    пакет, который БД отвергла max_retries раз подряд, отбрасывается.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        batch_size: int,
+        flush_interval: float,
+        max_buffer: int,
+        retention_days: int,
+        partitions_ahead: int,
+        max_retries: int
+    ):
+        self._engine = engine
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._retention_days = retention_days
+        self._partitions_ahead = partitions_ahead
+        self._max_retries = max_retries
+        self._buffer: deque[Row] = deque(maxlen=max_buffer)
+        self._dropped = 0
+        self._rejected = 0
+        self._full = asyncio.Event()
+        # Дни, партиции которых уже есть
+        self._partitions: set[date] = set()
+        self._next_maintenance = 0.0
+
+    def add(self, timestamp: float, resources: dict[int, ClusterResource]) -> None:
+        moment = datetime.fromtimestamp(timestamp, tz=timezone.utc)
+        self._dropped += max(len(self._buffer) + len(resources) - self._buffer.maxlen, 0)  # type: ignore
+        self._buffer.extend(
+            (
+                moment, vmid, r.node, float(r.cpu), int(r.maxcpu), int(r.mem), int(r.maxmem),
+                int(r.disk), int(r.maxdisk), int(r.netin), int(r.netout), int(r.diskread), int(r.diskwrite)
+            )
+            for vmid, r in resources.items()
+        )
+        if len(self._buffer) >= self._batch_size:
+            self._full.set()
+
+    async def flush(self) -> None:
+        while self._buffer:
+            batch = [self._buffer.popleft() for _ in range(min(self._batch_size, len(self._buffer)))]
+            try:
+                batch = self._in_range(batch)
+                days = {row[0].date() for row in batch}
+                if days - self._partitions:
+                    await self.maintain(days)
+                if batch:
+                    await self._copy(batch)
+            except BaseException as e:
+                # COPY отвергнут самой БД (данные, а не связь) - повтор того же пакета
+                # вряд ли поможет, и без предела он навсегда встанет в голове буфера
+                if isinstance(e, asyncpg.PostgresError):
+                    self._rejected += 1
+                    if self._rejected >= self._max_retries:
+                        logger.error(f'Telemetry sink dropped {len(batch)} samples rejected {self._rejected} times: {e}')
+                        self._rejected = 0
+                        raise
+                # В том числе при отмене посреди COPY: пакет запишет финальный flush
+                self._buffer.extendleft(reversed(batch))
+                raise
+            self._rejected = 0
+
+    def _in_range(self, batch: list[Row]) -> list[Row]:
+        """Отбрасывает замеры, для дней которых партиций не будет: старше retention или слишком далеко вперед"""
+        today = datetime.now(timezone.utc).date()
+        oldest, latest = today - timedelta(days=self._retention_days), today + timedelta(days=self._partitions_ahead)
+        times = [row[0] for row in batch]
+        if oldest <= min(times).date() and max(times).date() <= latest:
+            return batch
+        kept = [row for row in batch if oldest <= row[0].date() <= latest]
+        logger.warning(f'Telemetry sink dropped {len(batch) - len(kept)} samples outside {oldest}..{latest}')
+        return kept
+
+    async def _copy(self, batch: list[Row]) -> None:
+        async with self._engine.connect() as connection:
+            raw = await connection.get_raw_connection()
+            await raw.driver_connection.copy_records_to_table(  # type: ignore
+                TABLE,
+                records=batch,
+                columns=COLUMNS
+            )
+
+    async def maintain(self, days: set[date] | None = None) -> None:
+        """Создает партиции на вчера, сегодня и вперед (и на days), удаляет вышедшие за retention"""
+        today = datetime.now(timezone.utc).date()
+        oldest = today - timedelta(days=self._retention_days)
+        days = {today + timedelta(days=offset) for offset in range(-1, self._partitions_ahead + 1)} | (days or set())
+
+        async with self._engine.begin() as connection:
+            for day in sorted(days - self._partitions):
+                if day < oldest:
+                    continue
+                await connection.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {_partition_name(day)} PARTITION OF {TABLE} "
+                    f"FOR VALUES FROM ('{day.isoformat()} 00:00+00') "
+                    f"TO ('{(day + timedelta(days=1)).isoformat()} 00:00+00')"
+                ))
+
+            result = await connection.execute(text(
+                "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                f"WHERE i.inhparent = '{TABLE}'::regclass"
+            ))
+            partitions = set()
+            for name in result.scalars():
+                partition_day = _partition_day(name)
+                if partition_day is None:
+                    continue
+                if partition_day < oldest:
+                    await connection.execute(text(f"DROP TABLE {name}"))
+                    logger.info(f'Dropped telemetry partition {name}')
+                else:
+                    partitions.add(partition_day)
+
+        self._partitions = partitions
+        self._next_maintenance = time.monotonic() + MAINTENANCE_INTERVAL
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._full.wait(), self._flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._full.clear()
+
+            try:
+                if time.monotonic() >= self._next_maintenance:
+                    await self.maintain()
+                await self.flush()
+            except Exception as e:
+                logger.error(f'Telemetry sink flush failed ({len(self._buffer)} buffered): {e}')
+
+            if self._dropped:
+                logger.warning(f'Telemetry sink buffer overflow, dropped {self._dropped} samples')
+                self._dropped = 0
+
+
+def _partition_name(day: date) -> str:
+    return f'{TABLE}_{day:%Y%m%d}'
+
+
+def _partition_day(name: str) -> date | None:
+    try:
+        return datetime.strptime(name.removeprefix(f'{TABLE}_'), '%Y%m%d').date()
+    except ValueError:
+        return None
@@ -0,0 +1,435 @@
+import math
+import time
+
+import numpy as np
+
+from app.core.dto.container import ClusterResource
+from app.core.dto.telemetry import HISTORY_SERIES, TelemetryHistory, TelemetrySample
+from app.domain.providers.telemetry import TelemetryProvider, TelemetrySubscription
+
+from .aggregate import bucket_stats, counter_rates
+from .hub import TelemetryHub
+from .retention import (
+    AVG,
+    MAX,
+    TIER_COUNTERS,
+    TIER_GAUGES,
+    TIER_INDEX,
+    TIER_METRICS,
+    Tier,
+    rollup_raw,
+    rollup_tier,
+)
+
+METRICS = ('cpu', 'maxcpu', 'mem', 'maxmem', 'disk', 'maxdisk', 'netin', 'netout', 'diskread', 'diskwrite')
+METRIC_INDEX = {metric: i for i, metric in enumerate(METRICS)}
+COUNTERS = ('netin', 'netout', 'diskread', 'diskwrite')
+
+
+class TelemetryStore(TelemetryProvider):
+    """
+    Кольцевые буферы метрик контейнеров в памяти.
+
+    Все контейнеры опрашиваются одним запросом, поэтому замеры лежат в одной
+    матрице values[slot, column, metric] с общей осью времени times[column]
+    и общей головой: запись тика - одно присваивание по всем контейнерам.
+    У каждого vmid свой slot; пропуски (контейнера еще/уже не было) - NaN.
+    Слот пропавшего vmid освобождается не сразу, а после slot_grace тиков
+    подряд без него: сбой опроса ноды не стирает историю контейнера.
+
+    Закрытые шаги сворачиваются в уровни агрегатов (по умолчанию 5 минут и
+    1 час), из которых отвечает history для окон длиннее сырого буфера.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        interval: float,
+        stale_after: float,
+        tiers: list[tuple[int, int]],
+        slot_grace: int = 0
+    ):
+        self._capacity = capacity
+        self._interval = interval
+        self._stale_after = stale_after
+        self._times = np.full(capacity, np.nan)
+        self._values = np.full((0, capacity, len(METRICS)), np.nan)
+        self._slots: dict[int, int] = {}
+        self._free_slots: list[int] = []
+        # Сколько тиков подряд vmid не было в снимке; слот освобождается после slot_grace
+        self._slot_grace = slot_grace
+        self._missed: dict[int, int] = {}
+        self._resources: dict[int, ClusterResource] = {}
+        self._head = -1
+        self._count = 0
+        self._hub = TelemetryHub()
+        self._tiers = [Tier(step, retention) for step, retention in sorted(tiers)]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _allocate_slot(self, vmid: int) -> int:
+        slot = self._slots.get(vmid)
+        if slot is not None:
+            return slot
+
+        if self._free_slots:
+            slot = self._free_slots.pop()
+        else:
+            slot = len(self._slots)
+            if slot >= self._values.shape[0]:
+                grown = np.full((max(16, slot * 2), self._capacity, len(METRICS)), np.nan)
+                grown[:slot] = self._values
+                self._values = grown
+                for tier in self._tiers:
+                    tier.resize(len(grown))
+        self._slots[vmid] = slot
+        return slot
+
+    def ingest(self, timestamp: float, resources: dict[int, ClusterResource]) -> None:
+        """Записывает снимок /cluster/resources как очередной тик"""
+        rows = np.array(
+            [[getattr(resource, metric) for metric in METRICS] for resource in resources.values()],
+            dtype=np.float64
+        ).reshape(len(resources), len(METRICS))
+        self._write_tick(timestamp, list(resources), rows)
+        self._resources = resources
+
+        if self._hub.watched:
+            self._hub.publish(self)
+
+    def _write_tick(self, timestamp: float, vmids: list[int], rows: np.ndarray) -> None:
+        present = set(vmids)
+        for vmid in self._missed.keys() & present:
+            del self._missed[vmid]
+        for vmid in self._slots.keys() - present:
+            missed = self._missed[vmid] = self._missed.get(vmid, 0) + 1
+            if missed <= self._slot_grace:
+                continue
+            del self._missed[vmid]
+            slot = self._slots.pop(vmid)
+            self._values[slot] = np.nan
+            for tier in self._tiers:
+                tier.clear_slot(slot)
+            self._free_slots.append(slot)
+
+        slots = np.fromiter((self._allocate_slot(vmid) for vmid in vmids), dtype=np.intp, count=len(vmids))
+
+        self._head = (self._head + 1) % self._capacity
+        self._count = min(self._count + 1, self._capacity)
+        self._times[self._head] = timestamp
+        self._values[:, self._head] = np.nan
+        self._values[slots, self._head] = rows
+        self._roll_up(timestamp)
+
+    def export(self, count: int) -> dict[int, tuple[np.ndarray, np.ndarray]]:
+        """Последние count замеров каждого контейнера: vmid -> (times[n], values[n, metric]) без пропусков"""
+        columns = self._columns(min(count, self._count))
+        times = self._times[columns]
+        series = {}
+        for vmid, slot in self._slots.items():
+            values = self._values[slot, columns]
+            present = ~np.isnan(values[:, 0])
+            if present.any():
+                series[vmid] = times[present], values[present]
+        return series
+
+    def snapshot(self, metrics: list[str], since: float = -np.inf) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Замеры метрик metrics всех слотов начиная с since: vmids[slot]
+        (-1 - свободный слот), times[column], values[slot, column, metric]
+        """
+        used = len(self._slots) + len(self._free_slots)
+        vmids = self._slot_vmids(used)
+
+        columns = self._columns(self._count)
+        skip = int(np.count_nonzero(self._times[columns] < since))
+        # Колонки кольца - не больше двух непрерывных кусков: срезы вместо
+        # fancy-индексации по двум осям, это в разы быстрее на тысячах слотов
+        first, last = (self._head - self._count + 1 + skip) % self._capacity, self._head + 1
+        if skip == self._count:
+            pieces = [slice(0, 0)]
+        elif first < last:
+            pieces = [slice(first, last)]
+        else:
+            pieces = [slice(first, self._capacity), slice(0, last)]
+
+        indexes = [METRIC_INDEX[metric] for metric in metrics]
+        values = np.concatenate([self._values[:used, piece][..., indexes] for piece in pieces], axis=1)
+        times = np.concatenate([self._times[piece] for piece in pieces])
+        return vmids, times, values
+
+    def _slot_vmids(self, used: int) -> np.ndarray:
+        vmids = np.full(used, -1)
+        for vmid, slot in self._slots.items():
+            vmids[slot] = vmid
+        return vmids
+
+    def top(self, metric: str, n: int) -> list[tuple[TelemetrySample, float]]:
+        """
+        n контейнеров с наибольшим значением metric в последнем тике:
+        cpu - доля ядер, mem/disk - доля занятого, netin/netout - байт/с
+        """
+        if not self.is_fresh:
+            return []
+
+        used = len(self._slots) + len(self._free_slots)
+        current = self._values[:used, self._head]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            if metric in COUNTERS:
+                if self._count < 2:
+                    return []
+                previous_column = self._columns(2)[0]
+                elapsed = self._times[self._head] - self._times[previous_column]
+                scores = (current[:, METRIC_INDEX[metric]] - self._values[:used, previous_column, METRIC_INDEX[metric]]) / elapsed
+                scores[scores < 0] = np.nan
+            elif metric == 'cpu':
+                scores = current[:, METRIC_INDEX['cpu']].copy()
+            else:
+                scores = current[:, METRIC_INDEX[metric]] / current[:, METRIC_INDEX[f'max{metric}']]
+
+        candidates = np.flatnonzero(~np.isnan(scores))
+        n = min(n, len(candidates))
+        if not n:
+            return []
+
+        # Частичный отбор O(slots) вместо полной сортировки, сортируются только n лучших
+        best = candidates[np.argpartition(-scores[candidates], n - 1)[:n]]
+        best = best[np.argsort(-scores[best], kind='stable')]
+
+        vmids = self._slot_vmids(used)
+        result = []
+        for slot in best:
+            sample = self.latest(int(vmids[slot]))
+            if sample is not None:
+                result.append((sample, float(scores[slot])))
+        return result
+
+    def replay(self, series: dict[int, tuple[np.ndarray, np.ndarray]]) -> None:
+        """
+        Прогоняет сохраненные замеры (формат export) через буфер и уровни
+        как обычные тики - для прогрева после рестарта
+        """
+        if not series:
+            return
+        vmids = np.concatenate([np.full(len(times), vmid) for vmid, (times, _) in series.items()])
+        times = np.concatenate([times for times, _ in series.values()])
+        values = np.concatenate([values for _, values in series.values()])
+
+        order = np.argsort(times, kind='stable')
+        vmids, times, values = vmids[order], times[order], values[order]
+        ticks, starts = np.unique(times, return_index=True)
+        for timestamp, start, end in zip(ticks, starts, np.append(starts[1:], len(times)), strict=True):
+            self._write_tick(float(timestamp), vmids[start:end].tolist(), values[start:end])
+
+    def subscribe(self, vmids: set[int]) -> TelemetrySubscription:
+        """Подписка на замеры vmids; новые приходят с каждым тиком сборщика"""
+        return self._hub.subscribe(vmids)
+
+    def _columns(self, count: int) -> np.ndarray:
+        """Индексы последних count колонок, от старых к новым"""
+        return (self._head - np.arange(count - 1, -1, -1)) % self._capacity
+
+    @property
+    def resources(self) -> dict[int, ClusterResource]:
+        """Снимок /cluster/resources последнего тика"""
+        return self._resources
+
+    @property
+    def last_tick(self) -> float | None:
+        return float(self._times[self._head]) if self._count else None
+
+    @property
+    def is_fresh(self) -> bool:
+        return self._count > 0 and time.time() - self._times[self._head] <= self._stale_after
+
+    def latest(self, vmid: int) -> TelemetrySample | None:
+        return self.latest_many([vmid]).get(vmid)
+
+    def latest_many(self, vmids: list[int]) -> dict[int, TelemetrySample]:
+        if not self.is_fresh:
+            return {}
+        # Слот восстановлен из архива, живого замера еще не было - пропускаем
+        vmids = [vmid for vmid in vmids if vmid in self._slots and vmid in self._resources]
+        if not vmids:
+            return {}
+        slots = np.array([self._slots[vmid] for vmid in vmids])
+        counters = [METRIC_INDEX[metric] for metric in COUNTERS]
+
+        rates = np.zeros((len(vmids), len(COUNTERS)))
+        if self._count > 1:
+            previous_column, head = self._columns(2)
+            elapsed = self._times[head] - self._times[previous_column]
+            current = self._values[slots, head][:, counters]
+            delta = current - self._values[slots, previous_column][:, counters]
+            if elapsed > 0:
+                # Счетчик уменьшился или uptime короче интервала - контейнер перезапущен,
+                # и счет идет с нуля от старта; NaN - прошлого замера не было
+                uptime = np.array([self._resources[vmid].uptime for vmid in vmids], dtype=np.float64)
+                since_start = np.where((uptime > 0) & (uptime < elapsed), uptime, elapsed)[:, None]
+                restarted = (delta < 0) | (since_start < elapsed)
+                rates = np.where(restarted, current / since_start, np.where(delta > 0, delta / elapsed, 0.0))
+                rates = np.nan_to_num(rates, nan=0.0)
+
+        timestamp = float(self._times[self._head])
+        samples = {}
+        for vmid, row in zip(vmids, rates.tolist(), strict=True):
+            resource = self._resources[vmid]
+            netin_rate, netout_rate, diskread_rate, diskwrite_rate = row
+            samples[vmid] = TelemetrySample(
+                vmid=vmid,
+                node=resource.node,
+                name=resource.name,
+                status=resource.status,
+                time=timestamp,
+                cpu=resource.cpu,
+                cpus=resource.maxcpu,
+                mem=resource.mem,
+                maxmem=resource.maxmem,
+                disk=resource.disk,
+                maxdisk=resource.maxdisk,
+                netin=resource.netin,
+                netout=resource.netout,
+                diskread=resource.diskread,
+                diskwrite=resource.diskwrite,
+                netin_rate=netin_rate,
+                netout_rate=netout_rate,
+                diskread_rate=diskread_rate,
+                diskwrite_rate=diskwrite_rate
+            )
+        return samples
+
+    def history(self, vmid: int, window: int, step: int) -> TelemetryHistory | None:
+        slot = self._slots.get(vmid)
+        if slot is None:
+            return None
+
+        buckets = math.ceil(window / step)
+        end = math.ceil(time.time() / step) * step
+        start = end - buckets * step
+
+        raw_times, raw_series = self._raw_series(slot, start)
+        tier = self._pick_tier(start, step)
+        if tier is None:
+            stats = bucket_stats(raw_times, raw_series, start, step, buckets)
+        else:
+            # Уровень - до начала сырых замеров, дальше (и в незакрытом шаге уровня) - сырые
+            cutoff = tier.open_bucket if tier.open_bucket is not None else end
+            if self._count:
+                cutoff = min(cutoff, math.ceil(self._times[self._columns(self._count)[0]] / tier.step) * tier.step)
+            times, values = tier.window(slot, start - tier.step, cutoff)
+            raw = raw_times >= cutoff
+            times, averages, peaks = _resample(times, values, tier.step, step)
+            times = np.concatenate((times, raw_times[raw]))
+            stats = bucket_stats(times, np.concatenate((averages, raw_series[raw])), start, step, buckets)
+            # Максимум берем из максимумов уровня, а не из средних
+            stats[..., 1] = bucket_stats(times, np.concatenate((peaks, raw_series[raw])), start, step, buckets)[..., 1]
+
+        return TelemetryHistory(
+            time=start + np.arange(buckets) * step,
+            step=step,
+            stats={name: stats[:, i] for i, name in enumerate(HISTORY_SERIES)}
+        )
+
+    def _pick_tier(self, start: float, step: int) -> Tier | None:
+        """
+        Сырые замеры, если они покрывают окно (с точностью до интервала опроса);
+        иначе самый крупный уровень с шагом не больше запрошенного (или самый
+        мелкий, если такого нет)
+        """
+        if not self._count or self._times[self._columns(self._count)[0]] <= start + self._interval:
+            return None
+
+        filled = [tier for tier in self._tiers if tier.count]
+        if not filled:
+            return None
+        fitting = [tier for tier in filled if tier.step <= step]
+        return fitting[-1] if fitting else filled[0]
+
+    def _raw_series(self, slot: int, start: float) -> tuple[np.ndarray, np.ndarray]:
+        columns = self._columns(self._count)
+        times = self._times[columns]
+        # Берем на один замер больше окна, чтобы посчитать скорость первого
+        first = max(int(np.searchsorted(times, start)) - 1, 0)
+        times = times[first:]
+        values = self._values[slot, columns[first:]]
+
+        rates = counter_rates(times, values[:, [METRIC_INDEX[metric] for metric in COUNTERS]])
+        series = np.column_stack((
+            values[:, METRIC_INDEX['cpu']],
+            values[:, METRIC_INDEX['mem']],
+            values[:, METRIC_INDEX['disk']],
+            rates[:, 0],
+            rates[:, 1],
+            rates[:, 2] + rates[:, 3]
+        ))
+        return times, series
+
+    def _roll_up(self, timestamp: float) -> None:
+        """Закрывает набравшиеся шаги уровней: raw -> первый уровень -> следующий"""
+        for i, tier in enumerate(self._tiers):
+            bucket = timestamp // tier.step * tier.step
+            if tier.open_bucket is None:
+                tier.open_bucket = bucket
+                continue
+            if bucket <= tier.open_bucket:
+                continue
+
+            start, end = tier.open_bucket, tier.open_bucket + tier.step
+            if i == 0:
+                aggregates = self._rollup_raw(start, end)
+            else:
+                source = self._tiers[i - 1]
+                columns = source.columns()
+                times = source.times[columns]
+                aggregates = rollup_tier(source.values[:, columns[(times >= start) & (times < end)]])
+
+            tier.append(start, aggregates)
+            tier.evict(timestamp)
+            tier.open_bucket = bucket
+
+    def _rollup_raw(self, start: float, end: float) -> np.ndarray:
+        columns = self._columns(self._count)
+        times = self._times[columns]
+        inside = np.flatnonzero((times >= start) & (times < end))
+        if not len(inside):
+            return np.full((self._values.shape[0], len(TIER_METRICS), 3), np.nan)
+
+        selected = slice(max(inside[0] - 1, 0), inside[-1] + 1)
+        block = self._values[:, columns[selected]]
+        return rollup_raw(
+            times[selected],
+            block[..., [METRIC_INDEX[metric] for metric in TIER_GAUGES]],
+            block[..., [METRIC_INDEX[metric] for metric in TIER_COUNTERS]],
+            start
+        )
+
+
+def _resample(
+    times: np.ndarray,
+    values: np.ndarray,
+    tier_step: int,
+    step: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Колонки уровня -> times и серии avg/max с шагом не крупнее step:
+    агрегат шага уровня повторяется на каждом шаге ответа внутри него
+    """
+    averages, peaks = _tier_series(values[..., AVG]), _tier_series(values[..., MAX])
+    if step >= tier_step:
+        return times, averages, peaks
+    offsets = np.arange(0, tier_step, step)
+    times = (times[:, None] + offsets).ravel()
+    return times, np.repeat(averages, len(offsets), axis=0), np.repeat(peaks, len(offsets), axis=0)
+
+
+def _tier_series(values: np.ndarray) -> np.ndarray:
+    """Агрегаты уровня [column, metric] -> серии HISTORY_SERIES"""
+    return np.column_stack((
+        values[:, TIER_INDEX['cpu']],
+        values[:, TIER_INDEX['mem']],
+        values[:, TIER_INDEX['disk']],
+        values[:, TIER_INDEX['netin']],
+        values[:, TIER_INDEX['netout']],
+        values[:, TIER_INDEX['diskread']] + values[:, TIER_INDEX['diskwrite']]
+    ))
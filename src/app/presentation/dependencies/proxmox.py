@@ -1,31 +1,48 @@
-from contextlib import asynccontextmanager
-from typing import Annotated, AsyncContextManager, AsyncIterator
+from typing import Annotated
 
 from fastapi import Depends
 
 from app.domain.models.user import UserInDB
 from app.domain.providers.container import ContainerAPIProvider
+from app.domain.providers.telemetry import TelemetryProvider
 from app.domain.services.container import ContainerService
+from app.domain.services.owner_index import OwnerIndex
+from app.domain.services.placement import PlacementEngine
 from app.domain.uow.abstract import AbstractUnitOfWork
 from app.infra.database.uow import get_uow
-from app.infra.proxmox import create_provider
+from app.infra.proxmox import get_placement, get_provider
+from app.infra.telemetry import get_exporter, get_owner_index, get_telemetry
+from app.infra.telemetry.exporter import PrometheusExporter
 from app.infra.proxmox.proxmox_provider import ProxmoxProvider
 from app.presentation.dependencies.auth.jwt import get_current_user
 
 
-@asynccontextmanager
-async def get_proxmox_provider() -> AsyncIterator[ProxmoxProvider]:
-    provider = create_provider()
-    try:
-        await provider._ensure_session()
-        yield provider
-    finally:
-        await provider.close()
+def get_proxmox_provider() -> ProxmoxProvider:
+    return get_provider()
+
+
+def get_placement_engine() -> PlacementEngine:
+    return get_placement()
+
+
+def get_telemetry_provider() -> TelemetryProvider:
+    return get_telemetry()
+
+
+def get_prometheus_exporter() -> PrometheusExporter:
+    return get_exporter()
+
+
+def get_owners() -> OwnerIndex:
+    return get_owner_index()
 
 
 def get_container_service(
     user: Annotated[UserInDB, Depends(get_current_user)],
     uow: Annotated[AbstractUnitOfWork, Depends(get_uow)],
-    proxmox_provider: Annotated[AsyncContextManager[ContainerAPIProvider], Depends(get_proxmox_provider)]
+    proxmox_provider: Annotated[ContainerAPIProvider, Depends(get_proxmox_provider)],
+    placement: Annotated[PlacementEngine, Depends(get_placement_engine)],
+    telemetry: Annotated[TelemetryProvider, Depends(get_telemetry_provider)],
+    owners: Annotated[OwnerIndex, Depends(get_owners)]
 ):
-    return ContainerService(uow, proxmox_provider, user)
+    return ContainerService(uow, proxmox_provider, user, placement, telemetry, owners)
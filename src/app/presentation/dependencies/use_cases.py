@@ -7,9 +7,12 @@ from app.core.security.jwt import JWTService, get_jwt_service
 from app.domain.models.user import UserInDB
 from app.domain.schemas.auth import LogIn, SignUp
 from app.domain.services.user import UserService
+from app.domain.uow.abstract import AbstractUnitOfWork
+from app.infra.database.uow import get_uow
 from app.presentation.dependencies.auth.jwt import get_current_user
 from app.presentation.use_cases.auth_user import LoginUserUseCase, RegisterUserUseCase
 from app.presentation.use_cases.profile_user import ProfileUserUseCase
+from app.presentation.use_cases.usage_user import UsageUserUseCase
 
 from .services import get_user_service
 
@@ -40,6 +43,13 @@ def get_oauth_use_case(
     return LoginUserUseCase(user_service, jwt_service, login_request)
 
 def get_profile_user_use_case(
-    user: Annotated[UserInDB, Depends(get_current_user)]
+    user: Annotated[UserInDB, Depends(get_current_user)],
+    uow: Annotated[AbstractUnitOfWork, Depends(get_uow)]
 ) -> ProfileUserUseCase:
-    return ProfileUserUseCase(user)
+    return ProfileUserUseCase(user, uow)
+
+def get_usage_user_use_case(
+    user: Annotated[UserInDB, Depends(get_current_user)],
+    uow: Annotated[AbstractUnitOfWork, Depends(get_uow)]
+) -> UsageUserUseCase:
+    return UsageUserUseCase(user, uow)
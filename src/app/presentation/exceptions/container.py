@@ -5,7 +5,32 @@ TicketContainerClosed = HTTPException(
     detail="Ticket container already closed"
 )
 
+TicketContainerNotFound = HTTPException(
+    status_code=status.HTTP_404_NOT_FOUND,
+    detail="Ticket container not found"
+)
+
 ContainerNotFound = HTTPException(
     status_code=status.HTTP_404_NOT_FOUND,
     detail="Container not found"
 )
+
+VmidPoolExhausted = HTTPException(
+    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+    detail="No free VMID left for a new container"
+)
+
+IpPoolExhausted = HTTPException(
+    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+    detail="No free IP address left for a new container"
+)
+
+NoNodeAvailable = HTTPException(
+    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+    detail="No node has enough free resources for a new container"
+)
+
+TelemetryWindowTooLarge = HTTPException(
+    status_code=status.HTTP_400_BAD_REQUEST,
+    detail="Too many points requested, increase step or decrease window"
+)
@@ -7,6 +7,8 @@ from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 
+from app.core.exceptions import ProxmoxUnavailable
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
@@ -62,6 +64,29 @@ def setup_exception_handlers(app: FastAPI) -> None:
             },
         )
 
+    @app.exception_handler(ProxmoxUnavailable)
+    async def proxmox_unavailable_handler(
+        request: Request, exc: ProxmoxUnavailable
+    ) -> JSONResponse:
+        logger.error(
+            "Proxmox unavailable",
+            extra={
+                "path": request.url.path,
+                "method": request.method,
+                "node": exc.node,
+                "error": str(exc),
+            },
+        )
+
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={"Retry-After": "30"},
+            content={
+                "message": "Proxmox is temporarily unavailable",
+                "debug": debug_response(request, exc) if app.debug else None,
+            },
+        )
+
     @app.exception_handler(Exception)
     async def unexpected_exception_handler(
         request: Request, exc: Exception
@@ -0,0 +1,6 @@
+from fastapi import HTTPException, status
+
+MetricsDisabled = HTTPException(
+    status_code=status.HTTP_404_NOT_FOUND,
+    detail="Not Found"
+)
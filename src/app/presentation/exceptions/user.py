@@ -0,0 +1,6 @@
+from fastapi import HTTPException, status
+
+UsagePeriodInvalid = HTTPException(
+    status_code=status.HTTP_400_BAD_REQUEST,
+    detail="Usage period must be non-empty and at most one year long"
+)
@@ -1,18 +1,23 @@
 from app.domain.models.user import UserInDB
 from app.domain.schemas.user import UserProfile
+from app.domain.uow.abstract import AbstractUnitOfWork
 
 
 class ProfileUserUseCase:
-    def __init__(self, user: UserInDB):
+    def __init__(self, user: UserInDB, uow: AbstractUnitOfWork):
         self.user = user
+        self.uow = uow
 
     async def __call__(self) -> UserProfile:
+        async with self.uow:
+            total_containers = await self.uow.container_repo.count_by_owner(self.user.id)
+
         return UserProfile(
             username=self.user.username,
             email=self.user.email,
             full_name=self.user.full_name,
             registration_date=self.user.created_at, # type: ignore
-            total_containers=0,
+            total_containers=total_containers,
             is_superuser=self.user.is_superuser,
             tg_passcode=self.user.id.__str__() if not self.user.telegram_id else None
         )
@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta, timezone
+
+from app.domain.models.user import UserInDB
+from app.domain.schemas.user import UsageHour, UserUsage
+from app.domain.uow.abstract import AbstractUnitOfWork
+from app.presentation.exceptions.user import UsagePeriodInvalid
+
+# Самый длинный период одного запроса: почасовых строк не больше ~9 тыс.
+MAX_USAGE_PERIOD = timedelta(days=366)
+
+
+class UsageUserUseCase:
+    def __init__(self, user: UserInDB, uow: AbstractUnitOfWork):
+        self.user = user
+        self.uow = uow
+
+    async def __call__(self, start: datetime, end: datetime) -> UserUsage:
+        start, end = _as_utc(start), _as_utc(end)
+        if end <= start or end - start > MAX_USAGE_PERIOD:
+            raise UsagePeriodInvalid
+
+        async with self.uow:
+            records = await self.uow.usage_repo.get_by_owner(self.user.id, start, end)
+
+        hours = [
+            UsageHour(
+                hour=record.hour,
+                cpu_seconds=record.cpu_seconds,
+                ram_gb_hours=record.ram_gb_hours,
+                disk_gb_hours=record.disk_gb_hours,
+                net_in_bytes=record.net_in_bytes,
+                net_out_bytes=record.net_out_bytes
+            )
+            for record in records
+        ]
+        return UserUsage(
+            start=start,
+            end=end,
+            hours=hours,
+            cpu_seconds=sum(hour.cpu_seconds for hour in hours),
+            ram_gb_hours=sum(hour.ram_gb_hours for hour in hours),
+            disk_gb_hours=sum(hour.disk_gb_hours for hour in hours),
+            net_in_bytes=sum(hour.net_in_bytes for hour in hours),
+            net_out_bytes=sum(hour.net_out_bytes for hour in hours)
+        )
+
+
+def _as_utc(moment: datetime) -> datetime:
+    # Время без зоны из query считаем UTC, как и часы в usages
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc)
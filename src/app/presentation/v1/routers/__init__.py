@@ -4,6 +4,7 @@ from fastapi import APIRouter, FastAPI
 def setup_routers(app: FastAPI) -> None:
     from .bot_routers import setup_bot_routers
     from .container_routers import setup_container_routers
+    from .metrics_routers import setup_metrics_routers
     from .user_routers import setup_user_routers
 
     router = APIRouter(prefix='/api/v1')
@@ -12,3 +13,5 @@ def setup_routers(app: FastAPI) -> None:
     setup_bot_routers(router)
 
     app.include_router(router)
+    # Prometheus ждет /metrics в корне, без префикса API
+    setup_metrics_routers(app)
@@ -1,14 +1,20 @@
-from typing import Annotated
+from typing import Annotated, AsyncIterator, Literal
 from uuid import UUID, uuid4
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import StreamingResponse
+
+from app.config import create_settings
 
 from app.domain.models.ticket_container import TicketContainerInDB
 from app.domain.schemas.container.request import CreateContainer
 from app.domain.schemas.container.response import (
+    CapacityForecastInfo,
     ContainerAdminInfo,
     ContainerInfo,
     ContainerTelemetry,
+    ContainerTelemetryHistory,
+    ContainerTopInfo,
     CreateTicket,
 )
 from app.domain.services.container import ContainerService
@@ -121,6 +127,63 @@ def get_proxmox_router() -> APIRouter: # noqa: C901
     async def get_container_telemetry(vmid: int, container_service: Annotated[ContainerService, Depends(get_container_service)]) -> ContainerTelemetry | None:
         return await container_service.get_telemetry_container(vmid)
 
+    @router.get(
+        '/container/telemetry',
+        status_code=status.HTTP_200_OK,
+        summary="Get telemetry of several containers",
+        description="Telemetry of the given containers (all own containers by default) in one request."
+    )
+    async def get_containers_telemetry(
+        container_service: Annotated[ContainerService, Depends(get_container_service)],
+        vmids: Annotated[list[int] | None, Query(description="Container VMIDs")] = None
+    ) -> list[ContainerTelemetry]:
+        return await container_service.get_telemetry_containers(vmids)
+
+    @router.get(
+        '/container/telemetry/stream',
+        status_code=status.HTTP_200_OK,
+        summary="Stream Container Telemetry",
+        description="Server-Sent Events with telemetry of the given containers (all own containers by default).",
+        response_class=StreamingResponse
+    )
+    async def stream_container_telemetry(
+        container_service: Annotated[ContainerService, Depends(get_container_service)],
+        vmids: Annotated[list[int] | None, Query(description="Container VMIDs")] = None
+    ) -> StreamingResponse:
+        keepalive = create_settings().telemetry_settings.STREAM_KEEPALIVE
+        telemetry = await container_service.stream_telemetry(vmids, keepalive)
+
+        async def events() -> AsyncIterator[str]:
+            # При обрыве соединения генератор отменяется, подписка закрывается в aclose
+            try:
+                async for item in telemetry:
+                    if item is None:
+                        yield ': keep-alive\n\n'
+                    else:
+                        yield f'event: telemetry\ndata: {item.model_dump_json()}\n\n'
+            finally:
+                await telemetry.aclose()
+
+        return StreamingResponse(
+            events(),
+            media_type='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+
+    @router.get(
+        '/container/telemetry/{vmid:int}/history',
+        status_code=status.HTTP_200_OK,
+        summary="Get Container Telemetry History",
+        description="Min/max/mean/p95 of container metrics per step over the last window seconds."
+    )
+    async def get_container_telemetry_history(
+        vmid: int,
+        container_service: Annotated[ContainerService, Depends(get_container_service)],
+        window: Annotated[int, Query(ge=60, le=31 * 24 * 3600, description="Window in seconds")] = 3600,
+        step: Annotated[int, Query(ge=5, description="Step in seconds")] = 60
+    ) -> ContainerTelemetryHistory:
+        return await container_service.get_telemetry_history(vmid, window, step)
+
     @router.get(
         '/container/all',
         status_code=status.HTTP_200_OK,
@@ -130,6 +193,30 @@ def get_proxmox_router() -> APIRouter: # noqa: C901
     async def all_info_contaners(container_service: Annotated[ContainerService, Depends(get_container_service)]) -> list[ContainerAdminInfo]:
         return await container_service.get_all_info_containers()
 
+    @router.get(
+        '/container/top',
+        status_code=status.HTTP_200_OK,
+        summary='Top containers by load',
+        description='Only for admins. Ranks the latest telemetry snapshot by metric.'
+    )
+    async def top_containers(
+        container_service: Annotated[ContainerService, Depends(get_container_service)],
+        metric: Annotated[Literal['cpu', 'mem', 'disk', 'netin', 'netout'], Query()] = 'cpu',
+        n: Annotated[int, Query(ge=1, le=500)] = 10
+    ) -> list[ContainerTopInfo]:
+        return await container_service.get_top_containers(metric, n)
+
+    @router.get(
+        '/capacity/forecast',
+        status_code=status.HTTP_200_OK,
+        summary='Capacity forecast',
+        description='Only for admins. Projected exhaustion of RAM, storage and container slots per node.'
+    )
+    async def capacity_forecast(
+        container_service: Annotated[ContainerService, Depends(get_container_service)]
+    ) -> list[CapacityForecastInfo]:
+        return await container_service.get_capacity_forecast()
+
     '''@router.get(
         '/node/info',
         status_code=status.HTTP_200_OK,
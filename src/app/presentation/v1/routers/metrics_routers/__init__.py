@@ -0,0 +1,7 @@
+from fastapi import FastAPI
+
+from .metrics_router import get_metrics_router
+
+
+def setup_metrics_routers(app: FastAPI) -> None:
+    app.include_router(get_metrics_router())
@@ -0,0 +1,45 @@
+import secrets
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Header, Response, status
+
+from app.config import create_settings
+from app.domain.services.owner_index import OwnerIndex
+from app.infra.telemetry.exporter import CONTENT_TYPE, PrometheusExporter
+from app.presentation.dependencies.proxmox import get_owners, get_prometheus_exporter
+from app.presentation.exceptions.auth import CredentialsException
+from app.presentation.exceptions.metrics import MetricsDisabled
+
+
+def get_metrics_router() -> APIRouter:
+
+    router = APIRouter(tags=['Metrics'])
+    settings = create_settings().telemetry_settings
+    token = settings.METRICS_TOKEN
+    owner_label = settings.METRICS_OWNER_LABEL
+
+    @router.get(
+        '/metrics',
+        status_code=status.HTTP_200_OK,
+        summary='Prometheus metrics',
+        description='Latest collector tick in Prometheus text format. Never calls Proxmox.',
+        response_class=Response
+    )
+    async def metrics(
+        exporter: Annotated[PrometheusExporter, Depends(get_prometheus_exporter)],
+        owners: Annotated[OwnerIndex, Depends(get_owners)],
+        authorization: Annotated[str, Header()] = ''
+    ) -> Response:
+        # Без токена эндпоинт выключен: серии раскрывают имена и ноды контейнеров
+        if not token:
+            raise MetricsDisabled
+        if not secrets.compare_digest(authorization, f'Bearer {token}'):
+            raise CredentialsException
+        if not owner_label:
+            return Response(exporter.render(), media_type=CONTENT_TYPE)
+        return Response(
+            exporter.render(await owners.get(), owners.version),
+            media_type=CONTENT_TYPE
+        )
+
+    return router
@@ -1,10 +1,15 @@
+from datetime import datetime
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
 
-from app.domain.schemas.user import UserProfile
+from app.domain.schemas.user import UserProfile, UserUsage
 from app.domain.use_cases.info_user import ProfileUserUseCase
-from app.presentation.dependencies.use_cases import get_profile_user_use_case
+from app.domain.use_cases.usage_user import UsageUserUseCase
+from app.presentation.dependencies.use_cases import (
+    get_profile_user_use_case,
+    get_usage_user_use_case,
+)
 
 
 def get_user_router() -> APIRouter:
@@ -15,4 +20,17 @@ def get_user_router() -> APIRouter:
     async def profile_handler(use_case: Annotated[ProfileUserUseCase, Depends(get_profile_user_use_case)]) -> UserProfile:
         return await use_case()
 
+    @router.get(
+        '/usage',
+        status_code=status.HTTP_200_OK,
+        summary="Get resource usage",
+        description="Hourly usage of all own containers in [from, to) and totals for the period."
+    )
+    async def usage_handler(
+        use_case: Annotated[UsageUserUseCase, Depends(get_usage_user_use_case)],
+        start: Annotated[datetime, Query(alias='from', description="Period start, UTC if no timezone")],
+        end: Annotated[datetime, Query(alias='to', description="Period end (exclusive), UTC if no timezone")]
+    ) -> UserUsage:
+        return await use_case(start, end)
+
     return router
@@ -0,0 +1,57 @@
+import asyncio
+
+from app.core.dto.node import NodeCapacity
+from app.infra.telemetry.forecast import CapacityForecaster
+from app.infra.telemetry.store import TelemetryStore
+
+TB = 10 ** 12
+
+
+class FakePlacement:
+    storage = 'local-lvm'
+
+    def __init__(self) -> None:
+        self.storage_free = TB // 2
+
+    async def get_capacities(self) -> list[NodeCapacity]:
+        return [NodeCapacity(
+            node='pve', cpu=0.1, cpus=8, mem_total=64 * 2 ** 30, mem_free=32 * 2 ** 30,
+            storage_total=TB, storage_free=self.storage_free
+        )]
+
+
+def _forecaster(placement: FakePlacement) -> CapacityForecaster:
+    store = TelemetryStore(720, 5, 30, [])
+    return CapacityForecaster(placement, store, None, 600, 100, 2)  # type: ignore
+
+
+def test_tiny_growth_has_no_exhaustion_date():
+    placement = FakePlacement()
+    forecaster = _forecaster(placement)
+
+    async def sample() -> None:
+        # Диск растет на 1 байт за замер: исчерпание за пределами datetime
+        for i in range(5):
+            placement.storage_free = TB // 2 - i
+            await forecaster.sample(1_700_000_000 + i)
+
+    asyncio.run(sample())
+    disk = next(item for item in forecaster.forecast() if item.resource == 'disk')
+    assert disk.growth_per_day > 0
+    assert disk.exhausted_at is None
+
+
+def test_linear_growth_predicts_exhaustion():
+    placement = FakePlacement()
+    forecaster = _forecaster(placement)
+
+    async def sample() -> None:
+        for i in range(5):
+            placement.storage_free = TB // 2 - i * 10 ** 9
+            await forecaster.sample(1_700_000_000 + i * 3_600)
+
+    asyncio.run(sample())
+    disk = next(item for item in forecaster.forecast() if item.resource == 'disk')
+    assert disk.exhausted_at is not None
+    # Осталось ~496 ГБ при росте 1 ГБ/ч
+    assert abs(disk.exhausted_at.timestamp() - (1_700_000_000 + 4 * 3_600 + 496 * 3_600)) < 60
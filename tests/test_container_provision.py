@@ -0,0 +1,147 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+from uuid import uuid4
+
+import pytest
+
+from app.core.dto.container import CreatedContainer
+from app.core.dto.network import IpLease
+from app.core.dto.task import TaskStatus
+from app.core.exceptions import ProxmoxTaskError, ProxmoxUnavailable
+from app.domain.models.user import UserInDB
+from app.domain.schemas.container.request import CreateContainer
+from app.domain.services.container import ContainerService
+
+
+class FakeVmidRepo:
+    def __init__(self) -> None:
+        self.released: list[int] = []
+
+    async def allocate(self) -> int:
+        return 105
+
+    async def release(self, vmid: int) -> None:
+        self.released.append(vmid)
+
+
+class FakeIpPoolRepo:
+    def __init__(self) -> None:
+        self.released: list[str] = []
+
+    async def allocate(self, bridge: str) -> IpLease:
+        return IpLease(bridge=bridge, address='10.0.0.5/24', gateway='10.0.0.1')
+
+    async def release(self, address: str) -> None:
+        self.released.append(address)
+
+
+class FakeContainerRepo:
+    def __init__(self, fail: bool = False) -> None:
+        self.fail = fail
+        self.added: list[Any] = []
+
+    async def add(self, container: Any) -> None:
+        if self.fail:
+            raise RuntimeError('database is down')
+        self.added.append(container)
+
+
+class FakeUow:
+    def __init__(self, fail_insert: bool = False) -> None:
+        self.vmid_repo = FakeVmidRepo()
+        self.ip_pool_repo = FakeIpPoolRepo()
+        self.container_repo = FakeContainerRepo(fail_insert)
+
+    async def __aenter__(self) -> 'FakeUow':
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        return None
+
+
+class FakePlacement:
+    storage = 'local-lvm'
+    forecast = None
+
+    @asynccontextmanager
+    async def place(self, request: Any) -> AsyncIterator[str]:
+        yield 'pve'
+
+
+class FakeProvider:
+    def __init__(self, create_error: Exception | None = None, wait_error: Exception | None = None) -> None:
+        self.create_error = create_error
+        self.wait_error = wait_error
+        self.deleted: list[int] = []
+
+    async def create_container(self, node: str, host_name: str, vmid: int, **kwargs: Any) -> CreatedContainer:
+        if self.create_error is not None:
+            raise self.create_error
+        return CreatedContainer(
+            node=node, vmid=vmid, hostname=host_name, username='root', password='secret',
+            cpu_cores=kwargs['cpu_cores'], rom_bytes=kwargs['rom_bytes'], ram_bytes=kwargs['ram_bytes'],
+            upid='UPID:pve:create'
+        )
+
+    async def wait_task(self, node: str, upid: str | None, timeout: float | None = None) -> None:
+        if self.wait_error is not None and upid == 'UPID:pve:create':
+            raise self.wait_error
+
+    async def delete_container(self, node: str, vmid: int) -> dict[str, Any]:
+        self.deleted.append(vmid)
+        return {'data': 'UPID:pve:delete'}
+
+
+def _service(uow: FakeUow, provider: FakeProvider) -> ContainerService:
+    user = UserInDB(
+        id=uuid4(), username='john', email='john@example.com', full_name='John', hashed_password='x'
+    )
+    return ContainerService(uow, provider, user, FakePlacement(), None, None)  # type: ignore
+
+
+def _create(service: ContainerService) -> None:
+    request = CreateContainer(host_name='box', ram_bytes=2 ** 30, rom_bytes=8 * 2 ** 30, cpu_cores=1)
+    asyncio.run(service.create_container(request))
+
+
+def test_failed_task_releases_lease():
+    uow = FakeUow()
+    task = TaskStatus(upid='UPID:pve:create', node='pve', status='stopped', exitstatus='unable to create')
+    with pytest.raises(ProxmoxTaskError):
+        _create(_service(uow, FakeProvider(wait_error=ProxmoxTaskError(task))))
+
+    assert uow.vmid_repo.released == [105]
+    assert uow.ip_pool_repo.released == ['10.0.0.5/24']
+
+
+def test_unsent_request_releases_lease():
+    uow = FakeUow()
+    with pytest.raises(ProxmoxUnavailable):
+        _create(_service(uow, FakeProvider(create_error=ProxmoxUnavailable('pve', 'circuit is open', sent=False))))
+
+    assert uow.vmid_repo.released == [105]
+
+
+@pytest.mark.parametrize('error', [
+    ProxmoxUnavailable('pve', 'timeout'),
+    TimeoutError(),
+])
+def test_ambiguous_failure_keeps_lease(error: Exception):
+    uow = FakeUow()
+    with pytest.raises(type(error)):
+        _create(_service(uow, FakeProvider(wait_error=error)))
+
+    assert uow.vmid_repo.released == []
+    assert uow.ip_pool_repo.released == []
+
+
+def test_failed_insert_deletes_created_container():
+    uow = FakeUow(fail_insert=True)
+    provider = FakeProvider()
+    with pytest.raises(RuntimeError):
+        _create(_service(uow, provider))
+
+    assert provider.deleted == [105]
+    assert uow.vmid_repo.released == [105]
+    assert uow.ip_pool_repo.released == ['10.0.0.5/24']
@@ -0,0 +1,48 @@
+from app.core.counters import CounterRates
+
+
+def test_rate_from_two_reads():
+    rates = CounterRates(1, 60)
+    rates.update(100, 0, (1_000, 0), uptime=500)
+    rates.update(100, 0.5, (1_500, 0), uptime=500.5)
+    # Ближе min_interval база не сдвигается
+    assert rates.get(100, 0.5) is None
+
+    rates.update(100, 10, (11_000, 500), uptime=510)
+    assert rates.get(100, 10) == (1_000.0, 50.0)
+    assert rates.get(100, 100) is None
+
+
+def test_uptime_decrease_resets_state():
+    rates = CounterRates(1, 60)
+    rates.update(100, 0, (1_000_000,), uptime=5_000)
+    rates.update(100, 10, (1_010_000,), uptime=5_010)
+    assert rates.get(100, 10) == (1_000.0,)
+
+    # VMID отдан новому контейнеру: его счетчики не сравниваются со старыми
+    rates.update(100, 20, (2_000_000,), uptime=3_000)
+    assert rates.get(100, 20) is None
+    rates.update(100, 30, (2_000_500,), uptime=3_010)
+    assert rates.get(100, 30) == (50.0,)
+
+
+def test_counter_wrap_counts_from_restart():
+    rates = CounterRates(1, 60)
+    rates.update(100, 0, (1_000_000,))
+    rates.update(100, 10, (4_000,))
+    assert rates.get(100, 10) == (400.0,)
+
+
+def test_retain_forgets_vanished_vmids():
+    rates = CounterRates(1, 60)
+    for vmid in (100, 101):
+        rates.update(vmid, 0, (0,), uptime=100)
+        rates.update(vmid, 10, (100,), uptime=110)
+
+    rates.retain([101, 102])
+    assert rates.get(100, 10) is None
+    assert rates.get(101, 10) == (10.0,)
+
+    # Вернувшийся VMID начинает с чистого листа
+    rates.update(100, 20, (5_000,), uptime=5)
+    assert rates.get(100, 20) is None
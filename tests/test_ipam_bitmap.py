@@ -0,0 +1,63 @@
+from ipaddress import IPv4Network
+
+from app.core.ipam import (
+    address_at,
+    address_offset,
+    clear_bit,
+    empty_bitmap,
+    first_free,
+    parse_net0,
+    set_bit,
+)
+
+SUBNET = IPv4Network('10.0.0.0/29')
+
+
+def _allocate(bitmap: bytearray) -> str | None:
+    offset = first_free(bitmap, SUBNET.num_addresses)
+    if offset is None:
+        return None
+    set_bit(bitmap, offset)
+    return address_at(SUBNET, offset)
+
+
+def test_empty_bitmap_reserves_network_broadcast_and_gateway():
+    bitmap = empty_bitmap(SUBNET, '10.0.0.1')
+    assert [_allocate(bitmap) for _ in range(5)] == [
+        '10.0.0.2/29', '10.0.0.3/29', '10.0.0.4/29', '10.0.0.5/29', '10.0.0.6/29'
+    ]
+
+
+def test_exhausted_pool_and_release():
+    bitmap = empty_bitmap(SUBNET, '10.0.0.6')
+    allocated = [_allocate(bitmap) for _ in range(6)]
+    assert allocated[:5] == ['10.0.0.1/29', '10.0.0.2/29', '10.0.0.3/29', '10.0.0.4/29', '10.0.0.5/29']
+    assert allocated[5] is None
+
+    # Освобожденный адрес выдается следующим, даже если он не последний
+    clear_bit(bitmap, address_offset(SUBNET, '10.0.0.3/29'))
+    assert _allocate(bitmap) == '10.0.0.3/29'
+    assert _allocate(bitmap) is None
+
+
+def test_first_free_ignores_padding_bits():
+    # /30 - 4 адреса в байте на 8 бит: свободные хвостовые биты не адреса
+    subnet = IPv4Network('10.0.1.0/30')
+    bitmap = empty_bitmap(subnet, '10.0.1.1')
+    set_bit(bitmap, 2)
+    assert first_free(bitmap, subnet.num_addresses) is None
+
+
+def test_large_subnet_offsets():
+    subnet = IPv4Network('10.8.0.0/16')
+    bitmap = empty_bitmap(subnet, '10.8.0.1')
+    for offset in range(2, 1_000):
+        set_bit(bitmap, offset)
+    assert address_at(subnet, first_free(bitmap, subnet.num_addresses)) == '10.8.3.232/16'  # type: ignore
+    assert address_offset(subnet, '10.8.255.254/16') == 65_534
+
+
+def test_parse_net0():
+    assert parse_net0('name=eth0,bridge=vmbr0,ip=10.0.0.5/24,gw=10.0.0.1,firewall') == {
+        'name': 'eth0', 'bridge': 'vmbr0', 'ip': '10.0.0.5/24', 'gw': '10.0.0.1'
+    }
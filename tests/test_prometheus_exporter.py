@@ -0,0 +1,35 @@
+import time
+from uuid import uuid4
+
+from app.core.dto.container import ClusterResource, ContainerOwner
+from app.infra.telemetry.exporter import PrometheusExporter
+from app.infra.telemetry.store import TelemetryStore
+
+
+def _store() -> TelemetryStore:
+    store = TelemetryStore(60, 5, 30, [])
+    store.ingest(time.time(), {
+        100: ClusterResource(vmid=100, node='pve', type='lxc', status='running', name='web', cpu=0.5, maxcpu=2),
+        101: ClusterResource(vmid=101, node='pve2', type='lxc', status='stopped', name='db'),
+    })
+    return store
+
+
+def test_render_body_follows_owners_version():
+    exporter = PrometheusExporter(_store())
+    owners = {100: ContainerOwner(vmid=100, name='web', owner_id=uuid4(), username='alice')}
+
+    body = exporter.render(owners, 1)
+    assert b'nvcloud_container_up{vmid="100",name="web",node="pve",owner="alice"} 1' in body
+    assert b'nvcloud_node_containers{node="pve2"} 1.0' in body
+
+    # Тот же dict изменен на месте: без новой версии отдается закэшированное тело
+    owners[100] = ContainerOwner(vmid=100, name='web', owner_id=uuid4(), username='bob')
+    assert exporter.render(owners, 1) is body
+    assert b'owner="bob"' in exporter.render(owners, 2)
+
+
+def test_render_without_owners_has_no_owner_label():
+    body = PrometheusExporter(_store()).render()
+    assert b'nvcloud_container_up{vmid="101",name="db",node="pve2"} 0' in body
+    assert b'owner=' not in body
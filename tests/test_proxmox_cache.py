@@ -0,0 +1,80 @@
+import asyncio
+from typing import Any
+
+from app.infra.proxmox.cache import TTLCache
+
+CLUSTER = (None, None, 'cluster/resources')
+
+
+def test_concurrent_misses_share_one_request():
+    calls = 0
+
+    async def scenario() -> list[Any]:
+        nonlocal calls
+        cache = TTLCache(60, 100)
+        release = asyncio.Event()
+
+        async def load() -> str:
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return 'status'
+
+        waiters = [asyncio.create_task(cache.get_or_load(('pve', 100, 'status/current'), load)) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters)
+        results.append(await cache.get_or_load(('pve', 100, 'status/current'), load))
+        return results
+
+    assert asyncio.run(scenario()) == ['status'] * 6
+    assert calls == 1
+
+
+def test_invalidate_during_load_is_not_cached():
+    loads: list[int] = []
+
+    async def scenario() -> tuple[str, str]:
+        cache = TTLCache(60, 100)
+        release = asyncio.Event()
+
+        async def load() -> str:
+            loads.append(len(loads))
+            if len(loads) == 1:
+                await release.wait()
+                return 'running'
+            return 'stopped'
+
+        stale = asyncio.create_task(cache.get_or_load(('pve', 100, 'status/current'), load))
+        await asyncio.sleep(0)
+        # Действие над контейнером пришло, пока читали старый статус
+        cache.invalidate('pve', 100)
+        release.set()
+        first = await stale
+        return first, await cache.get_or_load(('pve', 100, 'status/current'), load)
+
+    assert asyncio.run(scenario()) == ('running', 'stopped')
+    assert len(loads) == 2
+
+
+def test_invalidate_keeps_unrelated_keys():
+    async def scenario() -> TTLCache:
+        cache = TTLCache(60, 100)
+        for key in [
+            ('pve', 100, 'status/current'),
+            ('pve', 101, 'status/current'),
+            ('pve', None, 'capacity/local-lvm'),
+            ('pve2', None, 'capacity/local-lvm'),
+            (None, None, 'nodes'),
+            CLUSTER,
+        ]:
+            await cache.get_or_load(key, lambda: asyncio.sleep(0, 'value'))
+        cache.invalidate('pve', 100, CLUSTER)
+        return cache
+
+    cache = asyncio.run(scenario())
+    assert set(cache._entries) == {
+        ('pve', 101, 'status/current'),
+        ('pve2', None, 'capacity/local-lvm'),
+        (None, None, 'nodes'),
+    }
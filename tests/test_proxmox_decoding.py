@@ -0,0 +1,46 @@
+import asyncio
+from typing import Any
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from app.config.proxmox import ProxmoxSettings
+from app.core.exceptions import ProxmoxUnavailable
+from app.infra.proxmox.proxmox_provider import ProxmoxProvider
+
+
+async def _container_info(body: bytes) -> Any:
+    async def status(request: web.Request) -> web.Response:
+        return web.Response(body=body, content_type='application/json')
+
+    app = web.Application()
+    app.router.add_get('/api2/json/nodes/pve/lxc/100/status/current', status)
+    async with TestServer(app) as server:
+        provider = ProxmoxProvider(ProxmoxSettings(
+            BASE_URL=str(server.make_url('/')), API_TOKEN_ID='test', API_TOKEN_SECRET='secret'
+        ))
+        try:
+            return await provider.get_container_info('pve', 100)
+        finally:
+            await provider.close()
+
+
+@pytest.mark.parametrize('body', [
+    b'<html>502 Bad Gateway</html>',
+    b'{"data": null}',
+    b'{"data": {"vmid": 100}}',
+    b'{"data": {"vmid": "abc", "status": "running"}}',
+])
+def test_malformed_status_raises_unavailable(body: bytes):
+    with pytest.raises(ProxmoxUnavailable):
+        asyncio.run(_container_info(body))
+
+
+def test_partial_status_is_decoded_leniently():
+    info = asyncio.run(_container_info(b'{"data": {"vmid": "100", "status": "paused", "cpu": 0.5}}'))
+
+    assert info.status == 'paused'
+    assert info.vmid == 100
+    assert info.mem == 0
+    assert info.ha is None
@@ -0,0 +1,85 @@
+import pytest
+
+from app.infra.proxmox import resilience
+from app.infra.proxmox.resilience import CircuitBreaker, endpoint_class, node_of
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(resilience, 'monotonic', clock)
+    return clock
+
+
+def _opened(clock: Clock) -> CircuitBreaker:
+    breaker = CircuitBreaker(3, 30)
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+    return breaker
+
+
+def test_opens_after_consecutive_failures(clock: Clock):
+    breaker = CircuitBreaker(3, 30)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    # Успех обнуляет счетчик: ошибки должны идти подряд
+    breaker.record_failure()
+    breaker.record_failure()
+    assert not breaker.is_open
+
+    breaker.record_failure()
+    assert breaker.is_open
+    assert not breaker.allow()
+
+
+def test_half_open_success_closes(clock: Clock):
+    breaker = _opened(clock)
+    clock.now += 30
+
+    # Пробный запрос один: следующий ждет его исхода еще reset_timeout
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert not breaker.is_open
+    assert breaker.allow()
+
+
+def test_half_open_failure_reopens(clock: Clock):
+    breaker = _opened(clock)
+    clock.now += 30
+    assert breaker.allow()
+
+    # Одной ошибки пробного запроса достаточно, порог не нужен
+    breaker.record_failure()
+    assert breaker.is_open
+    clock.now += 29
+    assert not breaker.allow()
+    clock.now += 1
+    assert breaker.allow()
+
+
+@pytest.mark.parametrize(('method', 'endpoint', 'expected'), [
+    ('GET', '/api2/json/nodes/pve/lxc/100/status/current', 'read'),
+    ('GET', '/api2/json/nodes/pve/tasks/UPID:pve:1/status', 'task'),
+    ('POST', '/api2/json/nodes/pve/lxc', 'create'),
+    ('POST', '/api2/json/nodes/pve/lxc/100/status/start', 'action'),
+    ('DELETE', '/api2/json/nodes/pve/lxc/100', 'action'),
+])
+def test_endpoint_class(method: str, endpoint: str, expected: str):
+    assert endpoint_class(method, endpoint) == expected
+
+
+def test_node_of():
+    assert node_of('/api2/json/nodes/pve2/lxc') == 'pve2'
+    assert node_of('/api2/json/cluster/resources') is None
@@ -0,0 +1,72 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+from app.core.exceptions import ProxmoxUnavailable
+from app.infra.proxmox.tasks import TaskTracker
+
+
+def _tracker(fetch_status: Any) -> TaskTracker:
+    return TaskTracker(fetch_status, 0.01, 0.02, 1.5, 3)
+
+
+def test_wait_timeout_drops_waiter():
+    calls: list[str] = []
+
+    async def running(node: str, upid: str) -> dict[str, Any]:
+        calls.append(upid)
+        return {'data': {'status': 'running'}}
+
+    async def scenario() -> None:
+        tracker = _tracker(running)
+        tracked = tracker.track('pve', 'UPID:1')
+        with pytest.raises(asyncio.TimeoutError):
+            await tracker.wait('pve', 'UPID:1', timeout=0.05)
+
+        # Ожидавшие ту же задачу получают ошибку, опрос прекращается
+        assert isinstance(tracked.exception(), asyncio.TimeoutError)
+        assert tracker._waiters['pve'] == {}
+        # Уже отправленный запрос статуса дорабатывает, дальше цикл опроса ноды завершается
+        await asyncio.sleep(0.1)
+        assert tracker._loops['pve'].done()
+        polled = len(calls)
+        await asyncio.sleep(0.1)
+        assert len(calls) == polled
+        await tracker.close()
+
+    asyncio.run(scenario())
+
+
+def test_repeated_poll_failures_fail_future():
+    async def unknown(node: str, upid: str) -> dict[str, Any]:
+        raise RuntimeError('no such task')
+
+    async def scenario() -> None:
+        tracker = _tracker(unknown)
+        with pytest.raises(ProxmoxUnavailable):
+            await tracker.wait('pve', 'UPID:missing', timeout=5)
+        assert tracker._waiters['pve'] == {}
+        await tracker.close()
+
+    asyncio.run(scenario())
+
+
+def test_transient_failure_is_forgiven():
+    attempts = {'UPID:2': 0}
+
+    async def flaky(node: str, upid: str) -> dict[str, Any]:
+        attempts[upid] += 1
+        if attempts[upid] % 3 != 0:
+            raise RuntimeError('node is busy')
+        if attempts[upid] < 9:
+            return {'data': {'status': 'running'}}
+        return {'data': {'status': 'stopped', 'exitstatus': 'OK'}}
+
+    async def scenario() -> None:
+        tracker = _tracker(flaky)
+        task = await tracker.wait('pve', 'UPID:2', timeout=5)
+        assert task.ok
+        await tracker.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,127 @@
+import asyncio
+import time
+from typing import Any, AsyncIterator
+
+import numpy as np
+
+from app.core.dto.container import ClusterResource
+from app.infra.telemetry.archive import TelemetryArchive
+from app.infra.telemetry.store import TelemetryStore
+
+INTERVAL = 5
+CHUNK = 12
+
+
+class FakePipeline:
+    def __init__(self, redis: 'FakeRedis') -> None:
+        self._redis = redis
+        self._calls: list[tuple[str, tuple[Any, ...]]] = []
+
+    async def __aenter__(self) -> 'FakePipeline':
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        return None
+
+    def __getattr__(self, name: str) -> Any:
+        return lambda *args: self._calls.append((name, args))
+
+    async def execute(self) -> list[Any]:
+        return [getattr(self._redis, name)(*args) for name, args in self._calls]
+
+
+class FakeRedis:
+    """Списки Redis в памяти: ровно то, чем пользуется архив"""
+
+    def __init__(self) -> None:
+        self.lists: dict[bytes, list[bytes]] = {}
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self)
+
+    async def scan_iter(self, match: str, count: int) -> AsyncIterator[bytes]:
+        for key in list(self.lists):
+            if key.decode().startswith(match.rstrip('*')):
+                yield key
+
+    def rpush(self, key: str, value: bytes) -> int:
+        items = self.lists.setdefault(key.encode(), [])
+        items.append(value)
+        return len(items)
+
+    def ltrim(self, key: str, start: int, end: int) -> bool:
+        items = self.lists[key.encode()]
+        self.lists[key.encode()] = items[start:] if end == -1 else items[start:end + 1]
+        return True
+
+    def expire(self, key: str, seconds: int) -> bool:
+        return True
+
+    def lrange(self, key: bytes, start: int, end: int) -> list[bytes]:
+        return list(self.lists.get(key, []))
+
+
+def _tick(store: TelemetryStore, timestamp: float, i: int) -> None:
+    store.ingest(timestamp, {100: ClusterResource(
+        vmid=100, node='pve', type='lxc', status='running',
+        cpu=0.25, maxcpu=2, mem=1024 + i, maxmem=2048, disk=10, maxdisk=100,
+        netin=i * 1_000, netout=i * 500, uptime=i * INTERVAL
+    )})
+
+
+def test_archive_keeps_only_retention_chunks():
+    redis = FakeRedis()
+    # Retention на два чанка: третий и дальше вытесняют самые старые
+    archive = TelemetryArchive(redis, CHUNK, INTERVAL, 2 * CHUNK * INTERVAL)  # type: ignore
+    store = TelemetryStore(CHUNK * 10, INTERVAL, 30, [])
+    start = time.time() - 5 * CHUNK * INTERVAL
+
+    async def scenario() -> dict[int, tuple[np.ndarray, np.ndarray]]:
+        for i in range(5 * CHUNK):
+            _tick(store, start + i * INTERVAL, i)
+            if (i + 1) % CHUNK == 0:
+                await archive.append(store.export(CHUNK))
+        return await archive.load()
+
+    series = asyncio.run(scenario())
+    times, values = series[100]
+
+    assert len(redis.lists[b'telemetry:raw:100']) == 2
+    assert len(times) == 2 * CHUNK
+    np.testing.assert_allclose(times, start + np.arange(3 * CHUNK, 5 * CHUNK) * INTERVAL, atol=1e-3)
+    assert values[-1, 2] == 1024 + 5 * CHUNK - 1
+
+
+def test_replay_restores_raw_buffer_and_tiers():
+    store = TelemetryStore(720, INTERVAL, 30, [(60, 3_600), (300, 86_400)])
+    start = time.time() - 719 * INTERVAL
+    for i in range(720):
+        _tick(store, start + i * INTERVAL, i)
+
+    restored = TelemetryStore(720, INTERVAL, 30, [(60, 3_600), (300, 86_400)])
+    restored.replay(store.export(720))
+
+    assert len(restored) == len(store)
+    # Живого замера после рестарта еще не было, но история уже есть
+    assert restored.latest(100) is None
+    original_history, restored_history = store.history(100, 3_600, 60), restored.history(100, 3_600, 60)
+    assert original_history is not None and restored_history is not None
+    for name, stats in original_history.stats.items():
+        np.testing.assert_allclose(restored_history.stats[name], stats)
+    for original, replayed in zip(store._tiers, restored._tiers, strict=True):
+        assert replayed.count == original.count
+        np.testing.assert_array_equal(replayed.times, original.times)
+
+
+def test_tier_evicts_columns_past_retention():
+    store = TelemetryStore(60, INTERVAL, 30, [(60, 600)])
+    start = (time.time() // 60 - 30) * 60
+    for i in range(12 * 20):
+        _tick(store, start + i * INTERVAL, i)
+    tier = store._tiers[0]
+    last = start + (12 * 20 - 1) * INTERVAL
+
+    # Кольцо на 10 шагов, а после простоя сборщика старые шаги стираются
+    assert tier.count == tier.capacity == 10
+    _tick(store, last + 3_600, 12 * 20)
+    assert (tier.times[~np.isnan(tier.times)] >= last + 3_600 - 600).all()
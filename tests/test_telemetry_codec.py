@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from app.infra.telemetry.archive import SCALES
+from app.infra.telemetry.codec import HEADER, ChunkFormatError, decode_chunk, encode_chunk
+from app.infra.telemetry.store import METRICS
+
+
+def _series(count: int) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(7)
+    # Ровный шаг с редкими сдвигами, чтобы delta-of-delta была не только нулями
+    times = 1_700_000_000 + 5.0 * np.arange(count) + np.where(np.arange(count) % 7 == 3, 0.25, 0.0)
+    values = rng.integers(0, 2 ** 40, size=(count, len(METRICS))).astype(np.float64)
+    values[:, METRICS.index('cpu')] = np.round(rng.random(count), 4)
+    return times, values
+
+
+def test_chunk_round_trip():
+    times, values = _series(120)
+    decoded_times, decoded_values = decode_chunk(encode_chunk(times, values, SCALES), SCALES)
+
+    np.testing.assert_allclose(decoded_times, times, atol=1e-3)
+    np.testing.assert_allclose(decoded_values, values, atol=1e-4)
+
+
+def test_empty_chunk_round_trip():
+    times, values = decode_chunk(encode_chunk(np.zeros(0), np.zeros((0, len(METRICS))), SCALES), SCALES)
+    assert times.shape == (0,)
+    assert values.shape == (0, len(METRICS))
+
+
+def test_malformed_chunks_are_rejected():
+    chunk = encode_chunk(*_series(10), SCALES)
+
+    with pytest.raises(ChunkFormatError):
+        decode_chunk(b'XXXX' + chunk[4:], SCALES)
+    with pytest.raises(ChunkFormatError):
+        decode_chunk(chunk[:HEADER.size + 5], SCALES)
@@ -0,0 +1,40 @@
+import asyncio
+import time
+
+from app.core.dto.container import ClusterResource
+from app.infra.telemetry.store import TelemetryStore
+
+
+def _resources(vmids: range, cpu: float) -> dict[int, ClusterResource]:
+    return {
+        vmid: ClusterResource(vmid=vmid, node='pve', type='lxc', status='running', cpu=cpu)
+        for vmid in vmids
+    }
+
+
+def test_subscription_delivers_every_vmid():
+    vmids = range(100, 120)
+    store = TelemetryStore(720, 5, 30, [])
+    subscription = store.subscribe(set(vmids))
+
+    async def read() -> dict[int, float]:
+        received = {}
+        while (sample := await subscription.get(0.01)) is not None:
+            received[sample.vmid] = sample.cpu
+        return received
+
+    async def scenario() -> None:
+        now = time.time()
+        store.ingest(now - 5, _resources(vmids, 0.1))
+        assert await read() == dict.fromkeys(vmids, 0.1)
+
+        # Непрочитанный замер vmid заменяется более свежим, остальные vmid не теряются
+        store.ingest(now - 5, _resources(vmids, 0.2))
+        store.ingest(now, _resources(vmids, 0.3))
+        assert await read() == dict.fromkeys(vmids, 0.3)
+
+        subscription.close()
+        store.ingest(now, _resources(vmids, 0.4))
+        assert await read() == {}
+
+    asyncio.run(scenario())
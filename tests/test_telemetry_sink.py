@@ -0,0 +1,101 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from app.core.dto.container import ClusterResource
+from app.infra.telemetry.sink import TelemetrySink
+
+
+class FakeResult:
+    def __init__(self, names: list[str]) -> None:
+        self._names = names
+
+    def scalars(self) -> list[str]:
+        return self._names
+
+
+class FakeConnection:
+    def __init__(self, engine: 'FakeEngine') -> None:
+        self._engine = engine
+        self.driver_connection = self
+
+    async def __aenter__(self) -> 'FakeConnection':
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        return None
+
+    async def execute(self, statement: Any) -> FakeResult:
+        sql = str(statement)
+        self._engine.statements.append(sql)
+        if sql.startswith('CREATE TABLE'):
+            self._engine.tables.add(sql.split()[5])
+        elif sql.startswith('DROP TABLE'):
+            self._engine.tables.discard(sql.split()[2])
+        return FakeResult(sorted(self._engine.tables))
+
+    async def get_raw_connection(self) -> 'FakeConnection':
+        return self
+
+    async def copy_records_to_table(self, table: str, records: list[tuple[Any, ...]], columns: tuple[str, ...]) -> None:
+        self._engine.copied.extend(records)
+
+
+class FakeEngine:
+    def __init__(self, tables: set[str] | None = None) -> None:
+        self.tables = tables or set()
+        self.statements: list[str] = []
+        self.copied: list[tuple[Any, ...]] = []
+
+    def begin(self) -> FakeConnection:
+        return FakeConnection(self)
+
+    def connect(self) -> FakeConnection:
+        return FakeConnection(self)
+
+
+def _sink(engine: FakeEngine) -> TelemetrySink:
+    return TelemetrySink(engine, 100, 1, 1_000, 7, 2, 3)  # type: ignore
+
+
+def _resources(vmid: int) -> dict[int, ClusterResource]:
+    return {vmid: ClusterResource(vmid=vmid, node='pve', type='lxc', status='running')}
+
+
+def test_flush_creates_partition_for_batch_day():
+    engine = FakeEngine()
+    sink = _sink(engine)
+    # Замер трехдневной давности (догоняем после простоя): партиции на этот день еще нет
+    day = datetime.now(timezone.utc) - timedelta(days=3)
+    sink.add(day.timestamp(), _resources(100))
+
+    asyncio.run(sink.flush())
+
+    assert f'telemetry_samples_{day:%Y%m%d}' in engine.tables
+    assert [row[1] for row in engine.copied] == [100]
+
+
+def test_flush_drops_samples_outside_retention():
+    engine = FakeEngine()
+    sink = _sink(engine)
+    now = datetime.now(timezone.utc)
+    sink.add((now - timedelta(days=30)).timestamp(), _resources(100))
+    sink.add((now + timedelta(days=30)).timestamp(), _resources(101))
+    sink.add(now.timestamp(), _resources(102))
+
+    asyncio.run(sink.flush())
+
+    assert [row[1] for row in engine.copied] == [102]
+    assert f'telemetry_samples_{now - timedelta(days=30):%Y%m%d}' not in engine.tables
+
+
+def test_maintain_drops_expired_partitions():
+    old = datetime.now(timezone.utc) - timedelta(days=20)
+    engine = FakeEngine({f'telemetry_samples_{old:%Y%m%d}', 'telemetry_samples_default'})
+
+    asyncio.run(_sink(engine).maintain())
+
+    assert f'telemetry_samples_{old:%Y%m%d}' not in engine.tables
+    assert 'telemetry_samples_default' in engine.tables
+    # Вчера, сегодня и два дня вперед
+    assert len(engine.tables) == 1 + 4
@@ -0,0 +1,61 @@
+import time
+
+import numpy as np
+
+from app.core.dto.container import ClusterResource
+from app.infra.telemetry.store import TelemetryStore
+
+INTERVAL = 5
+BUFFER_SIZE = 720
+
+
+def _filled_store(ticks: int) -> TelemetryStore:
+    store = TelemetryStore(BUFFER_SIZE, INTERVAL, 30, [(300, 86_400), (3_600, 30 * 86_400)])
+    now = time.time()
+    for i in range(ticks):
+        timestamp = now - (ticks - 1 - i) * INTERVAL
+        store.ingest(timestamp, {100: ClusterResource(
+            vmid=100, node='pve', type='lxc', status='running',
+            cpu=0.5, maxcpu=2, mem=1024, maxmem=2048, disk=10, maxdisk=100,
+            netin=i * 1_000, netout=i * 500, uptime=i * INTERVAL
+        )})
+    return store
+
+
+def test_history_default_window_served_from_raw():
+    # Полный сырой буфер (ровно час) отвечает на окно 3600 с шагом 60 сам
+    history = _filled_store(BUFFER_SIZE + 100).history(100, 3_600, 60)
+
+    assert history is not None
+    assert history.step == 60
+    assert len(history.time) == 60
+    assert not np.isnan(history.stats['cpu'][-1]).any()
+    assert np.nanmax(history.stats['netin'][:, 2]) == 200
+
+
+def test_history_long_window_merges_raw_into_open_bucket():
+    history = _filled_store(BUFFER_SIZE + 1_000).history(100, 7_200, 60)
+
+    assert history is not None
+    assert history.step == 60
+    assert len(history.time) == 120
+    # Незакрытый шаг уровня заполнен сырыми замерами
+    assert not np.isnan(history.stats['cpu'][-1]).any()
+    # Шаги из уровня 5 минут разложены на шаг ответа
+    assert np.count_nonzero(~np.isnan(history.stats['cpu'][:60, 2])) > 40
+
+
+def test_missing_vmid_keeps_history_through_grace_period():
+    store = TelemetryStore(BUFFER_SIZE, INTERVAL, 30, [], slot_grace=2)
+    resource = ClusterResource(vmid=100, node='pve', type='lxc', status='running', cpu=0.5)
+    now = time.time()
+    store.ingest(now - 15, {100: resource})
+    store.ingest(now - 10, {})
+    store.ingest(now - 5, {})
+
+    vmids, _, values = store.snapshot(['cpu'])
+    assert 100 in vmids
+    assert values[list(vmids).index(100), 0, 0] == 0.5
+
+    store.ingest(now, {})
+    assert store.history(100, 60, 5) is None